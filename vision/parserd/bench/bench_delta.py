@@ -0,0 +1,72 @@
+"""Microbenchmark: DeltaEngine vs the previous make_patch + deepcopy engine.
+
+    cd vision && python -m parserd.bench.bench_delta [--n 20000]
+"""
+import argparse
+import copy
+import timeit
+
+import jsonpatch
+
+from parserd.core.delta import DeltaEngine
+
+
+class LegacyDeltaEngine:
+    def __init__(self):
+        self._last = {}
+
+    def patch(self, pane: str, current: dict) -> list:
+        before = self._last.get(pane, {})
+        ops = jsonpatch.make_patch(before, current).patch
+        if ops:
+            self._last[pane] = copy.deepcopy(current)
+        return ops
+
+
+def _dashboard(i: int) -> dict:
+    return {
+        "ci": {"status": "passing" if i % 2 else "failing", "checks_total": 12, "checks_failed": i % 2,
+               "failed_names": ["lint", "unit"][: i % 2 * 2]},
+        "checks": [{"name": f"job-{k}", "status": "success", "duration_s": 10.0 + k, "url": None} for k in range(10)],
+        "pr": {"mergeable": "clean", "required_reviews": 1, "labels": [f"label-{k}" for k in range(16)]},
+        "artifacts": {"items": [{"name": f"fw-{k}.bin", "size_bytes": 1024 * k, "ready": True} for k in range(12)]},
+        "terminal": {"warnings": 3, "errors": 0, "last_target": "firmware", "build_time_s": 41.5},
+    }
+
+
+def _checks(i: int) -> dict:
+    return {"checks": [{"name": f"job-{k}", "status": "success" if k != i % 10 else "failure", "duration_s": None}
+                       for k in range(10)]}
+
+
+CASES = {
+    "small_unchanged": lambda i: {"ci": {"status": "passing", "checks_total": 7}},
+    "small_flip": lambda i: {"ci": {"status": "passing" if i % 2 else "failing", "checks_total": 7}},
+    "checks_unchanged": lambda i: _checks(0),
+    "checks_one_item": _checks,
+    "large_unchanged": lambda i: _dashboard(0),
+    "large_flip": _dashboard,
+}
+
+
+def run(n: int):
+    print(f"{'case':<18}{'legacy ops/s':>14}{'engine ops/s':>14}{'speedup':>10}")
+    for name, make in CASES.items():
+        frames = [make(i) for i in range(64)]
+        results = []
+        for engine_cls in (LegacyDeltaEngine, DeltaEngine):
+            engine = engine_cls()
+            counter = iter(range(n * 2))
+            seconds = timeit.timeit(lambda: engine.patch("P", frames[next(counter) % 64]), number=n)
+            results.append(n / seconds)
+        print(f"{name:<18}{results[0]:>14,.0f}{results[1]:>14,.0f}{results[1] / results[0]:>9.1f}x")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--n", type=int, default=20000)
+    run(ap.parse_args().n)
+
+
+if __name__ == "__main__":
+    main()
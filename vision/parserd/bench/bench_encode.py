@@ -0,0 +1,67 @@
+"""Microbenchmark: wire bytes/sec per transport, per-consumer encoding vs encode-once.
+
+    cd vision && python -m parserd.bench.bench_encode [--n 5000] [--subscribers 4]
+"""
+import argparse
+import json
+import time
+
+from parserd.core.encode import ENCODER, EncodedBrief
+from parserd.core.jsonseq import encode_record
+
+
+def _brief(i: int) -> dict:
+    return {
+        "ts": "2026-01-01T00:00:00.000000+00:00",
+        "pane": "CI_SUMMARY",
+        "delta": [
+            {"op": "replace", "path": "/ci/status", "value": "passing" if i % 2 else "failing"},
+            {"op": "replace", "path": "/checks", "value": [
+                {"name": f"job-{k}", "status": "success", "duration_s": 10.0 + k, "url": None} for k in range(10)
+            ]},
+        ],
+        "confidence": 0.99,
+    }
+
+
+def _legacy(brief: dict, transport: str) -> bytes:
+    # Previous behaviour: each consumer re-serializes the producer's string.
+    text = json.dumps(brief, separators=(",", ":"))
+    if transport == "jsonseq":
+        return encode_record(text)
+    if transport == "sse":
+        return f"data: {text}\n\n".encode("utf-8")
+    return json.dumps(brief).encode("utf-8")
+
+
+_FRAMES = {"jsonseq": "jsonseq", "sse": "sse", "webhook": "body"}
+
+
+def run(n: int, subscribers: int):
+    briefs = [_brief(i) for i in range(n)]
+    print(f"encoder={ENCODER} briefs={n} subscribers={subscribers}")
+    print(f"{'transport':<10}{'legacy MB/s':>14}{'encode-once MB/s':>18}{'speedup':>10}")
+    for transport, attr in _FRAMES.items():
+        t0 = time.perf_counter()
+        legacy_bytes = sum(len(_legacy(b, transport)) for b in briefs for _ in range(subscribers))
+        legacy = legacy_bytes / (time.perf_counter() - t0) / 1e6
+        t0 = time.perf_counter()
+        shared_bytes = 0
+        for brief in briefs:
+            encoded = EncodedBrief(brief)
+            for _ in range(subscribers):
+                shared_bytes += len(getattr(encoded, attr))
+        shared = shared_bytes / (time.perf_counter() - t0) / 1e6
+        print(f"{transport:<10}{legacy:>14,.1f}{shared:>18,.1f}{shared / legacy:>9.1f}x")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--n", type=int, default=5000)
+    ap.add_argument("--subscribers", type=int, default=4)
+    args = ap.parse_args()
+    run(args.n, args.subscribers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Microbenchmark: allocations per frame and bytes per buffered observation.
+
+    cd vision && python -m parserd.bench.bench_observation [--n 2000] [--tokens 200] [--parsers 4]
+
+The compact model also rebuilds reading order from token boxes, which the
+legacy model never did.
+"""
+import argparse
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from parserd.core.models import PaneObservation, flatten_lines
+
+
+@dataclass
+class _LegacyToken:
+    text: str
+    bbox: List[float]
+    confidence: float
+
+
+@dataclass
+class _LegacyObservation:
+    # Previous model: one dataclass per token, line views rebuilt on every call.
+    pane_id: str
+    tokens: List[_LegacyToken]
+    metadata: Dict[str, Any]
+    png: Optional[str] = None
+
+    def merged_lines(self) -> List[str]:
+        return flatten_lines([t.text for t in self.tokens])
+
+    @classmethod
+    def from_payload(cls, payload):
+        tokens = [
+            _LegacyToken(text=t.get("text", ""), bbox=t.get("bbox", []), confidence=t.get("confidence", 0.0))
+            for t in payload.get("ocr", {}).get("tokens", [])
+        ]
+        return cls(payload.get("pane", ""), tokens, payload.get("metadata", {}), payload.get("png"))
+
+
+def _payload(i: int, tokens: int) -> dict:
+    return {
+        "pane": "IDE_TERMINAL",
+        "ocr": {"tokens": [
+            {"text": f"word{i}-{k}", "bbox": [k * 10.0, (k // 20) * 14.0, 48.0, 12.0], "confidence": 0.9}
+            for k in range(tokens)
+        ]},
+        "metadata": {"perceptualHash": f"{i:016x}"},
+    }
+
+
+def _consume(obs, parsers: int, legacy: bool) -> int:
+    # Each parser joins the lines once, as the text parsers do.
+    size = 0
+    for _ in range(parsers):
+        size += len(" ".join(obs.merged_lines())) if legacy else len(obs.text)
+    return size
+
+
+def _measure(build, payloads, parsers: int, legacy: bool):
+    # Warm up first so lazy imports are not charged to the first frame.
+    _consume(build(payloads[0]), parsers, legacy)
+    t0 = time.perf_counter()
+    for payload in payloads:
+        _consume(build(payload), parsers, legacy)
+    elapsed = time.perf_counter() - t0
+
+    tracemalloc.start()
+    for payload in payloads:
+        _consume(build(payload), parsers, legacy)
+    _, per_frame_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    kept = [build(payload) for payload in payloads]
+    for obs in kept:
+        _consume(obs, 1, legacy)
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, per_frame_peak, (after - before) / len(kept)
+
+
+def run(n: int, tokens: int, parsers: int):
+    payloads = [_payload(i, tokens) for i in range(n)]
+    print(f"frames={n} tokens/frame={tokens} parsers/frame={parsers}")
+    print(f"{'model':<10}{'frames/s':>12}{'peak KiB':>12}{'KiB/obs kept':>14}")
+    for name, build, legacy in (("legacy", _LegacyObservation.from_payload, True),
+                                ("compact", PaneObservation.from_payload, False)):
+        elapsed, peak, per_obs = _measure(build, payloads, parsers, legacy)
+        print(f"{name:<10}{n / elapsed:>12,.0f}{peak / 1024:>12,.1f}{per_obs / 1024:>14,.1f}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--n", type=int, default=2000)
+    ap.add_argument("--tokens", type=int, default=200)
+    ap.add_argument("--parsers", type=int, default=4)
+    args = ap.parse_args()
+    run(args.n, args.tokens, args.parsers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+"""Parser benchmark and golden regression check over recorded payloads.
+
+    cd vision && python -m parserd.bench.bench_parsers [--n 200] [--pane HIL_CHART] [--check]
+
+Every ``tests/fixtures/<PANE>/<name>.json`` (a visiond capture payload) is
+parsed ``--n`` times by ``PARSERS[<PANE>]``. The run reports ops/sec,
+p50/p99 per call and peak bytes allocated per call, and compares facts with
+``tests/golden/<PANE>/<name>.json``. Synthetic large-buffer cases (10k-line
+terminal and log output, thousands of OCR tokens) are generated here with
+their expected facts.
+
+Latency baselines in ``parsers_baseline.json`` are stored in calibration
+units: multiples of a fixed pure-Python workload, so a baseline taken on one
+machine roughly holds on another. The unit is the median of rounds run at
+startup and between cases, so it follows the machine's speed through the
+run. ``--check`` exits non-zero on a golden mismatch or when a case's p50
+exceeds its baseline by more than ``--tolerance`` and by more than
+``--floor-us``; the floor keeps scheduler noise on microsecond-scale cases
+from failing the check. Use ``--update-baseline`` after an intended change
+and ``--update-goldens`` when adding fixtures. A golden with an ``xfail``
+reason records a known misparse: it is reported, not failed, until the
+parser gets it right.
+"""
+import argparse
+import json
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from parserd.core.models import PaneObservation
+from parserd.parsers import PARSERS
+
+ROOT = Path(__file__).resolve().parents[2]
+FIXTURES = ROOT / "tests" / "fixtures"
+GOLDEN = ROOT / "tests" / "golden"
+BASELINE = Path(__file__).with_name("parsers_baseline.json")
+
+LIMITS = {"max_failed_names": 8, "max_labels": 16, "max_items_per_list": 12}
+
+
+class Case(NamedTuple):
+    pane: str
+    name: str
+    payload: Dict[str, Any]
+    expected: Optional[Dict[str, Any]]  # {"facts", "confidence"[, "xfail"]}; None when no golden exists
+
+    @property
+    def id(self) -> str:
+        return f"{self.pane}/{self.name}"
+
+    @property
+    def xfail(self) -> Optional[str]:
+        return (self.expected or {}).get("xfail")
+
+
+def _dom(pane: str, lines: List[str]) -> Dict[str, Any]:
+    return {"pane": pane, "sensors": [{"source": "dom", "frame": None, "text": "\n".join(lines), "confidence": 1.0}]}
+
+
+def synthetic_cases() -> List[Case]:
+    build = [f"[{i:05d}/10000] Compiling src/module_{i}.cpp" for i in range(10_000)]
+    build[4_321] = "src/module_4321.cpp:17: error: expected ';' before '}' token"
+    build[-2:] = ["Target firmware.bin", "12 warnings, 1 errors in 88.2 s"]
+    serial = [f"I ({i * 16}) app: frame {i} ok" for i in range(10_000)]
+    serial[0] = "Connected to cu.usbserial-0001"
+    serial[-1] = "W (160000) app: 3 errors since boot"
+    tokens = []
+    for row in range(100):
+        for col in range(50):
+            tokens.append({"text": f"v{row}.{col}", "bbox": [col * 40.0, row * 16.0, 36.0, 12.0], "confidence": 0.9})
+    tokens[-4:] = [
+        {"text": text, "bbox": [x, 1_700.0, 40.0, 12.0], "confidence": 0.9}
+        for text, x in (("FPS", 0.0), ("avg:", 48.0), ("60.0", 96.0), ("ms", 144.0))
+    ]
+    tokens.reverse()
+    chart = {"pane": "HIL_CHART", "ocr": {"engine": "tesseract", "tokens": tokens}}
+    return [
+        Case("IDE_TERMINAL", "synthetic_10k_lines", _dom("IDE_TERMINAL", build), {
+            "facts": {"terminal": {"warnings": 12, "errors": 1, "last_target": "firmware.bin", "build_time_s": 88.2}},
+            "confidence": 0.9,
+        }),
+        Case("CI_LOGS_DETAIL", "synthetic_10k_lines", _dom("CI_LOGS_DETAIL", build), {
+            # The summary line also mentions errors, and the latest match wins.
+            "facts": {"ci_logs": {"last_error_signature": build[-1], "error_count": 2}},
+            "confidence": 0.95,
+        }),
+        Case("SERIAL_MONITOR", "synthetic_10k_lines", _dom("SERIAL_MONITOR", serial), {
+            "facts": {"serial": {"port": "cu.usbserial-0001", "connected": True, "last_line": serial[-1],
+                                 "error_count": 3}},
+            "confidence": 0.85,
+        }),
+        Case("HIL_CHART", "synthetic_5k_tokens", chart, {
+            "facts": {"hil": {"fps_avg": 60.0}},
+            "confidence": 0.0,
+        }),
+    ]
+
+
+def load_cases(panes: Optional[List[str]] = None, synthetic: bool = True) -> List[Case]:
+    cases = []
+    for path in sorted(FIXTURES.glob("*/*.json")):
+        pane = path.parent.name
+        if pane not in PARSERS or (panes and pane not in panes):
+            continue
+        golden = GOLDEN / pane / path.name
+        expected = json.loads(golden.read_text()) if golden.exists() else None
+        cases.append(Case(pane, path.stem, json.loads(path.read_text()), expected))
+    if synthetic:
+        cases.extend(c for c in synthetic_cases() if not panes or c.pane in panes)
+    return cases
+
+
+def parse_case(case: Case):
+    # A fresh observation per call: cached line views must not leak across calls.
+    return PARSERS[case.pane](PaneObservation.from_payload(case.payload), LIMITS)
+
+
+_CALIBRATION_PATTERN = re.compile(r"(\d+)\s+warnings?")
+_CALIBRATION_LINES = [f"step {i}: {i % 7} warnings" for i in range(2_000)]
+
+
+def _calibrate(rounds: int = 1) -> List[float]:
+    """Seconds per round of a fixed string/regex/dict workload; their median is the baseline unit."""
+    samples = []
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        seen: Dict[str, int] = {}
+        for ln in _CALIBRATION_LINES:
+            m = _CALIBRATION_PATTERN.search(ln.lower())
+            if m:
+                seen[m.group(1)] = seen.get(m.group(1), 0) + 1
+        " ".join(_CALIBRATION_LINES).split()
+        samples.append(time.perf_counter() - t0)
+    return samples
+
+
+def measure(case: Case, n: int) -> Dict[str, Any]:
+    parse_case(case)  # warm caches and lazy imports
+    samples = []
+    for _ in range(n):
+        obs = PaneObservation.from_payload(case.payload)
+        t0 = time.perf_counter_ns()
+        PARSERS[case.pane](obs, LIMITS)
+        samples.append(time.perf_counter_ns() - t0)
+    samples.sort()
+    peak = 0
+    tracemalloc.start()
+    for _ in range(min(n, 10)):
+        obs = PaneObservation.from_payload(case.payload)
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        PARSERS[case.pane](obs, LIMITS)
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+    total_s = sum(samples) / 1e9
+    return {
+        "ops_s": n / total_s if total_s else float("inf"),
+        "p50_us": statistics.median(samples) / 1e3,
+        "p99_us": samples[min(len(samples) - 1, int(len(samples) * 0.99))] / 1e3,
+        "peak_kib": peak / 1024.0,
+    }
+
+
+def check_golden(case: Case) -> Optional[str]:
+    if case.expected is None:
+        return "no golden"
+    facts, confidence = parse_case(case)
+    if facts != case.expected["facts"] or confidence != case.expected["confidence"]:
+        return f"got {json.dumps({'facts': facts, 'confidence': confidence})}"
+    return None
+
+
+def run(args) -> int:
+    cases = load_cases(args.pane or None, synthetic=not args.no_synthetic)
+    calibration = _calibrate(args.calibration_rounds)
+    baseline = json.loads(BASELINE.read_text()) if BASELINE.exists() else {}
+    measured = []
+    for case in cases:
+        if args.update_goldens and not case.name.startswith("synthetic") and not case.xfail:
+            facts, confidence = parse_case(case)
+            path = GOLDEN / case.pane / f"{case.name}.json"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps({"facts": facts, "confidence": confidence}, indent=2) + "\n")
+            case = case._replace(expected={"facts": facts, "confidence": confidence})
+        golden = check_golden(case)
+        # Interleaved rounds keep the unit honest when the machine speeds up or slows down mid-run.
+        calibration.extend(_calibrate(2))
+        # Large generated buffers take milliseconds per call; fewer rounds keep the run short.
+        stats = measure(case, max(15, args.n // 10) if case.name.startswith("synthetic") else args.n)
+        measured.append((case, golden, stats))
+    unit_us = statistics.median(calibration) * 1e6
+    failures = []
+    results: Dict[str, float] = {}
+    print(f"calibration unit {unit_us:.0f} us (median of {len(calibration)} rounds), n={args.n}")
+    print(f"{'case':<44}{'ops/s':>10}{'p50 us':>10}{'p99 us':>10}{'peak KiB':>10}{'vs base':>9}  golden")
+    for case, golden, stats in measured:
+        units = stats["p50_us"] / unit_us
+        results[case.id] = round(units, 5)
+        ratio = units / baseline[case.id] if baseline.get(case.id) else None
+        vs = f"{ratio:>8.2f}x" if ratio is not None else f"{'-':>9}"
+        if case.xfail:
+            note = f"xfail: {case.xfail}" if golden else "XPASS"
+        else:
+            note = golden or "ok"
+        print(f"{case.id:<44}{stats['ops_s']:>10,.0f}{stats['p50_us']:>10.1f}{stats['p99_us']:>10.1f}"
+              f"{stats['peak_kib']:>10.1f}{vs}  {note}")
+        if case.xfail and not golden:
+            failures.append(f"{case.id}: now matches its golden; drop the xfail")
+        elif golden and golden != "no golden" and not case.xfail:
+            failures.append(f"{case.id}: golden mismatch, {golden}")
+        slower_us = stats["p50_us"] - baseline[case.id] * unit_us if ratio is not None else 0.0
+        if ratio is not None and ratio > 1.0 + args.tolerance and slower_us > args.floor_us:
+            failures.append(f"{case.id}: p50 {ratio:.2f}x baseline (+{slower_us:.1f} us)")
+    if args.update_baseline:
+        BASELINE.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+        print(f"wrote {BASELINE}")
+    for failure in failures:
+        print(f"FAIL {failure}", file=sys.stderr)
+    return 1 if failures and args.check else 0
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--n", type=int, default=200)
+    ap.add_argument("--pane", action="append", help="limit to this pane (repeatable)")
+    ap.add_argument("--no-synthetic", action="store_true", help="skip the large generated cases")
+    ap.add_argument("--check", action="store_true", help="exit 1 on golden mismatch or latency regression")
+    ap.add_argument("--tolerance", type=float, default=0.5, help="allowed p50 slowdown over baseline (0.5 = +50%%)")
+    ap.add_argument("--floor-us", type=float, default=20.0,
+                    help="p50 slowdowns smaller than this many microseconds never fail the check")
+    ap.add_argument("--calibration-rounds", type=int, default=21,
+                    help="calibration rounds at startup; two more run before each case")
+    ap.add_argument("--update-baseline", action="store_true")
+    ap.add_argument("--update-goldens", action="store_true")
+    sys.exit(run(ap.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from .models import PaneObservation
+
+
+class ParseCache:
+    """Bounded LRU of ``(facts, confidence)`` keyed on observation content.
+
+    Entries expire ``ttl_s`` seconds after insertion. Cached facts are shared
+    between callers and must be treated as read-only.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl_s: float = 300.0, use_perceptual_hash: bool = True):
+        self.max_entries = max(1, int(max_entries))
+        self.ttl_s = float(ttl_s)
+        self.use_perceptual_hash = use_perceptual_hash
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any], float]]" = OrderedDict()
+        self.counters = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    def key_for(self, observation: PaneObservation) -> str:
+        h = hashlib.blake2b(digest_size=16)
+        h.update(observation.pane_id.encode("utf-8"))
+        phash = observation.metadata.raw.get("perceptualHash") if self.use_perceptual_hash else None
+        if phash:
+            h.update(b"\x00phash\x00")
+            h.update(str(phash).encode("utf-8"))
+            return h.hexdigest()
+        texts = observation.structured_text
+        h.update(b"\x00ax\x00" if texts else b"\x00ocr\x00")
+        for text in texts or observation.ocr_text:
+            h.update(" ".join(str(text).split()).encode("utf-8"))
+            h.update(b"\x00")
+        return h.hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.counters["misses"] += 1
+            return None
+        expires, facts, confidence = entry
+        if expires < time.monotonic():
+            del self._entries[key]
+            self.counters["expirations"] += 1
+            self.counters["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self.counters["hits"] += 1
+        return facts, confidence
+
+    def put(self, key: str, facts: Dict[str, Any], confidence: float):
+        self._entries[key] = (time.monotonic() + self.ttl_s, facts, confidence)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.counters["evictions"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        out = dict(self.counters)
+        out["size"] = len(self._entries)
+        out["max_entries"] = self.max_entries
+        return out
@@ -20,6 +20,12 @@ class Config:
             self.parserd["bind_port"] = int(os.getenv("PARSERD_PORT"))
         if os.getenv("OA_WEBHOOK_URL"):
             self.parserd.setdefault("emit", {})["webhook_url"] = os.getenv("OA_WEBHOOK_URL")
+        if os.getenv("PARSERD_MIN_CONFIDENCE"):
+            self.parserd.setdefault("emit", {})["min_confidence"] = float(os.getenv("PARSERD_MIN_CONFIDENCE"))
+        if os.getenv("PARSERD_STATE_PATH"):
+            self.parserd.setdefault("state", {})["path"] = os.getenv("PARSERD_STATE_PATH")
+        if os.getenv("PARSERD_RECORDER"):
+            self.parserd.setdefault("recorder", {})["enabled"] = os.getenv("PARSERD_RECORDER").lower() == "on"
         if os.getenv("OCR_LANGS"):
             langs = [s.strip() for s in os.getenv("OCR_LANGS").split(",") if s.strip()]
             self.visiond.setdefault("ocr", {})["languages"] = langs
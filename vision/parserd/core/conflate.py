@@ -0,0 +1,157 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from .delta import diff_snapshots
+from .encode import EncodedBrief
+
+
+class Update(EncodedBrief):
+    """One brief plus the pane snapshots on either side of its delta.
+
+    Carrying ``before``/``after`` lets a queue merge consecutive updates of a
+    pane into one patch without knowing what its consumer has applied. The
+    same instance is offered to every subscriber, so it is encoded once.
+    ``critical`` marks a delta touching ``emit.critical_fields``.
+    """
+
+    __slots__ = ("pane", "before", "after", "critical", "enqueued_at")
+
+    def __init__(self, brief: Dict[str, Any], before: Any, after: Any, critical: bool = False):
+        super().__init__(brief)
+        self.pane = brief["pane"]
+        self.before = before
+        self.after = after
+        self.critical = critical
+        self.enqueued_at = time.monotonic()
+
+    @classmethod
+    def merge(cls, first: "Update", last: "Update", critical: bool = False) -> Optional["Update"]:
+        delta = diff_snapshots(first.before, last.after)
+        if not delta:
+            return None
+        brief = dict(last.brief)
+        brief["delta"] = delta
+        merged = cls(brief, first.before, last.after, critical or first.critical or last.critical)
+        merged.enqueued_at = first.enqueued_at
+        return merged
+
+
+def _is_critical(item: Any) -> bool:
+    return getattr(item, "critical", False)
+
+
+class ConflatingQueue:
+    """Subscriber queue whose ``put_nowait`` never blocks the capture loop.
+
+    Once more than ``threshold`` updates are pending, every pane's pending
+    updates collapse into a single patch that takes the consumer straight from
+    what it last received to the current state. Items that are not ``Update``
+    instances are passed through untouched and never conflated.
+
+    Critical updates jump ahead of everything except earlier critical ones.
+    Whatever is already pending for their pane is folded into them first, so
+    a consumer still sees each pane's changes in order.
+    """
+
+    def __init__(self, threshold: int = 8):
+        self.threshold = max(1, int(threshold))
+        self._items: Deque[Any] = deque()
+        self._ready = asyncio.Event()
+        self.delivered = 0
+        self.conflated = 0
+        self.max_lag_s = 0.0
+
+    def qsize(self) -> int:
+        return len(self._items)
+
+    def put_nowait(self, update: Update):
+        if _is_critical(update):
+            self._put_critical(update)
+        else:
+            self._items.append(update)
+            if len(self._items) > self.threshold:
+                self._conflate()
+        if self._items:
+            self._ready.set()
+
+    def _put_critical(self, update: Update):
+        first = None
+        rest: Deque[Any] = deque()
+        for item in self._items:
+            if isinstance(item, Update) and item.pane == update.pane:
+                first = first or item
+                self.conflated += 1
+            else:
+                rest.append(item)
+        self._items = rest
+        if first is not None:
+            update = Update.merge(first, update)
+            if update is None:
+                self.conflated += 1
+                return
+        at = 0
+        while at < len(rest) and _is_critical(rest[at]):
+            at += 1
+        rest.insert(at, update)
+
+    def _conflate(self):
+        firsts: Dict[str, Update] = {}
+        lasts: Dict[str, int] = {}
+        critical: Dict[str, bool] = {}
+        for i, update in enumerate(self._items):
+            if isinstance(update, Update):
+                firsts.setdefault(update.pane, update)
+                lasts[update.pane] = i
+                critical[update.pane] = critical.get(update.pane, False) or update.critical
+        merged: Deque[Any] = deque()
+        for i, update in enumerate(self._items):
+            if not isinstance(update, Update):
+                merged.append(update)
+                continue
+            if lasts[update.pane] != i:
+                self.conflated += 1
+                continue
+            first = firsts[update.pane]
+            if first is not update:
+                update = Update.merge(first, update, critical[update.pane])
+                if update is None:
+                    self.conflated += 1
+                    continue
+            merged.append(update)
+        # Keep critical updates at the front; sorted() is stable.
+        self._items = deque(sorted(merged, key=lambda item: not _is_critical(item)))
+
+    async def get(self) -> Any:
+        while not self._items:
+            self._ready.clear()
+            await self._ready.wait()
+        return self.get_nowait()
+
+    def get_nowait(self) -> Any:
+        if not self._items:
+            raise asyncio.QueueEmpty
+        item = self._items.popleft()
+        self.delivered += 1
+        enqueued_at = getattr(item, "enqueued_at", None)
+        if enqueued_at is not None:
+            self.max_lag_s = max(self.max_lag_s, time.monotonic() - enqueued_at)
+        return item
+
+    def lag_s(self) -> float:
+        """Age of the oldest pending update, i.e. how far behind the consumer is."""
+        for item in self._items:
+            enqueued_at = getattr(item, "enqueued_at", None)
+            if enqueued_at is not None:
+                return time.monotonic() - enqueued_at
+        return 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queued": len(self._items),
+            "delivered": self.delivered,
+            "conflated": self.conflated,
+            "lag_s": round(self.lag_s(), 3),
+            "max_lag_s": round(self.max_lag_s, 3),
+        }
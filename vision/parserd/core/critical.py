@@ -0,0 +1,55 @@
+from typing import Any, Dict, Iterable, List, Tuple
+
+
+def _tokens(pointer: str) -> Tuple[str, ...]:
+    pointer = pointer.strip("/")
+    if not pointer:
+        return ()
+    return tuple(t.replace("~1", "/").replace("~0", "~") for t in pointer.split("/"))
+
+
+def _lookup(value: Any, tokens: Tuple[str, ...]) -> bool:
+    for token in tokens:
+        if isinstance(value, dict) and token in value:
+            value = value[token]
+        elif isinstance(value, list) and token.isdigit() and int(token) < len(value):
+            value = value[int(token)]
+        else:
+            return False
+    return True
+
+
+class CriticalFields:
+    """``emit.critical_fields``: JSON pointers whose changes gate merges.
+
+    Pointers may omit the leading slash (``"ci/status"``). A patch touches a
+    critical field when an op targets the field or something below it, adds
+    an ancestor containing it, or replaces/removes/moves an ancestor.
+    """
+
+    def __init__(self, fields: Iterable[str] = ()):
+        self.fields: List[Tuple[str, ...]] = [_tokens(f) for f in fields or ()]
+
+    def __bool__(self) -> bool:
+        return bool(self.fields)
+
+    def present(self, facts: Dict[str, Any]) -> bool:
+        return any(_lookup(facts, field) for field in self.fields)
+
+    def touches(self, patch: List[Dict[str, Any]]) -> bool:
+        if not self.fields:
+            return False
+        for op in patch:
+            for key in ("path", "from"):
+                if key not in op:
+                    continue
+                path = _tokens(op[key])
+                for field in self.fields:
+                    if path[:len(field)] == field:
+                        return True
+                    if field[:len(path)] == path:
+                        # An ancestor add only matters if what it adds contains the field;
+                        # anything else may have replaced or removed it.
+                        if op.get("op") != "add" or key == "from" or _lookup(op.get("value"), field[len(path):]):
+                            return True
+        return False
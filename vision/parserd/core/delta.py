@@ -1,16 +1,211 @@
-import copy
-import jsonpatch
+from typing import Any, Dict, List
+
+from .state import MemoryStateStore, PaneState
+
+
+class Snapshot:
+    """Immutable view of a JSON object or array with a structural digest.
+
+    Children are nested ``Snapshot`` objects or plain scalars; ``plain`` is a
+    private read-only mirror that shares the mirrors of unchanged children.
+    Equality is JSON equality, as in ``jsonpatch.make_patch``: scalars must
+    match in type as well as value, so ``1``, ``1.0`` and ``True`` differ.
+    Two subtrees with unequal digests are known to differ without walking them.
+    """
+
+    __slots__ = ("is_dict", "children", "plain", "digest")
+
+    def __init__(self, is_dict: bool, children: Any):
+        self.is_dict = is_dict
+        self.children = children
+        if is_dict:
+            self.plain = {k: _plain(c) for k, c in children.items()}
+            self.digest = hash(tuple((k, _digest(c)) for k, c in children.items()))
+        else:
+            self.plain = [_plain(c) for c in children]
+            self.digest = hash(tuple(_digest(c) for c in children))
+
+    @classmethod
+    def freeze(cls, value: Any, previous: Any = None) -> Any:
+        """Snapshot ``value``, sharing every subtree that equals ``previous``.
+
+        When nothing changed the previous snapshot itself is returned, so an
+        unchanged tree costs one comparison and type walk and no allocation.
+        """
+        if isinstance(value, _CONTAINERS):
+            return _freeze(value, previous)
+        return value
+
+    def thaw(self) -> Any:
+        if self.is_dict:
+            return {k: _thaw(c) for k, c in self.children.items()}
+        return [_thaw(c) for c in self.children]
+
+
+_CONTAINERS = (dict, list, tuple)
+_NESTED = {dict, list}
+
+
+def _freeze(value: Any, prev: Any) -> Snapshot:
+    is_dict = isinstance(value, dict)
+    if prev.__class__ is Snapshot and prev.is_dict == is_dict:
+        if _equal(value, prev.plain):
+            return prev
+        old = prev.children
+    else:
+        old = {} if is_dict else ()
+    # Scalars are handled inline: one call per container, not per leaf.
+    if is_dict:
+        children = {}
+        for k, v in value.items():
+            children[k] = _freeze(v, old.get(k)) if isinstance(v, _CONTAINERS) else v
+        return Snapshot(True, children)
+    n_old = len(old)
+    children = []
+    for i, v in enumerate(value):
+        children.append(_freeze(v, old[i] if i < n_old else None) if isinstance(v, _CONTAINERS) else v)
+    return Snapshot(False, tuple(children))
+
+
+def _plain(node: Any) -> Any:
+    return node.plain if node.__class__ is Snapshot else node
+
+
+def _digest(node: Any) -> int:
+    if node.__class__ is Snapshot:
+        return node.digest
+    return hash((node.__class__, node))
+
+
+def _equal(a: Any, b: Any) -> bool:
+    """``a == b`` on plain values, except that scalars must also match in type."""
+    # The C-level == settles most comparisons; the type walk only runs on trees it calls equal.
+    return a is b or (a.__class__ is b.__class__ and a == b and _same_types(a, b))
+
+
+def _same_types(a: Any, b: Any) -> bool:
+    """Whether two trees that compare ``==`` also agree on every node's type."""
+    if a.__class__ is dict:
+        for k, x in a.items():
+            y = b[k]
+            if x is not y and (x.__class__ is not y.__class__ or (x.__class__ in _NESTED and not _same_types(x, y))):
+                return False
+    elif a.__class__ is list:
+        for x, y in zip(a, b):
+            if x is not y and (x.__class__ is not y.__class__ or (x.__class__ in _NESTED and not _same_types(x, y))):
+                return False
+    return True
+
+
+def _thaw(node: Any) -> Any:
+    return node.thaw() if node.__class__ is Snapshot else node
+
+
+def _same(a: Any, b: Any) -> bool:
+    if a is b:
+        return True
+    a_node, b_node = a.__class__ is Snapshot, b.__class__ is Snapshot
+    if a_node or b_node:
+        return a_node and b_node and a.is_dict == b.is_dict and a.digest == b.digest and _equal(a.plain, b.plain)
+    return a.__class__ is b.__class__ and a == b
+
+
+EMPTY = Snapshot.freeze({})
+
+
+def _escape(token: Any) -> str:
+    return str(token).replace("~", "~0").replace("/", "~1")
+
+
+def diff_snapshots(before: Any, after: Any, path: str = "") -> List[Dict[str, Any]]:
+    """RFC-6902 operations turning ``before`` into ``after``."""
+    ops: List[Dict[str, Any]] = []
+    _diff(before, after, path, ops)
+    return ops
+
+
+def _diff(before: Any, after: Any, path: str, ops: List[Dict[str, Any]]):
+    if _same(before, after):
+        return
+    if before.__class__ is not Snapshot or after.__class__ is not Snapshot or before.is_dict != after.is_dict:
+        ops.append({"op": "replace", "path": path, "value": _thaw(after)})
+        return
+    old, new = before.children, after.children
+    if before.is_dict:
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        for key, child in new.items():
+            if key not in old:
+                ops.append({"op": "add", "path": f"{path}/{_escape(key)}", "value": _thaw(child)})
+            else:
+                _diff(old[key], child, f"{path}/{_escape(key)}", ops)
+        return
+    common = min(len(old), len(new))
+    changed = [i for i in range(common) if not _same(old[i], new[i])]
+    if len(changed) * 2 > max(len(old), len(new)):
+        # Mostly different (e.g. items shifted): one replace beats N element ops.
+        ops.append({"op": "replace", "path": path, "value": after.thaw()})
+        return
+    for i in changed:
+        _diff(old[i], new[i], f"{path}/{i}", ops)
+    for i in range(common, len(new)):
+        ops.append({"op": "add", "path": f"{path}/{i}", "value": _thaw(new[i])})
+    for i in range(len(old) - 1, common - 1, -1):
+        ops.append({"op": "remove", "path": f"{path}/{i}"})
+
+
+def diff(before: Any, after: Any) -> List[Dict[str, Any]]:
+    return diff_snapshots(Snapshot.freeze(before), Snapshot.freeze(after))
 
 
 class DeltaEngine:
-    def __init__(self):
-        self._last = {}
-
-    def patch(self, pane: str, current: dict) -> list:
-        before = self._last.get(pane, {})
-        patch = jsonpatch.make_patch(before, current)
-        ops = patch.patch
-        if ops:
-            self._last[pane] = copy.deepcopy(current)
+    """Per-pane diffing against the last emitted facts, held in a state store.
+
+    ``patch(..., commit=False)`` stages the new snapshot; ``commit`` makes it
+    the base for the next diff once the brief has actually been emitted.
+    """
+
+    def __init__(self, store: MemoryStateStore = None):
+        self.store = store if store is not None else MemoryStateStore()
+        self._pending: Dict[str, Any] = {}
+
+    def _state(self, pane: str):
+        state = self.store.get(pane)
+        if state is not None and state.snapshot.__class__ is not Snapshot:
+            state.snapshot = Snapshot.freeze(state.snapshot)
+        return state
+
+    def patch(self, pane: str, current: dict, commit: bool = True) -> list:
+        state = self._state(pane)
+        before = state.snapshot if state is not None else EMPTY
+        after = Snapshot.freeze(current, before)
+        ops = [] if after is before else diff_snapshots(before, after)
+        if not ops:
+            self._pending.pop(pane, None)
+        elif commit:
+            self._put(pane, after, None)
+        else:
+            self._pending[pane] = after
         return ops
 
+    def commit(self, pane: str, confidence: float = None):
+        after = self._pending.pop(pane, None)
+        if after is not None:
+            self._put(pane, after, confidence)
+
+    def _put(self, pane: str, snapshot: Any, confidence: float):
+        self.store.put(pane, PaneState(snapshot, confidence))
+
+    def snapshot(self, pane: str) -> "Snapshot":
+        """Committed snapshot for ``pane`` (``EMPTY`` when nothing was emitted yet)."""
+        state = self._state(pane)
+        return state.snapshot if state is not None else EMPTY
+
+    def last(self, pane: str) -> dict:
+        state = self._state(pane)
+        return _thaw(state.snapshot) if state is not None else {}
+
+    def last_confidence(self, pane: str) -> float:
+        state = self.store.get(pane)
+        return state.confidence if state is not None and state.confidence is not None else 0.0
@@ -1,20 +1,11 @@
 import asyncio
-import aiohttp
 from aiohttp import web
-import logging
-from .jsonseq import encode_record
+from .encode import as_encoded
 
 
-async def emit_webhook(url: str, brief: dict):
-    async with aiohttp.ClientSession() as session:
-        async with session.post(url, json=brief) as resp:
-            if resp.status >= 300:
-                logging.warning("webhook failed: %s", resp.status)
-
-
-async def stream_sse(request, queue):
+async def _stream(request, queue, content_type: str, frame):
     response = web.StreamResponse(status=200, reason='OK', headers={
-        'Content-Type': 'text/event-stream',
+        'Content-Type': content_type,
         'Cache-Control': 'no-cache',
         'Connection': 'keep-alive',
     })
@@ -22,28 +13,22 @@ async def stream_sse(request, queue):
     try:
         while True:
             item = await queue.get()
-            line = f"data: {item}\n\n".encode("utf-8")
-            await response.write(line)
-            await response.drain()
-    except asyncio.CancelledError:
+            # Frames are cached on the item, so every subscriber writes the same bytes.
+            await response.write(frame(as_encoded(item)))
+    except (asyncio.CancelledError, ConnectionResetError):
+        # Client went away; the caller unsubscribes.
         pass
     finally:
-        await response.write_eof()
+        try:
+            await response.write_eof()
+        except ConnectionResetError:
+            pass
     return response
 
 
+async def stream_sse(request, queue):
+    return await _stream(request, queue, 'text/event-stream', lambda encoded: encoded.sse)
+
+
 async def stream_jsonseq(request, queue):
-    response = web.StreamResponse(status=200, reason='OK', headers={
-        'Content-Type': 'application/json-seq',
-    })
-    await response.prepare(request)
-    try:
-        while True:
-            item = await queue.get()
-            await response.write(encode_record(item))
-            await response.drain()
-    except asyncio.CancelledError:
-        pass
-    finally:
-        await response.write_eof()
-    return response
+    return await _stream(request, queue, 'application/json-seq', lambda encoded: encoded.jsonseq)
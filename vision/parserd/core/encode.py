@@ -0,0 +1,80 @@
+"""Encode-once brief serialization shared by every transport.
+
+A brief is turned into UTF-8 JSON bytes exactly once; JSON-seq and SSE frames
+are built from that buffer on first use and then reused for every subscriber
+and sink. The fastest available encoder wins: orjson when installed, then
+ujson (already a dependency), then the stdlib.
+"""
+import json
+from typing import Any, Callable, Optional
+
+from .jsonseq import frame_record
+from .sse import sse_frame
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+def _json_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+if orjson is not None:
+    ENCODER = "orjson"
+    dumps: Callable[[Any], bytes] = orjson.dumps
+elif ujson is not None:
+    ENCODER = "ujson"
+
+    def dumps(obj: Any) -> bytes:
+        return ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False).encode("utf-8")
+else:
+    ENCODER = "json"
+    dumps = _json_dumps
+
+
+class EncodedBrief:
+    """A brief plus its lazily built, cached wire forms (all ``bytes``)."""
+
+    __slots__ = ("brief", "_body", "_jsonseq", "_sse")
+
+    def __init__(self, brief: dict):
+        self.brief = brief
+        self._body: Optional[bytes] = None
+        self._jsonseq: Optional[bytes] = None
+        self._sse: Optional[bytes] = None
+
+    @property
+    def body(self) -> bytes:
+        if self._body is None:
+            self._body = dumps(self.brief)
+        return self._body
+
+    @property
+    def jsonseq(self) -> bytes:
+        if self._jsonseq is None:
+            self._jsonseq = frame_record(self.body)
+        return self._jsonseq
+
+    @property
+    def sse(self) -> bytes:
+        if self._sse is None:
+            self._sse = sse_frame(self.body)
+        return self._sse
+
+
+def as_encoded(item: Any) -> EncodedBrief:
+    """Wrap a brief dict, or pre-serialized JSON text/bytes, without re-encoding it."""
+    if isinstance(item, EncodedBrief):
+        return item
+    if isinstance(item, (bytes, bytearray, memoryview, str)):
+        encoded = EncodedBrief(None)
+        encoded._body = item.encode("utf-8") if isinstance(item, str) else bytes(item)
+        return encoded
+    return EncodedBrief(item)
@@ -0,0 +1,151 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import BrokenExecutor, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+MODES = ("inline", "thread", "process")
+
+# What a parse that missed its deadline reports: no facts, zero confidence,
+# so it is never emitted and never becomes a diff base.
+TIMED_OUT: Tuple[Dict[str, Any], float] = ({}, 0.0)
+
+
+def _timed(fn: Callable, args: tuple) -> Tuple[Any, float]:
+    # Runs in the worker, so the measured time excludes queueing and pickling.
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - t0
+
+
+class ParseExecutor:
+    """Runs parser calls off the event loop with per-parse deadlines.
+
+    ``inline`` calls the parser on the loop (no deadline can be enforced; late
+    parses are only counted as ``overruns``). ``thread`` and ``process`` pin
+    each pane to one of ``workers`` single-worker lanes, so a pane's parses
+    run in order and panes spread evenly across lanes. A parse that misses
+    its deadline returns ``TIMED_OUT``. If it is still running, its lane gets
+    a fresh worker so the panes sharing it are not held up: the stuck thread
+    is abandoned, or the stuck process is terminated. Until an abandoned
+    thread returns, further parses of that pane time out immediately instead
+    of tying up another worker.
+    """
+
+    def __init__(self, mode: str = "inline", workers: int = 4, timeout_s: float = 1.0, metrics=None):
+        if mode not in MODES:
+            raise ValueError(f"unknown parse executor mode {mode!r}")
+        self.mode = mode
+        self.workers = max(1, int(workers))
+        self.timeout_s = float(timeout_s)
+        self.metrics = metrics
+        self._lanes: List[Optional[Executor]] = [None] * self.workers
+        self._locks = [asyncio.Lock() for _ in range(self.workers)]
+        self._pins: Dict[str, int] = {}
+        self._hung: Dict[str, Future] = {}
+        self.counters = {
+            "completed": 0, "timeouts": 0, "skipped": 0, "overruns": 0, "errors": 0, "lanes_replaced": 0,
+        }
+
+    def _new_lane(self) -> Executor:
+        if self.mode == "process":
+            return ProcessPoolExecutor(max_workers=1)
+        return ThreadPoolExecutor(max_workers=1, thread_name_prefix="parse")
+
+    def _pin(self, pane: str) -> int:
+        lane = self._pins.get(pane)
+        if lane is None:
+            load = [0] * self.workers
+            for pinned in self._pins.values():
+                load[pinned] += 1
+            lane = self._pins[pane] = load.index(min(load))
+        return lane
+
+    def _observe(self, pane: str, stage: str, seconds: float):
+        if self.metrics is not None:
+            self.metrics.observe(pane, stage, seconds)
+
+    def _count(self, pane: str, name: str):
+        self.counters[name] += 1
+        if self.metrics is not None:
+            self.metrics.count(pane, f"parse_{name}")
+
+    async def run(self, pane: str, fn: Callable, *args, timeout_s: Optional[float] = None):
+        """``fn(*args)`` for ``pane``; ``TIMED_OUT`` if it misses its deadline.
+
+        The deadline covers waiting for the pane's lane as well as the parse.
+        In ``process`` mode ``fn``, its arguments and its result must pickle.
+        """
+        deadline = self.timeout_s if timeout_s is None else float(timeout_s)
+        if self.mode == "inline":
+            try:
+                result, elapsed = _timed(fn, args)
+            except Exception:
+                self._count(pane, "errors")
+                raise
+            self._observe(pane, "parse_exec", elapsed)
+            self._count(pane, "completed")
+            if deadline > 0 and elapsed > deadline:
+                self._count(pane, "overruns")
+            return result
+        if pane in self._hung:
+            self._count(pane, "skipped")
+            return TIMED_OUT
+        lane = self._pin(pane)
+        submitted = time.perf_counter()
+        future: Optional[Future] = None
+        try:
+            async with asyncio.timeout(deadline if deadline > 0 else None):
+                async with self._locks[lane]:
+                    self._observe(pane, "parse_queue", time.perf_counter() - submitted)
+                    executor = self._lanes[lane]
+                    if executor is None:
+                        executor = self._lanes[lane] = self._new_lane()
+                    future = executor.submit(_timed, fn, args)
+                    result, elapsed = await asyncio.wrap_future(future)
+        except TimeoutError:
+            self._count(pane, "timeouts")
+            if future is not None and not future.done():
+                self._replace(lane, pane, future)
+            return TIMED_OUT
+        except BrokenExecutor:
+            self._lanes[lane] = None
+            self._count(pane, "errors")
+            raise
+        except Exception:
+            self._count(pane, "errors")
+            raise
+        self._observe(pane, "parse_exec", elapsed)
+        self._count(pane, "completed")
+        return result
+
+    def _replace(self, lane: int, pane: str, future: Future):
+        executor = self._lanes[lane]
+        self._lanes[lane] = None
+        self._count(pane, "lanes_replaced")
+        logging.warning("parse of %s exceeded its deadline; replacing worker lane %d", pane, lane)
+        if isinstance(executor, ProcessPoolExecutor):
+            # ProcessPoolExecutor has no public way to stop a running call.
+            for process in list(getattr(executor, "_processes", {}).values()):
+                process.terminate()
+        else:
+            # A thread cannot be stopped; keep the pane off the new worker until it returns.
+            self._hung[pane] = future
+            future.add_done_callback(lambda _: self._hung.pop(pane, None))
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def close(self):
+        for i, executor in enumerate(self._lanes):
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+            self._lanes[i] = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "workers": self.workers if self.mode != "inline" else 0,
+            "timeout_ms": round(self.timeout_s * 1000.0, 1),
+            "hung": len(self._hung),
+            **self.counters,
+        }
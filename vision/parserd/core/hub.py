@@ -0,0 +1,160 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Set
+
+from .conflate import ConflatingQueue, Update
+from .critical import CriticalFields
+from .pathfilter import PathFilter
+from .scheduler import CaptureScheduler
+
+Tick = Callable[[str], Awaitable[Optional[Any]]]
+Prime = Callable[[str], Optional[Any]]
+
+
+class Subscription:
+    """One pane of a /watch client: a conflating queue fed by the shared pane loop.
+
+    A multi-pane client passes the same ``queue`` to each of its panes'
+    subscriptions, so their briefs interleave in one stream. With ``paths``
+    only the selected parts of the facts are delivered (see ``PathFilter``).
+    """
+
+    def __init__(self, pane: str, fps: float, threshold: int = 8, paths: Optional[Iterable[str]] = None,
+                 queue: Optional[ConflatingQueue] = None, critical: Optional[CriticalFields] = None):
+        self.pane = pane
+        self.fps = max(0.1, float(fps))
+        self.queue = queue if queue is not None else ConflatingQueue(threshold)
+        self.filter = PathFilter(paths, critical) if paths else None
+        self.filtered = 0
+
+    def offer(self, item: Any, shared: Optional[Dict[Any, Any]] = None):
+        if self.filter is not None and isinstance(item, Update):
+            item = self.filter.apply(item, shared)
+            if item is None:
+                self.filtered += 1
+                return
+        # Never blocks: a slow reader gets merged patches instead of stalling the loop.
+        self.queue.put_nowait(item)
+
+    def stats(self) -> Dict[str, Any]:
+        out = {"fps": self.fps, **self.queue.stats()}
+        if self.filter is not None:
+            out["paths"] = list(self.filter.pointers)
+            out["filtered"] = self.filtered
+        return out
+
+
+class PaneLoop:
+    def __init__(self, pane: str, tick: Tick, scheduler: CaptureScheduler, metrics=None):
+        self.pane = pane
+        self.tick = tick
+        self.scheduler = scheduler
+        self.metrics = metrics
+        self.subscribers: Set[Subscription] = set()
+        self.task: Optional[asyncio.Task] = None
+        self.ticks = 0
+
+    @property
+    def fps(self) -> float:
+        return max((s.fps for s in self.subscribers), default=1.0)
+
+    async def run(self):
+        while self.subscribers:
+            await self.scheduler.acquire(self.pane)
+            item = None
+            try:
+                item = await self.tick(self.pane)
+            except asyncio.CancelledError:
+                raise
+            except Exception:  # noqa: BLE001
+                logging.exception("pane loop %s tick failed", self.pane)
+            finally:
+                self.scheduler.release(self.pane, changed=item is not None)
+            self.ticks += 1
+            if self.metrics is not None:
+                self.metrics.tick(self.pane, self.fps)
+            if item is not None:
+                t0 = time.perf_counter()
+                shared: Dict[Any, Any] = {}  # one projection per distinct filter
+                for sub in list(self.subscribers):
+                    sub.offer(item, shared)
+                if self.metrics is not None:
+                    self.metrics.observe(self.pane, "emit", time.perf_counter() - t0)
+
+
+class CaptureHub:
+    """Runs one capture/parse loop per pane and fans results out to subscribers.
+
+    The loop runs at the highest fps any current subscriber asked for and stops
+    when its last subscriber leaves, so capture load follows panes, not clients.
+    When each pane ticks is up to the shared ``CaptureScheduler``.
+    ``prime`` may return an item that brings a new subscriber up to the current
+    state before it starts receiving live deltas. An optional
+    ``MetricsRegistry`` records achieved fps and fan-out (``emit``) time.
+    Subscribers more than ``conflate_threshold`` items behind have their
+    pending patches merged (see ``ConflatingQueue``). ``critical`` decides
+    whether a brief narrowed by a subscriber's ``paths`` is still critical.
+    """
+
+    def __init__(self, tick: Tick, prime: Optional[Prime] = None, conflate_threshold: int = 8, metrics=None,
+                 scheduler: Optional[CaptureScheduler] = None, critical: Optional[CriticalFields] = None):
+        self.tick = tick
+        self.prime = prime
+        self.scheduler = scheduler if scheduler is not None else CaptureScheduler()
+        self.conflate_threshold = conflate_threshold
+        self.metrics = metrics
+        self.critical = critical
+        self._loops: Dict[str, PaneLoop] = {}
+
+    def subscribe(self, pane: str, fps: float, prime: bool = True, paths: Optional[Iterable[str]] = None,
+                  queue: Optional[ConflatingQueue] = None) -> Subscription:
+        sub = Subscription(pane, fps, threshold=self.conflate_threshold, paths=paths, queue=queue,
+                           critical=self.critical)
+        if prime and self.prime is not None:
+            item = self.prime(pane)
+            if item is not None:
+                sub.offer(item)
+        loop = self._loops.get(pane)
+        if loop is None:
+            loop = self._loops[pane] = PaneLoop(pane, self.tick, self.scheduler, self.metrics)
+        loop.subscribers.add(sub)
+        self.scheduler.register(pane, loop.fps)
+        if loop.task is None or loop.task.done():
+            loop.task = asyncio.create_task(loop.run())
+        return sub
+
+    async def unsubscribe(self, sub: Subscription):
+        loop = self._loops.get(sub.pane)
+        if loop is None:
+            return
+        loop.subscribers.discard(sub)
+        if loop.subscribers:
+            self.scheduler.register(sub.pane, loop.fps)
+            return
+        del self._loops[sub.pane]
+        self.scheduler.unregister(sub.pane)
+        if loop.task is not None:
+            loop.task.cancel()
+            try:
+                await loop.task
+            except asyncio.CancelledError:
+                pass
+
+    async def close(self):
+        for loop in list(self._loops.values()):
+            for sub in list(loop.subscribers):
+                await self.unsubscribe(sub)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            pane: {
+                "fps": loop.fps,
+                "ticks": loop.ticks,
+                "subscriber_count": len(loop.subscribers),
+                "queue_depth_max": max((s.queue.qsize() for s in loop.subscribers), default=0),
+                "lag_max_s": round(max((s.queue.lag_s() for s in loop.subscribers), default=0.0), 3),
+                "subscribers": [s.stats() for s in loop.subscribers],
+            }
+            for pane, loop in self._loops.items()
+        }
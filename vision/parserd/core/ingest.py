@@ -0,0 +1,64 @@
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+from .models import PaneObservation
+from .vision_client import VisionClient
+
+
+class StreamIngest:
+    """Keeps the latest pushed frame per pane from ``VisionClient.stream``.
+
+    ``capture`` answers from memory instead of a ``POST /capture_once``
+    round trip: an unchanged frame comes back as ``not_modified`` exactly as
+    the conditional poll would. It returns ``None`` while the stream is down
+    or before a pane's first frame, so callers can fall back to polling.
+    """
+
+    def __init__(self, client: VisionClient, panes: List[str], mode: str = "jsonseq"):
+        self.client = client
+        self.panes = list(panes)
+        self.mode = mode
+        self._latest: Dict[str, PaneObservation] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.counters = {"served": 0, "fallbacks": 0}
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                async for _, observation in self.client.stream(self.panes, mode=self.mode):
+                    self._latest[observation.pane_id] = observation
+            except asyncio.CancelledError:
+                raise
+            except Exception:  # noqa: BLE001
+                logging.exception("stream ingest error")
+                await asyncio.sleep(1.0)
+
+    def capture(self, pane_id: str, if_none_match: Optional[str] = None) -> Optional[PaneObservation]:
+        observation = self._latest.get(pane_id) if self.client.stream_connected else None
+        if observation is None:
+            self.counters["fallbacks"] += 1
+            return None
+        self.counters["served"] += 1
+        if if_none_match and observation.perceptual_hash == if_none_match:
+            return PaneObservation(pane_id=pane_id, not_modified=True)
+        return observation
+
+    def stats(self) -> Dict[str, Any]:
+        out = dict(self.counters)
+        out["mode"] = self.mode
+        out["panes_with_frames"] = len(self._latest)
+        return out
@@ -4,6 +4,10 @@ import json
 RS = b"\x1e"
 
 
-def encode_record(obj: dict) -> bytes:
-    return RS + json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8") + b"\n"
+def frame_record(body: bytes) -> bytes:
+    """Frame already-serialized JSON bytes as one RFC 7464 record."""
+    return RS + body + b"\n"
+
 
+def encode_record(obj: dict) -> bytes:
+    return frame_record(json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8"))
@@ -0,0 +1,186 @@
+import sys
+import time
+from bisect import bisect_left
+from collections import deque
+from typing import Any, Callable, Dict, List, Tuple
+
+# Upper bounds in seconds; the implicit last bucket is +Inf.
+BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class Histogram:
+    """Fixed-bucket latency histogram; ``observe`` is one bisect and three adds."""
+
+    __slots__ = ("counts", "count", "sum", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q: float) -> float:
+        """Estimate by linear interpolation inside the bucket holding rank ``q``."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lo = BUCKETS[i - 1] if i else 0.0
+                hi = BUCKETS[i] if i < len(BUCKETS) else self.max
+                return min(lo + (hi - lo) * (rank - seen) / n, self.max)
+            seen += n
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.sum / self.count * 1000.0, 3) if self.count else 0.0,
+            "p95_ms": round(self.quantile(0.95) * 1000.0, 3),
+            "max_ms": round(self.max * 1000.0, 3),
+        }
+
+
+class PaneMetrics:
+    __slots__ = ("stages", "counters", "requested_fps", "_ticks")
+
+    def __init__(self):
+        self.stages: Dict[str, Histogram] = {}
+        self.counters: Dict[str, int] = {}
+        self.requested_fps = 0.0
+        self._ticks: deque = deque(maxlen=32)
+
+    def achieved_fps(self) -> float:
+        if len(self._ticks) < 2:
+            return 0.0
+        span = self._ticks[-1] - self._ticks[0]
+        return (len(self._ticks) - 1) / span if span > 0 else 0.0
+
+
+class MetricsRegistry:
+    """In-process per-pane metrics served from ``/healthz`` and ``/metrics``.
+
+    ``add_source`` registers a callable returning a (possibly nested) dict of
+    numbers, e.g. transport or cache counters; its numeric leaves are exported
+    as gauges at scrape time.
+    """
+
+    def __init__(self):
+        self.panes: Dict[str, PaneMetrics] = {}
+        self._sources: Dict[str, Callable[[], Dict[str, Any]]] = {}
+        self.started = time.monotonic()
+
+    def pane(self, pane: str) -> PaneMetrics:
+        metrics = self.panes.get(pane)
+        if metrics is None:
+            metrics = self.panes[pane] = PaneMetrics()
+        return metrics
+
+    def observe(self, pane: str, stage: str, seconds: float):
+        stages = self.pane(pane).stages
+        hist = stages.get(stage)
+        if hist is None:
+            hist = stages[stage] = Histogram()
+        hist.observe(seconds)
+
+    def count(self, pane: str, name: str, n: int = 1):
+        counters = self.pane(pane).counters
+        counters[name] = counters.get(name, 0) + n
+
+    def tick(self, pane: str, requested_fps: float):
+        metrics = self.pane(pane)
+        metrics.requested_fps = requested_fps
+        metrics._ticks.append(time.monotonic())
+
+    def add_source(self, name: str, source: Callable[[], Dict[str, Any]]):
+        self._sources[name] = source
+
+    def snapshot(self) -> Dict[str, Any]:
+        panes = {}
+        for pane, metrics in self.panes.items():
+            panes[pane] = {
+                "fps": {"requested": metrics.requested_fps, "achieved": round(metrics.achieved_fps(), 3)},
+                "stages": {stage: hist.summary() for stage, hist in metrics.stages.items()},
+                **metrics.counters,
+            }
+        out: Dict[str, Any] = {"uptime_s": round(time.monotonic() - self.started, 1), "panes": panes}
+        for name, source in self._sources.items():
+            out[name] = source()
+        return out
+
+    def prometheus(self) -> str:
+        lines: List[str] = [
+            "# TYPE parserd_stage_seconds histogram",
+        ]
+        for pane, metrics in self.panes.items():
+            for stage, hist in metrics.stages.items():
+                labels = f'pane="{pane}",stage="{stage}"'
+                cumulative = 0
+                for bound, n in zip(BUCKETS + (float("inf"),), hist.counts):
+                    cumulative += n
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'parserd_stage_seconds_bucket{{{labels},le="{le}"}} {cumulative}')
+                lines.append(f"parserd_stage_seconds_sum{{{labels}}} {hist.sum!r}")
+                lines.append(f"parserd_stage_seconds_count{{{labels}}} {hist.count}")
+        lines.append("# TYPE parserd_fps gauge")
+        for pane, metrics in self.panes.items():
+            lines.append(f'parserd_fps{{pane="{pane}",kind="requested"}} {metrics.requested_fps!r}')
+            lines.append(f'parserd_fps{{pane="{pane}",kind="achieved"}} {metrics.achieved_fps()!r}')
+        counter_names = sorted({name for m in self.panes.values() for name in m.counters})
+        for name in counter_names:
+            metric = f"parserd_{_metric_name(name)}_total"
+            lines.append(f"# TYPE {metric} counter")
+            for pane, metrics in self.panes.items():
+                if name in metrics.counters:
+                    lines.append(f'{metric}{{pane="{pane}"}} {metrics.counters[name]}')
+        for name, source in self._sources.items():
+            # Exposition format wants every sample of a metric in one group.
+            for key, labels, value in sorted(_flatten(source()), key=lambda sample: sample[0]):
+                lines.append(f"parserd_{name}_{key}{labels} {value!r}")
+        return "\n".join(lines) + "\n"
+
+
+def process_stats() -> Dict[str, Any]:
+    """CPU seconds and peak RSS of this process, for CPU-per-brief accounting."""
+    out: Dict[str, Any] = {"cpu_s": round(time.process_time(), 4)}
+    try:
+        import resource
+    except ImportError:  # not on POSIX
+        return out
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    out["user_s"] = round(usage.ru_utime, 4)
+    out["system_s"] = round(usage.ru_stime, 4)
+    # ru_maxrss is bytes on macOS and KiB on Linux.
+    out["max_rss_kib"] = usage.ru_maxrss // 1024 if sys.platform == "darwin" else usage.ru_maxrss
+    return out
+
+
+def _flatten(data: Dict[str, Any], prefix: str = "", labels: str = "") -> List[Tuple[str, str, float]]:
+    """Numeric leaves of a nested dict; dicts keyed by pane id become a ``pane`` label."""
+    out: List[Tuple[str, str, float]] = []
+    for key, value in data.items():
+        if isinstance(value, bool):
+            value = int(value)
+        if isinstance(value, (int, float)):
+            out.append((f"{prefix}{_metric_name(key)}", "{" + labels + "}" if labels else "", value))
+        elif isinstance(value, dict):
+            if key.isupper() and not labels:
+                out.extend(_flatten(value, prefix, f'pane="{key}"'))
+            else:
+                out.extend(_flatten(value, f"{prefix}{_metric_name(key)}_", labels))
+    return out
+
+
+def _metric_name(key: str) -> str:
+    return "".join(c if c.isalnum() else "_" for c in str(key)).lower()
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+import base64
+from array import array
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
 
 
-@dataclass
+@dataclass(slots=True)
 class Sensor:
     source: str
     frame: Optional[Dict[str, float]]
@@ -12,37 +14,162 @@ class Sensor:
     confidence: Optional[float]
 
 
-@dataclass
+@dataclass(slots=True)
 class Token:
     text: str
     bbox: List[float]
     confidence: float
 
 
-@dataclass
+class Tokens(Sequence):
+    """OCR tokens stored column-wise.
+
+    Texts live in one list; bboxes (``x, y, w, h`` per token) and confidences
+    in contiguous ``array('d')`` buffers. Indexing returns a ``Token`` view
+    built on demand, so code that iterates tokens keeps working.
+    """
+
+    __slots__ = ("texts", "bboxes", "confidences")
+
+    def __init__(self, tokens: Iterable[Any] = ()):
+        self.texts: List[str] = []
+        self.bboxes = array("d")
+        self.confidences = array("d")
+        for tok in tokens:
+            if isinstance(tok, Token):
+                self.append(tok.text, tok.bbox, tok.confidence)
+            else:
+                self.append(tok.get("text", ""), tok.get("bbox") or (), tok.get("confidence", 0.0))
+
+    def append(self, text: str, bbox: Sequence[float], confidence: float):
+        self.texts.append(text)
+        if len(bbox) == 4:
+            self.bboxes.extend(bbox)
+        else:
+            box = list(bbox[:4])
+            self.bboxes.extend(box + [0.0] * (4 - len(box)))
+        self.confidences.append(confidence)
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        return Token(self.texts[i], list(self.bboxes[4 * i:4 * i + 4]), self.confidences[i])
+
+    def __iter__(self) -> Iterator[Token]:
+        for i in range(len(self.texts)):
+            yield self[i]
+
+
+@dataclass(slots=True)
 class Metadata:
     raw: Dict[str, Any]
 
 
-@dataclass
+@dataclass(slots=True)
 class PaneObservation:
+    """One capture of a pane; treat as immutable once built.
+
+    Derived views (``structured_text``, ``ocr_text``, ``token_index``,
+    ``merged_lines()``, ``text``, ``lower_text``) are computed on first use and
+    cached, so every parser and cache lookup on the same frame shares one
+    copy. Callers must not mutate the returned lists. ``png`` is kept
+    base64-encoded until ``png_bytes`` or ``image()`` is asked for.
+    """
+
     pane_id: str
     sensors: List[Sensor] = field(default_factory=list)
-    tokens: List[Token] = field(default_factory=list)
+    tokens: Tokens = field(default_factory=Tokens)
     metadata: Metadata = field(default_factory=lambda: Metadata(raw={}))
+    not_modified: bool = False
+    png: Optional[str] = field(default=None, repr=False)
+    ocr_engine: Optional[str] = None
+    _structured: Optional[List[str]] = field(default=None, init=False, repr=False, compare=False)
+    _ocr: Optional[List[str]] = field(default=None, init=False, repr=False, compare=False)
+    _index: Any = field(default=None, init=False, repr=False, compare=False)
+    _lines: Optional[List[str]] = field(default=None, init=False, repr=False, compare=False)
+    _text: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _lower: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _png_bytes: Optional[bytes] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        if not isinstance(self.tokens, Tokens):
+            self.tokens = Tokens(self.tokens)
 
     @property
     def structured_text(self) -> List[str]:
-        return [s.text for s in self.sensors if s.text]
+        if self._structured is None:
+            self._structured = [s.text for s in self.sensors if s.text]
+        return self._structured
 
     @property
     def ocr_text(self) -> List[str]:
-        return [t.text for t in self.tokens]
+        """OCR lines in reading order; arrival order when tokens carry no boxes."""
+        if self._ocr is None:
+            self._ocr = self.token_index.text_lines() if any(self.tokens.bboxes) else self.tokens.texts
+        return self._ocr
+
+    @property
+    def token_index(self):
+        """``TokenIndex`` over the OCR tokens, built on first use."""
+        if self._index is None:
+            from .spatial import TokenIndex
+
+            # Apple Vision reports normalized boxes with a bottom-left origin.
+            self._index = TokenIndex(self.tokens, y_up=self.ocr_engine == "vision")
+        return self._index
 
     def merged_lines(self) -> List[str]:
-        if self.structured_text:
-            return flatten_lines(self.structured_text)
-        return flatten_lines(self.ocr_text)
+        if self._lines is None:
+            self._lines = flatten_lines(self.structured_text or self.ocr_text)
+        return self._lines
+
+    @property
+    def text(self) -> str:
+        """``merged_lines()`` joined with single spaces."""
+        if self._text is None:
+            self._text = " ".join(self.merged_lines())
+        return self._text
+
+    @property
+    def lower_text(self) -> str:
+        if self._lower is None:
+            self._lower = self.text.lower()
+        return self._lower
+
+    @property
+    def png_bytes(self) -> Optional[bytes]:
+        if self._png_bytes is None and self.png:
+            self._png_bytes = base64.b64decode(self.png)
+        return self._png_bytes
+
+    def image(self):
+        """Decoded pixels as a Pillow image (Pillow is only needed by callers of this)."""
+        data = self.png_bytes
+        if data is None:
+            return None
+        import io
+
+        from PIL import Image
+
+        return Image.open(io.BytesIO(data))
+
+    @property
+    def perceptual_hash(self) -> Optional[str]:
+        value = self.metadata.raw.get("perceptualHash")
+        return str(value) if value else None
+
+    @property
+    def engine(self) -> str:
+        """Which sensor produced the text parsers will see: ax/dom/..., ocr or none."""
+        for sensor in self.sensors:
+            if sensor.text:
+                return sensor.source
+        return "ocr" if self.tokens else "none"
 
     def has_structured(self) -> bool:
         return any(s.text for s in self.sensors)
@@ -59,17 +186,11 @@ class PaneObservation:
                     confidence=item.get("confidence"),
                 )
             )
-        tokens = []
-        for tok in payload.get("ocr", {}).get("tokens", []):
-            tokens.append(
-                Token(
-                    text=tok.get("text", ""),
-                    bbox=tok.get("bbox", []),
-                    confidence=float(tok.get("confidence", 0.0)),
-                )
-            )
+        ocr = payload.get("ocr", {})
+        tokens = Tokens(ocr.get("tokens", []))
         metadata = Metadata(raw=payload.get("metadata", {}))
-        return cls(pane_id=payload.get("pane", ""), sensors=sensors, tokens=tokens, metadata=metadata)
+        return cls(pane_id=payload.get("pane", ""), sensors=sensors, tokens=tokens, metadata=metadata,
+                   png=payload.get("png"), ocr_engine=ocr.get("engine"))
 
     @classmethod
     def choose_best(cls, observations: List["PaneObservation"]) -> "PaneObservation":
@@ -79,7 +200,7 @@ class PaneObservation:
             observations,
             key=lambda obs: (
                 1 if obs.has_structured() else 0,
-                sum(tok.confidence for tok in obs.tokens)
+                sum(obs.tokens.confidences)
             ),
             reverse=True,
         )
@@ -99,4 +220,3 @@ def flatten_lines(lines: List[str]) -> List[str]:
             if stripped:
                 out.append(stripped)
     return out
-
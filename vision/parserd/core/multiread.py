@@ -0,0 +1,69 @@
+import asyncio
+from typing import Awaitable, Callable, List
+
+from .models import PaneObservation
+
+Fetch = Callable[[int], Awaitable[PaneObservation]]
+
+MODES = ("sequential", "hedged", "concurrent")
+
+
+def _settled(obs: PaneObservation) -> bool:
+    return obs.not_modified or obs.has_structured()
+
+
+async def multi_read(
+    fetch: Fetch,
+    passes: int,
+    mode: str = "sequential",
+    hedge_delay_s: float = 0.15,
+    max_concurrent: int = 3,
+) -> List[PaneObservation]:
+    """Run up to ``passes`` reads of a pane and return the completed observations.
+
+    ``sequential`` issues one read after another. ``hedged`` starts the next
+    read whenever the outstanding ones have not settled within
+    ``hedge_delay_s``; ``concurrent`` starts them all at once. In every mode at
+    most ``max_concurrent`` reads are outstanding, and the first read that
+    returns structured text (or ``not_modified``) cancels the rest.
+    """
+    passes = max(1, int(passes))
+    if mode == "sequential" or passes == 1:
+        observations = []
+        for i in range(passes):
+            obs = await fetch(i)
+            observations.append(obs)
+            if _settled(obs):
+                break
+        return observations
+
+    delay = 0.0 if mode == "concurrent" else max(0.0, hedge_delay_s)
+    cap = max(1, int(max_concurrent))
+    observations: List[PaneObservation] = []
+    pending = set()
+    launched = 0
+    try:
+        while True:
+            if launched < passes and len(pending) < cap:
+                pending.add(asyncio.create_task(fetch(launched)))
+                launched += 1
+                if delay == 0.0 and launched < passes and len(pending) < cap:
+                    continue
+            if not pending:
+                return observations
+            can_hedge = launched < passes and len(pending) < cap
+            done, pending = await asyncio.wait(
+                pending,
+                timeout=delay if can_hedge else None,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            for task in done:
+                if task.cancelled() or task.exception() is not None:
+                    continue
+                obs = task.result()
+                observations.append(obs)
+                if _settled(obs):
+                    return [obs] if obs.not_modified else observations
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,85 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .conflate import Update
+from .critical import CriticalFields, _tokens
+from .delta import Snapshot, _plain, diff_snapshots
+
+
+class PathFilter:
+    """A watch subscription's JSON-pointer filter over one pane's facts.
+
+    The subscriber sees a projection of the facts that keeps only the
+    selected subtrees and the objects leading to them. Each brief's delta is
+    recomputed between the projections of its ``before`` and ``after``
+    snapshots. Ops outside the selection disappear, and an op on an ancestor
+    (``add /ci`` when filtering ``/ci/status``) arrives trimmed to the
+    selected part. The patches therefore apply cleanly to the subscriber's
+    own projected copy. A pointer that runs through an array selects the
+    whole array. Pointers may omit the leading slash, as in
+    ``emit.critical_fields``. A narrowed brief stays critical only if its own
+    patch still touches one of ``critical``.
+    """
+
+    def __init__(self, pointers: Iterable[str], critical: Optional[CriticalFields] = None):
+        self.pointers = tuple(sorted(set(pointers)))
+        self.critical = critical
+        if not self.pointers:
+            raise ValueError("a path filter needs at least one pointer")
+        fields = sorted({_tokens(p) for p in self.pointers}, key=len)
+        # "/ci" already covers "/ci/status".
+        self.fields: List[Tuple[str, ...]] = [
+            f for i, f in enumerate(fields) if not any(f[:len(g)] == g for g in fields[:i])
+        ]
+        self._memo: Tuple[Any, Any] = (None, None)
+
+    @property
+    def key(self) -> Tuple[str, ...]:
+        """Identity shared by equal filters, for reusing a projection across subscribers."""
+        return self.pointers
+
+    def project(self, snapshot: Any) -> Any:
+        if not self.fields[0]:
+            return snapshot  # "" selects the whole document
+        if snapshot is self._memo[0]:
+            # An update's ``before`` is usually the previous update's ``after``.
+            return self._memo[1]
+        out: Dict[str, Any] = {}
+        for field in self.fields:
+            _copy_path(snapshot, field, out)
+        projected = Snapshot.freeze(out, self._memo[1])
+        self._memo = (snapshot, projected)
+        return projected
+
+    def apply(self, update: Update, shared: Optional[Dict[Any, Any]] = None) -> Optional[Update]:
+        """``update`` narrowed to this filter, or ``None`` when nothing selected changed.
+
+        ``shared`` caches results by filter for one fan-out, so subscribers
+        with equal filters get the same (encode-once) instance.
+        """
+        if shared is not None and self.key in shared:
+            return shared[self.key]
+        before, after = self.project(update.before), self.project(update.after)
+        delta = diff_snapshots(before, after)
+        narrowed = None
+        if delta:
+            brief = dict(update.brief)
+            brief["delta"] = delta
+            critical = update.critical and self.critical is not None and self.critical.touches(delta)
+            narrowed = Update(brief, before, after, critical=critical)
+            narrowed.enqueued_at = update.enqueued_at
+        if shared is not None:
+            shared[self.key] = narrowed
+        return narrowed
+
+
+def _copy_path(node: Any, field: Tuple[str, ...], out: Dict[str, Any]):
+    """Copy ``node``'s subtree at ``field`` into ``out``, creating the objects on the way."""
+    for i, token in enumerate(field):
+        if node.__class__ is not Snapshot or not node.is_dict or token not in node.children:
+            return
+        child = node.children[token]
+        if i == len(field) - 1 or (child.__class__ is Snapshot and not child.is_dict):
+            out[token] = _plain(child)
+            return
+        out = out.setdefault(token, {})
+        node = child
@@ -0,0 +1,180 @@
+"""Append-only capture recordings for offline replay.
+
+A recording is a pair of files:
+
+* ``<name>.jsonseq.gz``: RFC 7464 records ``{"t": epoch_s, "pane": id,
+  "frame": payload}``, gzip-compressed in blocks. Each block is a complete
+  gzip member, so the file as a whole is still a valid gzip stream (``zcat``
+  works) and a block can be decompressed on its own.
+* ``<name>.idx``: one JSON-seq line per block with its byte offset, length,
+  time range and per-pane record counts. A reader can then seek straight to
+  the blocks holding a pane without inflating the rest.
+
+The frame bytes are spliced in exactly as visiond sent them, never re-encoded.
+"""
+import gzip
+import json
+import time
+import zlib
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .jsonseq import RS, encode_record, frame_record
+
+
+class CaptureRecorder:
+    """Buffers records and appends them as one gzip member per block.
+
+    A block is written once it reaches ``block_bytes`` uncompressed, or when
+    a record arrives ``flush_s`` after the block was started; ``close()``
+    writes whatever is left. Compression happens inline on the caller's
+    thread, so keep blocks small enough (tens of KiB) that one write costs a
+    millisecond or two.
+    """
+
+    def __init__(self, path: Path, block_bytes: int = 64 * 1024, flush_s: float = 5.0, level: int = 6):
+        self.path = Path(path)
+        self.index_path = self.path.with_name(self.path.name.replace(".jsonseq.gz", "") + ".idx")
+        self.block_bytes = max(1024, int(block_bytes))
+        self.flush_s = float(flush_s)
+        self.level = int(level)
+        self._buffer: List[bytes] = []
+        self._buffered = 0
+        self._panes: Dict[str, int] = {}
+        self._t0: Optional[float] = None
+        self._t1 = 0.0
+        self._opened = 0.0
+        self.counters = {"records": 0, "blocks": 0, "bytes_in": 0, "bytes_written": 0}
+
+    def record(self, pane: str, body: bytes, t: Optional[float] = None):
+        """Append one capture payload (raw JSON bytes as received)."""
+        t = time.time() if t is None else t
+        line = frame_record(b'{"t":%.3f,"pane":%s,"frame":%s}' % (t, json.dumps(pane).encode("utf-8"), body))
+        if not self._buffer:
+            self._t0 = t
+            self._opened = time.monotonic()
+        self._buffer.append(line)
+        self._buffered += len(line)
+        self._t1 = t
+        self._panes[pane] = self._panes.get(pane, 0) + 1
+        self.counters["records"] += 1
+        self.counters["bytes_in"] += len(line)
+        if self._buffered >= self.block_bytes or time.monotonic() - self._opened >= self.flush_s:
+            self.flush()
+
+    def flush(self):
+        if not self._buffer:
+            return
+        block = gzip.compress(b"".join(self._buffer), compresslevel=self.level, mtime=0)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "ab") as f:
+            offset = f.tell()
+            f.write(block)
+        entry = {"offset": offset, "length": len(block), "t0": self._t0, "t1": self._t1,
+                 "records": len(self._buffer), "panes": self._panes}
+        # The index is written after its block: a crash in between loses only index
+        # entries, which CaptureLog recovers by scanning the tail of the log.
+        with open(self.index_path, "ab") as f:
+            f.write(encode_record(entry))
+        self.counters["blocks"] += 1
+        self.counters["bytes_written"] += len(block)
+        self._buffer = []
+        self._buffered = 0
+        self._panes = {}
+
+    def close(self):
+        self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        out = dict(self.counters)
+        out["buffered_bytes"] = self._buffered
+        out["ratio"] = round(out["bytes_in"] / out["bytes_written"], 2) if out["bytes_written"] else 0.0
+        out["path"] = str(self.path)
+        return out
+
+
+class CaptureLog:
+    """Reads a recording written by ``CaptureRecorder``."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.index_path = self.path.with_name(self.path.name.replace(".jsonseq.gz", "") + ".idx")
+        self.blocks = self._load_index()
+
+    def _load_index(self) -> List[Dict[str, Any]]:
+        blocks: List[Dict[str, Any]] = []
+        if self.index_path.exists():
+            for line in self.index_path.read_bytes().split(RS):
+                if line.strip():
+                    blocks.append(json.loads(line))
+        end = blocks[-1]["offset"] + blocks[-1]["length"] if blocks else 0
+        size = self.path.stat().st_size if self.path.exists() else 0
+        if end < size:
+            blocks.extend(self._scan(end))
+        return blocks
+
+    def _scan(self, offset: int) -> List[Dict[str, Any]]:
+        """Index entries for unindexed gzip members from ``offset`` on."""
+        data = self.path.read_bytes()[offset:]
+        blocks = []
+        while data:
+            inflater = zlib.decompressobj(wbits=31)
+            try:
+                raw = inflater.decompress(data)
+            except zlib.error:
+                break  # torn final block
+            if not inflater.eof:
+                break
+            length = len(data) - len(inflater.unused_data)
+            records = list(_records(raw))
+            panes: Dict[str, int] = {}
+            for _, pane, _ in records:
+                panes[pane] = panes.get(pane, 0) + 1
+            if records:
+                blocks.append({"offset": offset, "length": length, "t0": records[0][0], "t1": records[-1][0],
+                               "records": len(records), "panes": panes})
+            offset += length
+            data = inflater.unused_data
+        return blocks
+
+    def panes(self) -> Dict[str, int]:
+        """Record count per pane, from the index alone."""
+        out: Dict[str, int] = {}
+        for block in self.blocks:
+            for pane, n in block["panes"].items():
+                out[pane] = out.get(pane, 0) + n
+        return out
+
+    def records(self, panes: Optional[List[str]] = None) -> Iterator[Tuple[float, str, Dict[str, Any]]]:
+        """``(t, pane, payload)`` in recorded order, reading only blocks that hold ``panes``."""
+        wanted = set(panes) if panes else None
+        with open(self.path, "rb") as f:
+            for block in self.blocks:
+                if wanted is not None and not wanted.intersection(block["panes"]):
+                    continue
+                f.seek(block["offset"])
+                for t, pane, frame in _records(gzip.decompress(f.read(block["length"]))):
+                    if wanted is None or pane in wanted:
+                        yield t, pane, frame
+
+
+def _records(raw: bytes) -> Iterator[Tuple[float, str, Dict[str, Any]]]:
+    for line in raw.split(RS):
+        if line.strip():
+            record = json.loads(line)
+            yield float(record["t"]), record["pane"], record["frame"]
+
+
+def make_recorder(conf: Dict[str, Any], root: Path) -> Optional[CaptureRecorder]:
+    if not conf.get("enabled"):
+        return None
+    directory = Path(conf.get("dir", "vision/.state/recordings")).expanduser()
+    directory = directory if directory.is_absolute() else root / directory
+    # One recording per process start, so replay timing never spans a restart.
+    name = datetime.now(timezone.utc).strftime("capture-%Y%m%dT%H%M%SZ.jsonseq.gz")
+    return CaptureRecorder(
+        directory / name,
+        block_bytes=int(conf.get("block_kib", 64)) * 1024,
+        flush_s=float(conf.get("flush_s", 5)),
+    )
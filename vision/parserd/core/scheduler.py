@@ -0,0 +1,143 @@
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Any, Dict, List, Tuple
+
+
+class PaneSchedule:
+    __slots__ = ("fps", "interval", "deadline", "idle_ticks", "ticks", "missed", "max_late_s", "priority")
+
+    def __init__(self, fps: float):
+        self.fps = fps
+        self.priority = 0
+        self.interval = 1.0 / fps
+        self.deadline = time.monotonic()
+        self.idle_ticks = 0
+        self.ticks = 0
+        self.missed = 0
+        self.max_late_s = 0.0
+
+
+class CaptureScheduler:
+    """Decides when each pane is captured.
+
+    Panes run on absolute deadlines (``deadline += interval``), so capture,
+    parse and emit time no longer stretches the period. A pane whose ticks
+    produced nothing for ``idle_ticks`` in a row backs off by ``backoff`` per
+    tick up to ``max_interval_s``; the first tick that changes something snaps
+    it back to the requested rate. At most ``max_in_flight`` ticks run at once
+    across all panes, matching visiond's ``max_frames_in_flight``. Deadlines
+    that pass while a pane is still busy (or waiting for a slot) are skipped,
+    not replayed, and counted as missed. When every slot is busy, waiting
+    panes are served by ``priority`` (see ``set_priority``), then FIFO.
+    """
+
+    def __init__(self, max_in_flight: int = 3, idle_ticks: int = 10, backoff: float = 2.0,
+                 max_interval_s: float = 5.0):
+        self.max_in_flight = max(1, int(max_in_flight))
+        self.idle_ticks = max(1, int(idle_ticks))
+        self.backoff = max(1.0, float(backoff))
+        self.max_interval_s = float(max_interval_s)
+        self._in_flight = 0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._waiting = 0
+        self._seq = itertools.count()
+        self.panes: Dict[str, PaneSchedule] = {}
+
+    def register(self, pane: str, fps: float):
+        fps = max(0.1, float(fps))
+        schedule = self.panes.get(pane)
+        if schedule is None:
+            self.panes[pane] = PaneSchedule(fps)
+        elif schedule.fps != fps:
+            # A subscriber joined or left: restart from the newly requested rate.
+            schedule.fps = fps
+            schedule.interval = 1.0 / fps
+            schedule.idle_ticks = 0
+            schedule.deadline = min(schedule.deadline, time.monotonic() + schedule.interval)
+
+    def unregister(self, pane: str):
+        self.panes.pop(pane, None)
+
+    def set_priority(self, pane: str, priority: int):
+        schedule = self.panes.get(pane)
+        if schedule is not None:
+            schedule.priority = priority
+
+    async def _acquire_slot(self, priority: int):
+        if self._in_flight < self.max_in_flight and not self._waiting:
+            self._in_flight += 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (-priority, next(self._seq), future))
+        self._waiting += 1
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.cancelled():
+                self._waiting -= 1  # its heap entry is skipped lazily
+            else:
+                self._release_slot()  # the slot was handed over just before the cancel
+            raise
+
+    def _release_slot(self):
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)  # hand the slot over; in-flight count is unchanged
+                self._waiting -= 1
+                return
+        self._in_flight -= 1
+
+    async def acquire(self, pane: str):
+        """Wait for ``pane``'s next deadline, then for a global capture slot."""
+        schedule = self.panes[pane]
+        delay = schedule.deadline - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        await self._acquire_slot(schedule.priority)
+        late = time.monotonic() - schedule.deadline
+        if late > schedule.max_late_s:
+            schedule.max_late_s = late
+
+    def release(self, pane: str, changed: bool):
+        """Free the slot and plan the next deadline from how the tick went."""
+        self._release_slot()
+        schedule = self.panes.get(pane)
+        if schedule is None:
+            return
+        schedule.ticks += 1
+        base = 1.0 / schedule.fps
+        if changed:
+            schedule.idle_ticks = 0
+            schedule.interval = base
+        else:
+            schedule.idle_ticks += 1
+            if schedule.idle_ticks >= self.idle_ticks:
+                schedule.interval = min(schedule.interval * self.backoff, max(base, self.max_interval_s))
+        schedule.deadline += schedule.interval
+        now = time.monotonic()
+        if schedule.deadline < now:
+            skipped = int((now - schedule.deadline) / schedule.interval) + 1
+            schedule.missed += skipped
+            schedule.deadline += skipped * schedule.interval
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": self._in_flight,
+            "max_in_flight": self.max_in_flight,
+            "waiting": self._waiting,
+            "panes": {
+                pane: {
+                    "requested_fps": s.fps,
+                    "priority": s.priority,
+                    "scheduled_fps": round(1.0 / s.interval, 3),
+                    "idle_ticks": s.idle_ticks,
+                    "ticks": s.ticks,
+                    "missed_deadlines": s.missed,
+                    "max_late_ms": round(s.max_late_s * 1000.0, 3),
+                }
+                for pane, s in self.panes.items()
+            },
+        }
@@ -0,0 +1,133 @@
+"""Spatial index over OCR token boxes.
+
+OCR engines report tokens in detection order, not reading order. The index
+groups tokens into lines by baseline, orders each line left to right, and
+answers region and label lookups without rescanning the whole pane.
+"""
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .models import Tokens
+
+# Baselines closer than this fraction of the median token height share a line.
+LINE_TOLERANCE = 0.5
+
+
+def _key(text: str) -> str:
+    return text.strip().rstrip(":").strip().lower()
+
+
+class TokenIndex:
+    """Reading-order lines plus region and label queries over ``Tokens``.
+
+    ``y_up`` marks boxes with a bottom-left origin (Apple Vision's normalized
+    coordinates); Tesseract's pixel boxes have a top-left origin. Query
+    rectangles use the same coordinates as the payload. Only the line grouping
+    is done up front; lookup tables are built by the first query that needs
+    them, since most frames are only ever read as lines.
+    """
+
+    __slots__ = ("tokens", "lines", "_boxes", "_line_of", "_pos", "_words", "_by_cy", "_cy_sorted")
+
+    def __init__(self, tokens: Tokens, y_up: bool = False):
+        self.tokens = tokens
+        # A copy, not a view: a buffer export would pin the array's size.
+        self._boxes = boxes = np.array(tokens.bboxes, dtype=np.float64).reshape(-1, 4)
+        x, y, h = boxes[:, 0], boxes[:, 1], boxes[:, 3]
+        # Baseline in top-down order, so sorting ascending reads top to bottom.
+        baseline = -y if y_up else y + h
+        order = np.argsort(baseline, kind="stable")
+        heights = np.sort(h[h > 0])
+        tolerance = LINE_TOLERANCE * float(heights[heights.size // 2]) if heights.size else 0.0
+        line_ids = np.empty(order.size, dtype=np.int64)
+        if order.size:
+            line_ids[order] = np.concatenate(([0], np.cumsum(np.diff(baseline[order]) > tolerance)))
+        reading = np.lexsort((x, line_ids)).tolist()
+        starts = [0] + (np.flatnonzero(np.diff(line_ids[reading])) + 1).tolist()
+        ends = starts[1:] + [len(reading)]
+        self.lines: List[List[int]] = [reading[a:b] for a, b in zip(starts, ends)] if reading else []
+        self._line_of: Optional[List[int]] = None
+        self._pos: Optional[List[int]] = None
+        self._words: Optional[Dict[str, List[int]]] = None
+        self._by_cy = None
+        self._cy_sorted = None
+
+    def text_lines(self) -> List[str]:
+        texts = self.tokens.texts
+        return [" ".join(texts[i] for i in line) for line in self.lines]
+
+    def _locate(self):
+        n = len(self.tokens)
+        self._line_of = [0] * n
+        self._pos = [0] * n
+        self._words = {}
+        texts = self.tokens.texts
+        for li, line in enumerate(self.lines):
+            for pos, i in enumerate(line):
+                self._line_of[i] = li
+                self._pos[i] = pos
+                self._words.setdefault(_key(texts[i]), []).append(i)
+
+    def within(self, x0: float, y0: float, x1: float, y1: float) -> List[int]:
+        """Indices of tokens whose centre lies in the rectangle, in reading order.
+
+        A binary search narrows to the rectangle's vertical band first, so the
+        cost is O(log n + tokens in the band).
+        """
+        boxes = self._boxes
+        if self._by_cy is None:
+            cy = boxes[:, 1] + boxes[:, 3] / 2.0
+            self._by_cy = np.argsort(cy, kind="stable")
+            self._cy_sorted = cy[self._by_cy]
+        if self._line_of is None:
+            self._locate()
+        lo = int(np.searchsorted(self._cy_sorted, min(y0, y1), side="left"))
+        hi = int(np.searchsorted(self._cy_sorted, max(y0, y1), side="right"))
+        band = self._by_cy[lo:hi]
+        cx = boxes[band, 0] + boxes[band, 2] / 2.0
+        hits = band[(cx >= min(x0, x1)) & (cx <= max(x0, x1))].tolist()
+        return sorted(hits, key=lambda i: (self._line_of[i], self._pos[i]))
+
+    def text_within(self, x0: float, y0: float, x1: float, y1: float) -> str:
+        texts = self.tokens.texts
+        return " ".join(texts[i] for i in self.within(x0, y0, x1, y1))
+
+    def find(self, label: str) -> List[Tuple[int, int]]:
+        """``(first, last)`` token indices of each on-line occurrence of ``label``.
+
+        A label matches one token with the same text, or consecutive tokens of
+        one line word by word. Case and a trailing colon are ignored.
+        """
+        if self._words is None:
+            self._locate()
+        key = _key(label)
+        out = [(i, i) for i in self._words.get(key, ())]
+        words = key.split()
+        if len(words) > 1:
+            for first in self._words.get(words[0], ()):
+                line = self.lines[self._line_of[first]]
+                pos = self._pos[first]
+                tail = line[pos + 1:pos + len(words)]
+                if len(tail) == len(words) - 1 and all(
+                    _key(self.tokens.texts[i]) == word for i, word in zip(tail, words[1:])
+                ):
+                    out.append((first, tail[-1]))
+        return out
+
+    def right_of(self, label: str) -> Optional[str]:
+        """Text of the token directly right of the first ``label`` match."""
+        for _, last in self.find(label):
+            line = self.lines[self._line_of[last]]
+            pos = self._pos[last]
+            if pos + 1 < len(line):
+                return self.tokens.texts[line[pos + 1]]
+        return None
+
+    def left_of(self, label: str) -> Optional[str]:
+        """Text of the token directly left of the first ``label`` match."""
+        for first, _ in self.find(label):
+            pos = self._pos[first]
+            if pos > 0:
+                return self.tokens.texts[self.lines[self._line_of[first]][pos - 1]]
+        return None
@@ -5,3 +5,7 @@ def sse_event(data: str, event: str = None) -> bytes:
     lines.append(f"data: {data}")
     return ("\n".join(lines) + "\n\n").encode("utf-8")
 
+
+def sse_frame(body: bytes) -> bytes:
+    """``data:`` frame around single-line JSON bytes, without a decode/encode round trip."""
+    return b"data: " + body + b"\n\n"
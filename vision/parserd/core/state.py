@@ -0,0 +1,172 @@
+import json
+import logging
+import sqlite3
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+class PaneState:
+    """Last facts emitted for a pane plus their confidence.
+
+    ``snapshot`` is a ``delta.Snapshot`` once the engine has touched it; states
+    loaded from disk hold plain facts until then.
+    """
+
+    __slots__ = ("snapshot", "confidence", "updated_at")
+
+    def __init__(self, snapshot: Any, confidence: Optional[float] = None, updated_at: Optional[float] = None):
+        self.snapshot = snapshot
+        self.confidence = confidence
+        self.updated_at = time.time() if updated_at is None else updated_at
+
+
+class MemoryStateStore:
+    """In-process LRU of pane states with optional TTL (``ttl_s <= 0`` disables it).
+
+    The TTL counts from a pane's last read or write, so a pane that is still
+    being diffed never expires just because its facts stopped changing.
+    """
+
+    def __init__(self, ttl_s: float = 0, max_panes: int = 256):
+        self.ttl_s = float(ttl_s)
+        self.max_panes = max(1, int(max_panes))
+        self._states: "OrderedDict[str, PaneState]" = OrderedDict()
+        self.counters = {"loads": 0, "writes": 0, "expired": 0, "evicted": 0}
+
+    def _expired(self, state: PaneState, now: float) -> bool:
+        return self.ttl_s > 0 and now - state.updated_at > self.ttl_s
+
+    def get(self, pane: str) -> Optional[PaneState]:
+        state = self._states.get(pane)
+        if state is None:
+            state = self._load(pane)
+            if state is None:
+                return None
+            self._remember(pane, state)
+        now = time.time()
+        if self._expired(state, now):
+            self.counters["expired"] += 1
+            self.delete(pane)
+            return None
+        if self.ttl_s > 0 and now - state.updated_at > self.ttl_s / 2:
+            # Refreshed at most twice per TTL, so steady reads cost no steady writes.
+            state.updated_at = now
+            self._touch(pane, state)
+        self._states.move_to_end(pane)
+        return state
+
+    def put(self, pane: str, state: PaneState):
+        self._remember(pane, state)
+        self.counters["writes"] += 1
+        self._store(pane, state)
+
+    def delete(self, pane: str):
+        self._states.pop(pane, None)
+
+    def _remember(self, pane: str, state: PaneState):
+        self._states[pane] = state
+        self._states.move_to_end(pane)
+        while len(self._states) > self.max_panes:
+            self._states.popitem(last=False)
+            self.counters["evicted"] += 1
+
+    def _load(self, pane: str) -> Optional[PaneState]:
+        return None
+
+    def _store(self, pane: str, state: PaneState):
+        pass
+
+    def _touch(self, pane: str, state: PaneState):
+        pass
+
+    def close(self):
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        out = dict(self.counters)
+        out["resident"] = len(self._states)
+        out["backend"] = "memory"
+        return out
+
+
+class SqliteStateStore(MemoryStateStore):
+    """Write-through sqlite backend; panes are loaded lazily on first access.
+
+    Only the memory tier is bounded by ``max_panes``; evicted panes are
+    reloaded from disk when they are next diffed.
+    """
+
+    def __init__(self, path: Path, ttl_s: float = 0, max_panes: int = 256):
+        super().__init__(ttl_s=ttl_s, max_panes=max_panes)
+        self.path = Path(path)
+        self._db: Optional[sqlite3.Connection] = None
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(self.path), isolation_level=None, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS pane_state ("
+                "pane TEXT PRIMARY KEY, facts TEXT NOT NULL, confidence REAL, updated_at REAL NOT NULL)"
+            )
+        return self._db
+
+    def _load(self, pane: str) -> Optional[PaneState]:
+        try:
+            row = self._conn().execute(
+                "SELECT facts, confidence, updated_at FROM pane_state WHERE pane = ?", (pane,)
+            ).fetchone()
+        except sqlite3.Error as exc:
+            logging.warning("state load failed for %s: %s", pane, exc)
+            return None
+        if row is None:
+            return None
+        self.counters["loads"] += 1
+        return PaneState(json.loads(row[0]), row[1], row[2])
+
+    def _store(self, pane: str, state: PaneState):
+        facts = getattr(state.snapshot, "plain", state.snapshot)
+        try:
+            self._conn().execute(
+                "INSERT OR REPLACE INTO pane_state (pane, facts, confidence, updated_at) VALUES (?, ?, ?, ?)",
+                (pane, json.dumps(facts, separators=(",", ":")), state.confidence, state.updated_at),
+            )
+        except sqlite3.Error as exc:
+            logging.warning("state write failed for %s: %s", pane, exc)
+
+    def _touch(self, pane: str, state: PaneState):
+        try:
+            self._conn().execute("UPDATE pane_state SET updated_at = ? WHERE pane = ?", (state.updated_at, pane))
+        except sqlite3.Error as exc:
+            logging.warning("state touch failed for %s: %s", pane, exc)
+
+    def delete(self, pane: str):
+        super().delete(pane)
+        try:
+            self._conn().execute("DELETE FROM pane_state WHERE pane = ?", (pane,))
+        except sqlite3.Error as exc:
+            logging.warning("state delete failed for %s: %s", pane, exc)
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def stats(self) -> Dict[str, Any]:
+        out = super().stats()
+        out["backend"] = "sqlite"
+        out["path"] = str(self.path)
+        return out
+
+
+def make_state_store(conf: Dict[str, Any], root: Path) -> MemoryStateStore:
+    ttl_s = float(conf.get("ttl_s", 0))
+    max_panes = int(conf.get("max_panes", 256))
+    if conf.get("backend", "memory") == "sqlite":
+        path = Path(conf.get("path", "vision/.state/parserd-state.sqlite")).expanduser()
+        return SqliteStateStore(path if path.is_absolute() else root / path, ttl_s=ttl_s, max_panes=max_panes)
+    return MemoryStateStore(ttl_s=ttl_s, max_panes=max_panes)
@@ -0,0 +1,71 @@
+from typing import Any, Dict, List
+
+# Lines compared around an overlap anchor; enough to reject repeated log lines
+# without making the check proportional to the buffer size.
+VERIFY_LINES = 16
+
+
+def overlap(previous: List[str], current: List[str]) -> int:
+    """Number of leading ``current`` lines already seen at the end of ``previous``.
+
+    A scrolling buffer shows ``previous[-k:] == current[:k]``. The search
+    anchors on the last previous line from the end of ``current`` backwards, so
+    a frame that appended ``n`` lines costs O(n + VERIFY_LINES) comparisons.
+    When that finds nothing it anchors on the line above instead, so a bottom
+    line rewritten in place (a progress line, OCR jitter) only makes that one
+    line new rather than the whole buffer.
+    """
+    if not previous or not current:
+        return 0
+    seen = _overlap(previous, len(previous), current)
+    if not seen and len(previous) > 1:
+        seen = _overlap(previous, len(previous) - 1, current)
+    return seen
+
+
+def _overlap(previous: List[str], stop: int, current: List[str]) -> int:
+    # Matches current[:end] against previous[:stop], anchored on previous[stop - 1].
+    anchor = previous[stop - 1]
+    for end in range(len(current), 0, -1):
+        if end > stop or current[end - 1] != anchor:
+            continue
+        width = min(end, VERIFY_LINES)
+        if previous[stop - width:stop] == current[end - width:end]:
+            return end
+    return 0
+
+
+class TailState:
+    """Rolling per-pane state for tail parsers.
+
+    ``advance`` returns only the lines appended since the last observation;
+    ``values`` is free for the parser to keep counters and last-seen fields in.
+    """
+
+    __slots__ = ("lines", "values", "new_lines", "resets")
+
+    def __init__(self):
+        self.lines: List[str] = []
+        self.values: Dict[str, Any] = {}
+        self.new_lines = 0
+        self.resets = 0
+
+    def advance(self, lines: List[str]) -> List[str]:
+        seen = overlap(self.lines, lines)
+        if self.lines and not seen:
+            # Cleared, or scrolled further than one screen: everything visible is new.
+            self.resets += 1
+        self.lines = lines
+        fresh = lines[seen:]
+        self.new_lines = len(fresh)
+        return fresh
+
+
+def parse_tail(parse, observation, limits: Dict[str, Any], state: TailState):
+    """``parse`` with ``state``, returning ``(facts, confidence, state)``.
+
+    Out-of-process parse workers mutate a copy of ``state``, so it travels
+    back with the result for the caller to keep.
+    """
+    facts, confidence = parse(observation, limits, state)
+    return facts, confidence, state
@@ -1,15 +1,177 @@
+import asyncio
 import json
-from jsonschema import Draft202012Validator
+import logging
+import random
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Union
+
+MODES = ("always", "sampled", "async", "off")
+ROOT_KEY = "<root>"
+
+
+def touched_keys(patch: List[Dict[str, Any]]) -> Optional[Set[str]]:
+    """Top-level fact keys touched by a JSON patch; ``None`` means the whole document."""
+    keys: Set[str] = set()
+    for op in patch:
+        for field in ("path", "from"):
+            path = op.get(field)
+            if path is None:
+                continue
+            if path == "":
+                return None
+            keys.add(path.split("/", 2)[1].replace("~1", "/").replace("~0", "~"))
+    return keys
 
 
 class Validator:
-    def __init__(self, facts_schema: dict, brief_schema: dict):
-        self.facts_validator = Draft202012Validator(facts_schema)
-        self.brief_validator = Draft202012Validator(brief_schema)
+    """Facts/brief validation compiled once into one validator per top-level key.
+
+    ``mode`` decides when checks run: ``always``, ``sampled`` (``sample_pct`` of
+    calls), ``async`` (queued to a background task started by ``start()``) or
+    ``off``. ``check_*`` never raise; failures are counted per key instead.
+
+    Schemas may be given as dicts or as paths. Reading them and importing
+    jsonschema (tens of milliseconds) wait for ``compile()``, which the first
+    check calls if nobody did so earlier. parserd calls it from a worker
+    thread right after startup.
+    """
+
+    def __init__(self, facts_schema: Union[dict, Path], brief_schema: Union[dict, Path], mode: str = "always",
+                 sample_pct: float = 100.0, queue_size: int = 256):
+        self._schemas = (facts_schema, brief_schema)
+        self._compiled = False
+        self._lock = threading.Lock()
+        self.facts_validator = None
+        self.brief_validator = None
+        self.key_validators: Dict[str, Any] = {}
+        self.allow_extra_keys = True
+        self.mode = mode if mode in MODES else "always"
+        self.sample_pct = max(0.0, min(100.0, float(sample_pct)))
+        self.counters = {"checked": 0, "failed": 0, "skipped": 0, "dropped": 0}
+        self.failures: Dict[str, int] = {}
+        self.last_error: Optional[str] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._queue_size = queue_size
+        self._worker: Optional[asyncio.Task] = None
+
+    def compile(self):
+        """Load the schemas and build the validators; idempotent and thread-safe."""
+        if self._compiled:
+            return
+        with self._lock:
+            if self._compiled:
+                return
+            from jsonschema import Draft202012Validator
+
+            facts_schema, brief_schema = (
+                schema if isinstance(schema, dict) else json.loads(Path(schema).read_text(encoding="utf-8"))
+                for schema in self._schemas
+            )
+            self.brief_validator = Draft202012Validator(brief_schema)
+            self.key_validators = {
+                key: Draft202012Validator(sub) for key, sub in facts_schema.get("properties", {}).items()
+            }
+            self.allow_extra_keys = facts_schema.get("additionalProperties", True) is not False
+            self.facts_validator = Draft202012Validator(facts_schema)
+            self._compiled = True
 
     def validate_facts(self, facts: dict):
+        self.compile()
         self.facts_validator.validate(facts)
 
     def validate_brief(self, brief: dict):
+        self.compile()
         self.brief_validator.validate(brief)
 
+    def facts_errors(self, facts: dict, keys: Optional[Iterable[str]] = None) -> Dict[str, str]:
+        """Validate only ``keys`` of ``facts`` (all present keys when ``None``)."""
+        if not isinstance(facts, dict):
+            return {ROOT_KEY: "facts must be an object"}
+        self.compile()
+        errors: Dict[str, str] = {}
+        for key in (facts.keys() if keys is None else keys):
+            if key not in facts:
+                continue  # removed by the patch; nothing left to validate
+            validator = self.key_validators.get(key)
+            if validator is None:
+                if not self.allow_extra_keys:
+                    errors[key] = f"unexpected top-level key {key!r}"
+                continue
+            error = next(validator.iter_errors(facts[key]), None)
+            if error is not None:
+                path = "/".join(str(p) for p in error.absolute_path)
+                errors[key] = f"{key}/{path}: {error.message}" if path else f"{key}: {error.message}"
+        return errors
+
+    def check_facts(self, facts: dict, patch: Optional[List[Dict[str, Any]]] = None) -> bool:
+        keys = touched_keys(patch) if patch is not None else None
+        return self._dispatch(self._check_facts, facts, keys)
+
+    def check_brief(self, brief: dict) -> bool:
+        return self._dispatch(self._check_brief, brief)
+
+    def _dispatch(self, check, *args) -> bool:
+        if self.mode == "off" or (self.mode == "sampled" and random.random() * 100.0 >= self.sample_pct):
+            self.counters["skipped"] += 1
+            return True
+        if self.mode == "async" and self._queue is not None:
+            try:
+                self._queue.put_nowait((check, args))
+            except asyncio.QueueFull:
+                self.counters["dropped"] += 1
+            return True
+        return check(*args)
+
+    def _check_facts(self, facts: dict, keys: Optional[Set[str]]) -> bool:
+        return self._record(self.facts_errors(facts, keys))
+
+    def _check_brief(self, brief: dict) -> bool:
+        self.compile()
+        error = next(self.brief_validator.iter_errors(brief), None)
+        return self._record({"brief": error.message} if error is not None else {})
+
+    def _record(self, errors: Dict[str, str]) -> bool:
+        self.counters["checked"] += 1
+        if not errors:
+            return True
+        self.counters["failed"] += 1
+        for key, message in errors.items():
+            self.failures[key] = self.failures.get(key, 0) + 1
+            self.last_error = message
+        logging.warning("validation failed: %s", "; ".join(errors.values()))
+        return False
+
+    async def start(self):
+        if self.mode == "async" and self._worker is None:
+            self._queue = asyncio.Queue(maxsize=self._queue_size)
+            self._worker = asyncio.create_task(self._drain())
+
+    async def close(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self._worker = None
+        self._queue = None
+
+    async def _drain(self):
+        while True:
+            check, args = await self._queue.get()
+            try:
+                check(*args)
+            except Exception:  # noqa: BLE001
+                logging.exception("validation worker error")
+            # Yield between checks so a burst never monopolizes the loop.
+            await asyncio.sleep(0)
+
+    def stats(self) -> Dict[str, Any]:
+        out = dict(self.counters)
+        out["mode"] = self.mode
+        out["compiled"] = self._compiled
+        out["pending"] = self._queue.qsize() if self._queue is not None else 0
+        out["failures_by_key"] = dict(self.failures)
+        out["last_error"] = self.last_error
+        return out
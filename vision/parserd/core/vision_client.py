@@ -1,26 +1,210 @@
+import asyncio
+import json
 import aiohttp
 import logging
-from typing import Any, Dict
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 from .models import PaneObservation
 
 
 class VisionClient:
-    def __init__(self, host: str = "127.0.0.1", port: int = 8765):
+    """Pooled keep-alive client for visiond.
+
+    One ``ClientSession`` is shared by every capture for the lifetime of the
+    app; ``start()``/``close()`` are wired to the aiohttp startup/cleanup hooks.
+
+    Captures can be conditional: passing the last perceptual hash the caller
+    processed as ``if_none_match`` lets visiond answer ``304 Not Modified``
+    without a body, which comes back as an observation with ``not_modified``.
+
+    ``stream()`` is the push alternative: one long-lived ``POST /stream``
+    carrying frames for many panes, reconnected with backoff whenever it
+    drops, with sequence gaps counted under ``stats()["stream"]``.
+
+    With a ``recorder`` (``core.recorder.CaptureRecorder``), every full
+    payload from either path is appended to the recording as received.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        limit: int = 16,
+        limit_per_host: int = 8,
+        keepalive_s: float = 30.0,
+        max_in_flight: int = 3,
+        timeout_s: float = 30.0,
+        recorder=None,
+    ):
         self.base = f"http://{host}:{port}"
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_s = keepalive_s
+        self.max_in_flight = max(1, int(max_in_flight))
+        self.timeout = aiohttp.ClientTimeout(total=timeout_s)
+        self.recorder = recorder
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._in_flight = 0
+        self.counters = {
+            "requests": 0,
+            "errors": 0,
+            "connections_created": 0,
+            "connections_reused": 0,
+        }
+        self.panes: Dict[str, Dict[str, int]] = {}
+        self._last_bytes: Dict[str, int] = {}
+        self.stream_connected = False
+        self.stream_counters = {"connects": 0, "reconnects": 0, "records": 0, "gaps": 0, "missed": 0,
+                                "heartbeats": 0, "bytes_received": 0}
+
+    async def start(self):
+        if self._session is not None and not self._session.closed:
+            return
+        trace = aiohttp.TraceConfig()
+        trace.on_connection_create_end.append(self._on_connection_create)
+        trace.on_connection_reuseconn.append(self._on_connection_reuse)
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_s,
+        )
+        self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout, trace_configs=[trace])
+        self._semaphore = asyncio.Semaphore(self.max_in_flight)
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+        self._session = None
+
+    async def _on_connection_create(self, session, ctx, params):
+        self.counters["connections_created"] += 1
 
-    async def capture_once(self, pane_id: str) -> PaneObservation:
+    async def _on_connection_reuse(self, session, ctx, params):
+        self.counters["connections_reused"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        out = dict(self.counters)
+        out["in_flight"] = self._in_flight
+        out["max_in_flight"] = self.max_in_flight
+        out["panes"] = {pane: dict(c) for pane, c in self.panes.items()}
+        out["stream"] = {"connected": self.stream_connected, **self.stream_counters}
+        return out
+
+    def _pane_counters(self, pane_id: str) -> Dict[str, int]:
+        counters = self.panes.get(pane_id)
+        if counters is None:
+            counters = self.panes[pane_id] = {"full": 0, "not_modified": 0, "bytes_received": 0, "bytes_saved": 0}
+        return counters
+
+    async def capture_once(self, pane_id: str, if_none_match: Optional[str] = None) -> PaneObservation:
+        if self._session is None or self._session.closed:
+            await self.start()
         url = f"{self.base}/capture_once"
         payload: Dict[str, Any] = {"pane_id": pane_id}
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=payload, timeout=aiohttp.ClientTimeout(total=30)) as resp:
+        headers = {"If-None-Match": f'"{if_none_match}"'} if if_none_match else None
+        async with self._semaphore:
+            self._in_flight += 1
+            self.counters["requests"] += 1
+            try:
+                async with self._session.post(url, json=payload, headers=headers) as resp:
+                    counters = self._pane_counters(pane_id)
+                    if resp.status == 304:
+                        counters["not_modified"] += 1
+                        counters["bytes_saved"] += self._last_bytes.get(pane_id, 0)
+                        return PaneObservation(pane_id=pane_id, not_modified=True)
                     if resp.status != 200:
                         logging.warning("capture_once failed: %s", resp.status)
+                        self.counters["errors"] += 1
                         return PaneObservation(pane_id=pane_id)
-                    data = await resp.json()
-                    return PaneObservation.from_payload(data)
-        except Exception as exc:  # noqa: BLE001
-            logging.exception("capture_once error: %s", exc)
+                    body = await resp.read()
+                    counters["full"] += 1
+                    counters["bytes_received"] += len(body)
+                    self._last_bytes[pane_id] = len(body)
+                    if self.recorder is not None:
+                        self.recorder.record(pane_id, body)
+                    observation = PaneObservation.from_payload(json.loads(body))
+                    etag = resp.headers.get("ETag", "").strip('"')
+                    if etag and not observation.perceptual_hash:
+                        observation.metadata.raw["perceptualHash"] = etag
+                    return observation
+            except Exception as exc:  # noqa: BLE001
+                self.counters["errors"] += 1
+                logging.exception("capture_once error: %s", exc)
+            finally:
+                self._in_flight -= 1
         return PaneObservation(pane_id=pane_id)
 
+    async def stream(
+        self,
+        panes: List[str],
+        mode: str = "jsonseq",
+        reconnect_s: float = 0.5,
+        max_reconnect_s: float = 10.0,
+        idle_timeout_s: float = 15.0,
+        max_record_bytes: int = 8 * 1024 * 1024,
+    ) -> AsyncIterator[Tuple[int, PaneObservation]]:
+        """Yield ``(seq, observation)`` from visiond's push stream, forever.
+
+        ``seq`` is the pane's frame version. The last one seen per pane is kept
+        across reconnects, so frames missed while disconnected count as a gap
+        on the first record after the reconnect.
+        """
+        if self._session is None or self._session.closed:
+            await self.start()
+        url = f"{self.base}/stream"
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=self.timeout.total, sock_read=idle_timeout_s)
+        delay = reconnect_s
+        last_seq: Dict[str, int] = {}
+        while True:
+            try:
+                async with self._session.post(url, json={"panes": panes, "mode": mode}, timeout=timeout,
+                                              read_bufsize=max_record_bytes) as resp:
+                    if resp.status != 200:
+                        raise aiohttp.ClientResponseError(resp.request_info, resp.history, status=resp.status)
+                    self.stream_connected = True
+                    self.stream_counters["connects"] += 1
+                    delay = reconnect_s
+                    async for line in resp.content:
+                        record = _stream_record(line, mode)
+                        if record is None:
+                            continue
+                        self.stream_counters["bytes_received"] += len(line)
+                        if record.get("heartbeat"):
+                            self.stream_counters["heartbeats"] += 1
+                            continue
+                        seq = int(record.get("seq", 0))
+                        frame = record.get("frame") or {}
+                        pane = frame.get("pane", "")
+                        last = last_seq.get(pane)
+                        # A lower seq means visiond restarted and numbering began again.
+                        if last is not None and seq > last + 1:
+                            self.stream_counters["gaps"] += 1
+                            self.stream_counters["missed"] += seq - last - 1
+                        last_seq[pane] = seq
+                        self.stream_counters["records"] += 1
+                        if self.recorder is not None:
+                            body = json.dumps(frame, separators=(",", ":")).encode("utf-8")
+                            self.recorder.record(pane, body)
+                        yield seq, PaneObservation.from_payload(frame)
+            except asyncio.CancelledError:
+                raise
+            except (aiohttp.ClientError, asyncio.TimeoutError, ConnectionError, ValueError) as exc:
+                logging.warning("visiond stream error: %s", exc or exc.__class__.__name__)
+            finally:
+                self.stream_connected = False
+            self.stream_counters["reconnects"] += 1
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, max_reconnect_s)
+
+
+def _stream_record(line: bytes, mode: str) -> Optional[Dict[str, Any]]:
+    """Decode one line of a JSON-seq or SSE stream; ``None`` for framing-only lines."""
+    if mode == "sse":
+        if not line.startswith(b"data:"):
+            return None
+        line = line[5:]
+    line = line.strip(b"\x1e \r\n")
+    if not line:
+        return None
+    return json.loads(line)
@@ -0,0 +1,205 @@
+import asyncio
+import logging
+import random
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+
+from .conflate import Update
+from .encode import as_encoded
+
+
+class WebhookSink:
+    """Batched, pooled webhook delivery that never blocks its producers.
+
+    ``offer`` only touches an in-memory map holding at most one pending brief
+    per pane; a newer brief for a pane that has not been sent yet is merged
+    into it (see ``Update.merge``), which is also what rate-limits each pane to
+    one brief per request. A single worker POSTs everything pending as one JSON
+    array at most once per ``min_interval_s``, reusing each brief's encoded
+    body, and retries transient failures with capped exponential backoff and
+    full jitter. A batch that still fails is put back in front of newer briefs
+    so the orchestrator never misses a change.
+
+    Critical briefs (``Update.critical``) bypass the interval: they wake the
+    worker at once and are sent on their own, ahead of anything else pending.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        min_interval_s: float = 3.0,
+        max_batch: int = 32,
+        queue_size: int = 256,
+        retries: int = 5,
+        backoff_s: float = 0.25,
+        backoff_max_s: float = 10.0,
+        timeout_s: float = 10.0,
+        keepalive_s: float = 30.0,
+    ):
+        self.url = url
+        self.min_interval_s = max(0.0, float(min_interval_s))
+        self.max_batch = max(1, int(max_batch))
+        self.queue_size = max(1, int(queue_size))
+        self.retries = max(0, int(retries))
+        self.backoff_s = backoff_s
+        self.backoff_max_s = backoff_max_s
+        self.keepalive_s = keepalive_s
+        self.timeout = aiohttp.ClientTimeout(total=timeout_s)
+        self._pending: "OrderedDict[str, Any]" = OrderedDict()
+        self._ready = asyncio.Event()
+        self._urgent = asyncio.Event()
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._last_sent = float("-inf")
+        self.counters = {
+            "offered": 0,
+            "conflated": 0,
+            "dropped": 0,
+            "batches": 0,
+            "briefs_sent": 0,
+            "retries": 0,
+            "failed_batches": 0,
+            "rejected_batches": 0,
+            "critical_batches": 0,
+        }
+        self.last_status: Optional[int] = None
+        self.last_error: Optional[str] = None
+
+    async def start(self):
+        if self._worker is not None:
+            return
+        connector = aiohttp.TCPConnector(limit=4, keepalive_timeout=self.keepalive_s)
+        self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+        self._worker = asyncio.create_task(self._run())
+
+    async def close(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def offer(self, item: Any):
+        self.counters["offered"] += 1
+        pane = _pane(item)
+        if pane in self._pending:
+            self.counters["conflated"] += 1
+            merged = _merge(self._pending[pane], item)
+            if merged is None:
+                del self._pending[pane]
+            else:
+                self._pending[pane] = merged
+        else:
+            self._pending[pane] = item
+            while len(self._pending) > self.queue_size:
+                victim = next((p for p, i in self._pending.items() if not _is_critical(i)), pane)
+                del self._pending[victim]
+                self.counters["dropped"] += 1
+        if pane in self._pending and _is_critical(self._pending[pane]):
+            self._pending.move_to_end(pane, last=False)
+            self._urgent.set()
+        if self._pending:
+            self._ready.set()
+
+    def _take(self, critical_only: bool = False) -> List[Any]:
+        panes = [pane for pane, item in self._pending.items() if not critical_only or _is_critical(item)]
+        batch = [self._pending.pop(pane) for pane in panes[:self.max_batch]]
+        if not any(_is_critical(item) for item in self._pending.values()):
+            self._urgent.clear()
+        if not self._pending:
+            self._ready.clear()
+        return batch
+
+    def _requeue(self, batch: List[Any]):
+        for item in reversed(batch):
+            pane = _pane(item)
+            newer = self._pending.pop(pane, None)
+            merged = _merge(item, newer) if newer is not None else item
+            if merged is not None:
+                self._pending[pane] = merged
+                self._pending.move_to_end(pane, last=False)
+        if any(_is_critical(item) for item in self._pending.values()):
+            self._urgent.set()
+        if self._pending:
+            self._ready.set()
+
+    async def _run(self):
+        while True:
+            await self._ready.wait()
+            wait = self._last_sent + self.min_interval_s - time.monotonic()
+            if wait > 0 and not self._urgent.is_set():
+                try:
+                    await asyncio.wait_for(self._urgent.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+            critical_only = time.monotonic() < self._last_sent + self.min_interval_s
+            batch = self._take(critical_only)
+            if not batch:
+                continue
+            if critical_only:
+                self.counters["critical_batches"] += 1
+            else:
+                self._last_sent = time.monotonic()
+            try:
+                await self._deliver(batch)
+            except asyncio.CancelledError:
+                raise
+            except Exception:  # noqa: BLE001
+                logging.exception("webhook worker error")
+
+    async def _deliver(self, batch: List[Any]):
+        body = b"[" + b",".join(as_encoded(item).body for item in batch) + b"]"
+        for attempt in range(self.retries + 1):
+            if attempt:
+                self.counters["retries"] += 1
+                cap = min(self.backoff_max_s, self.backoff_s * (2 ** (attempt - 1)))
+                await asyncio.sleep(random.uniform(0, cap))
+            try:
+                headers = {"Content-Type": "application/json"}
+                async with self._session.post(self.url, data=body, headers=headers) as resp:
+                    self.last_status = resp.status
+                    if resp.status < 300:
+                        self.counters["batches"] += 1
+                        self.counters["briefs_sent"] += len(batch)
+                        return
+                    if 400 <= resp.status < 500 and resp.status not in (408, 429):
+                        self.counters["rejected_batches"] += 1
+                        self.last_error = f"HTTP {resp.status}"
+                        logging.warning("webhook rejected batch of %d: %s", len(batch), resp.status)
+                        return
+                    self.last_error = f"HTTP {resp.status}"
+            except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                self.last_error = str(exc) or exc.__class__.__name__
+        self.counters["failed_batches"] += 1
+        logging.warning("webhook delivery failed after %d attempts: %s", self.retries + 1, self.last_error)
+        self._requeue(batch)
+
+    def stats(self) -> Dict[str, Any]:
+        out = dict(self.counters)
+        out["pending"] = len(self._pending)
+        out["last_status"] = self.last_status
+        out["last_error"] = self.last_error
+        return out
+
+
+def _pane(item: Any) -> str:
+    pane = getattr(item, "pane", None)
+    return pane if pane is not None else as_encoded(item).brief["pane"]
+
+
+def _is_critical(item: Any) -> bool:
+    return getattr(item, "critical", False)
+
+
+def _merge(older: Any, newer: Any) -> Optional[Any]:
+    if isinstance(older, Update) and isinstance(newer, Update):
+        return Update.merge(older, newer)
+    return newer
@@ -1,5 +1,6 @@
 import os
 import json
+import time
 import asyncio
 from datetime import datetime, timezone
 from pathlib import Path
@@ -7,25 +8,78 @@ from aiohttp import web
 
 from parserd.core.config import Config
 from parserd.core.vision_client import VisionClient
-from parserd.core.delta import DeltaEngine
-from parserd.core.emit import emit_webhook, stream_sse, stream_jsonseq
+from parserd.core.ingest import StreamIngest
+from parserd.core.delta import EMPTY, DeltaEngine, diff_snapshots
+from parserd.core.state import make_state_store
+from parserd.core.hub import CaptureHub
+from parserd.core.scheduler import CaptureScheduler
+from parserd.core.conflate import ConflatingQueue, Update
+from parserd.core.critical import CriticalFields
+from parserd.core.cache import ParseCache
+from parserd.core.recorder import make_recorder
+from parserd.core.executor import TIMED_OUT, ParseExecutor
+from parserd.core.multiread import multi_read
+from parserd.core.metrics import MetricsRegistry, process_stats
+from parserd.core.emit import stream_sse, stream_jsonseq
+from parserd.core.webhook import WebhookSink
+from parserd.core.encode import as_encoded
 from parserd.core.validate import Validator
 from parserd.core.models import PaneObservation
-from parserd.parsers import PARSERS
+from parserd.core.tail import TailState, parse_tail
+from parserd.parsers import PARSERS, TAIL_PARSERS
 
 
 ROOT = Path(__file__).resolve().parents[2]
 cfg = Config(ROOT)
 
-with open(cfg.schemas_dir / "facts.schema.json", "r", encoding="utf-8") as f:
-    FACTS_SCHEMA = json.load(f)
-with open(cfg.schemas_dir / "brief.schema.json", "r", encoding="utf-8") as f:
-    BRIEF_SCHEMA = json.load(f)
+_validation = cfg.parserd.get("validation", {})
+# Schemas are read and compiled by warm_up() after the server is listening.
+validator = Validator(
+    cfg.schemas_dir / "facts.schema.json",
+    cfg.schemas_dir / "brief.schema.json",
+    mode=_validation.get("mode", "always"),
+    sample_pct=float(_validation.get("sample_pct", 100)),
+)
+metrics = MetricsRegistry()
+delta_engine = DeltaEngine(make_state_store(cfg.parserd.get("state", {}), ROOT))
+critical_fields = CriticalFields(cfg.parserd.get("emit", {}).get("critical_fields", []))
+last_parse_key: dict = {}
+tail_states: dict = {}
+last_frame_hash: dict = {}
 
-validator = Validator(FACTS_SCHEMA, BRIEF_SCHEMA)
-delta_engine = DeltaEngine()
+_parse_cache = cfg.parserd.get("parse_cache", {})
+parse_cache = ParseCache(
+    max_entries=int(_parse_cache.get("max_entries", 512)),
+    ttl_s=float(_parse_cache.get("ttl_s", 300)),
+    use_perceptual_hash=bool(_parse_cache.get("use_perceptual_hash", True)),
+)
 
-vision_client = VisionClient(port=int(cfg.visiond.get("bind_port", 8765)))
+_executor = cfg.parserd.get("parse_executor", {})
+parse_executor = ParseExecutor(
+    mode=_executor.get("mode", "inline"),
+    workers=int(_executor.get("workers", 4)),
+    timeout_s=float(_executor.get("timeout_ms", 1000)) / 1000.0,
+    metrics=metrics,
+)
+
+recorder = make_recorder(cfg.parserd.get("recorder", {}), ROOT)
+
+_transport = cfg.parserd.get("transport", {})
+vision_client = VisionClient(
+    port=int(cfg.visiond.get("bind_port", 8765)),
+    limit=int(_transport.get("limit", 16)),
+    limit_per_host=int(_transport.get("limit_per_host", 8)),
+    keepalive_s=float(_transport.get("keepalive_s", 30)),
+    max_in_flight=int(cfg.visiond.get("stream", {}).get("max_frames_in_flight", 3)),
+    timeout_s=float(_transport.get("timeout_s", 30)),
+    recorder=recorder,
+)
+
+_ingest = cfg.parserd.get("ingest", {})
+ingest = (
+    StreamIngest(vision_client, list(cfg.targets), mode=_ingest.get("format", "jsonseq"))
+    if _ingest.get("mode") == "stream" else None
+)
 
 
 def log_stage(stage: str, pane: str, **fields):
@@ -38,37 +92,93 @@ def log_stage(stage: str, pane: str, **fields):
     print(json.dumps(entry), flush=True)
 
 
-async def capture_with_multi_read(pane_id: str) -> PaneObservation:
+async def capture_with_multi_read(pane_id: str, if_none_match: str = None) -> PaneObservation:
     target_cfg = cfg.targets.get(pane_id, {}) if isinstance(cfg.targets, dict) else {}
+    voting = cfg.parserd.get("voting", {})
     passes = int(target_cfg.get("multi_read_n", 1) or 1)
-    passes = max(1, min(passes, cfg.parserd.get("voting", {}).get("max_passes", 3)))
-    observations = []
-    for _ in range(passes):
-        obs = await vision_client.capture_once(pane_id)
-        observations.append(obs)
-        if obs.has_structured():
-            break
+    passes = max(1, min(passes, voting.get("max_passes", 3)))
+
+    def fetch(i: int):
+        # Only the first pass is conditional; re-reads always want a fresh payload.
+        return vision_client.capture_once(pane_id, if_none_match=if_none_match if i == 0 else None)
+
+    observations = await multi_read(
+        fetch,
+        passes,
+        mode=voting.get("read_mode", "sequential"),
+        hedge_delay_s=float(voting.get("hedge_delay_ms", 150)) / 1000.0,
+        max_concurrent=int(voting.get("max_concurrent_reads", passes)),
+    )
+    if not observations:
+        return PaneObservation(pane_id=pane_id)
+    if observations[0].not_modified:
+        return observations[0]
     return PaneObservation.choose_best(observations)
 
 
-async def analyze_once(request: web.Request):
-    data = await request.json()
-    pane_id = data.get("pane_id")
-    if pane_id not in cfg.targets:
-        return web.json_response({"error": "unknown pane_id"}, status=404)
+async def parse_observation(pane_id: str, observation: PaneObservation, key: str = None):
+    t0 = time.perf_counter()
+    limits = cfg.parserd.get("limits", {})
+    target_cfg = cfg.targets.get(pane_id, {}) if isinstance(cfg.targets, dict) else {}
+    timeout_ms = target_cfg.get("parse_timeout_ms")
+    timeout_s = float(timeout_ms) / 1000.0 if timeout_ms is not None else None
+    if pane_id in TAIL_PARSERS:
+        # Results depend on rolling per-pane state, so these bypass the parse cache.
+        state = tail_states.get(pane_id)
+        if state is None:
+            state = tail_states[pane_id] = TailState()
+        result = await parse_executor.run(
+            pane_id, parse_tail, TAIL_PARSERS[pane_id], observation, limits, state, timeout_s=timeout_s
+        )
+        metrics.observe(pane_id, "parse", time.perf_counter() - t0)
+        if result is TIMED_OUT:
+            return result
+        facts, confidence, state = result
+        tail_states[pane_id] = state
+        metrics.count(pane_id, "tail_lines", state.new_lines)
+        return facts, confidence
+    key = key or parse_cache.key_for(observation)
+    cached = parse_cache.get(key)
+    if cached is not None:
+        metrics.observe(pane_id, "parse", time.perf_counter() - t0)
+        return cached
+    result = await parse_executor.run(pane_id, PARSERS[pane_id], observation, limits, timeout_s=timeout_s)
+    metrics.observe(pane_id, "parse", time.perf_counter() - t0)
+    if result is TIMED_OUT:
+        return result
+    facts, confidence = result
+    parse_cache.put(key, facts, confidence)
+    return facts, confidence
 
-    observation = await capture_with_multi_read(pane_id)
-    parser = PARSERS.get(pane_id)
-    if not parser:
-        return web.json_response({"error": "no parser"}, status=404)
 
-    facts, confidence = parser(observation, cfg.parserd.get("limits", {}))
+async def capture_observed(pane_id: str, if_none_match: str = None) -> PaneObservation:
+    t0 = time.perf_counter()
+    observation = ingest.capture(pane_id, if_none_match) if ingest is not None else None
+    if observation is None:
+        observation = await capture_with_multi_read(pane_id, if_none_match=if_none_match)
+    metrics.observe(pane_id, "capture", time.perf_counter() - t0)
+    if observation.not_modified:
+        metrics.count(pane_id, "not_modified")
+    else:
+        metrics.count(pane_id, f"engine_{observation.engine}")
+    return observation
+
+
+async def analyze_pane(pane_id: str) -> dict:
+    if pane_id not in cfg.targets:
+        return {"error": "unknown pane_id"}
+    observation = await capture_observed(pane_id)
+    if pane_id not in PARSERS:
+        return {"error": "no parser"}
+
+    result = await parse_observation(pane_id, observation)
+    if result is TIMED_OUT:
+        log_stage("parse", pane_id, timed_out=True)
+        return {"error": "parse timed out", "timed_out": True}
+    facts, confidence = result
     log_stage("parse", pane_id, confidence=confidence)
-    try:
-        validator.validate_facts(facts)
-    except Exception:
-        pass
-    return web.json_response({
+    validator.check_facts(facts)
+    return {
         "facts": facts,
         "confidence": confidence,
         "observation": {
@@ -76,71 +186,310 @@ async def analyze_once(request: web.Request):
             "ocr": observation.ocr_text,
             "metadata": observation.metadata.raw,
         }
-    })
+    }
 
 
-async def watch(request: web.Request):
+async def analyze_once(request: web.Request):
     data = await request.json()
-    pane_id = data.get("pane_id")
-    fps = int(data.get("fps", cfg.parserd.get("watch_defaults_fps", 2)))
-    mode = cfg.parserd.get("emit", {}).get("mode", "sse")
-    q: asyncio.Queue[str] = asyncio.Queue(maxsize=100)
+    result = await analyze_pane(data.get("pane_id"))
+    if "error" in result:
+        return web.json_response(result, status=504 if result.get("timed_out") else 404)
+    return web.json_response(result)
 
-    async def producer():
-        try:
-            while True:
-                observation = await capture_with_multi_read(pane_id)
-                parser = PARSERS.get(pane_id)
-                if not parser:
-                    await asyncio.sleep(1.0 / max(1, fps))
-                    continue
-                facts, confidence = parser(observation, cfg.parserd.get("limits", {}))
-                brief = make_brief(pane_id, facts, confidence)
-                if brief["delta"] and confidence >= cfg.parserd.get("emit", {}).get("min_confidence", 0.97):
-                    await q.put(json.dumps(brief, separators=(",", ":")))
-                    log_stage("emit", pane_id, confidence=confidence, ops=len(brief["delta"]))
-                await asyncio.sleep(1.0 / max(1, fps))
-        except asyncio.CancelledError:
-            pass
-
-    task = asyncio.create_task(producer())
-    request.app["tasks"].add(task)
-    if mode == "jsonseq":
-        resp = await stream_jsonseq(request, q)
+
+async def analyze_batch(request: web.Request):
+    data = await request.json()
+    pane_ids = data.get("pane_ids") or list(cfg.targets)
+    if not isinstance(pane_ids, list):
+        return web.json_response({"error": "pane_ids must be a list"}, status=400)
+    max_workers = int(cfg.parserd.get("analyze_batch", {}).get("max_workers", 4))
+    try:
+        concurrency = int(data.get("concurrency", max_workers))
+    except (TypeError, ValueError):
+        return web.json_response({"error": "concurrency must be an integer"}, status=400)
+    workers = max(1, min(concurrency, max_workers, len(pane_ids) or 1))
+    semaphore = asyncio.Semaphore(workers)
+
+    async def run(pane_id):
+        async with semaphore:
+            try:
+                result = await analyze_pane(pane_id)
+            except Exception as exc:  # noqa: BLE001
+                result = {"error": str(exc)}
+        return {"pane": pane_id, **result}
+
+    response = web.StreamResponse(status=200, reason='OK', headers={
+        'Content-Type': 'application/json-seq',
+    })
+    await response.prepare(request)
+    tasks = [asyncio.create_task(run(pane_id)) for pane_id in pane_ids]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            await response.write(as_encoded(await next_done).jsonseq)
+        await response.write_eof()
+    finally:
+        for task in tasks:
+            task.cancel()
+    return response
+
+
+async def watch_tick(pane_id: str):
+    etag = last_frame_hash.get(pane_id) if _transport.get("conditional", True) else None
+    observation = await capture_observed(pane_id, if_none_match=etag)
+    if observation.not_modified or pane_id not in PARSERS:
+        return None
+    last_frame_hash[pane_id] = observation.perceptual_hash
+    key = parse_cache.key_for(observation)
+    if last_parse_key.get(pane_id) == key:
+        # Same content as the previous tick: facts and delta cannot have changed.
+        return None
+    last_parse_key[pane_id] = key
+    result = await parse_observation(pane_id, observation, key)
+    if result is TIMED_OUT:
+        # Retry this content on the next tick; the last emitted facts stand meanwhile.
+        # Forgetting the frame hash too keeps the retry from coming back 304 Not Modified.
+        last_parse_key.pop(pane_id, None)
+        last_frame_hash.pop(pane_id, None)
+        return None
+    facts, confidence = result
+    # Panes carrying merge-gating fields win capture slots when the budget is saturated.
+    scheduler.set_priority(pane_id, 1 if critical_fields.present(facts) else 0)
+    before = delta_engine.snapshot(pane_id)
+    brief = make_brief(pane_id, facts, confidence, commit=False)
+    if brief["delta"] and confidence >= cfg.parserd.get("emit", {}).get("min_confidence", 0.97):
+        # Only emitted facts become the diff base, so subscribers never miss a change.
+        delta_engine.commit(pane_id, float(confidence))
+        critical = critical_fields.touches(brief["delta"])
+        metrics.count(pane_id, "emits")
+        if critical:
+            metrics.count(pane_id, "critical_emits")
+        log_stage("emit", pane_id, confidence=confidence, ops=len(brief["delta"]), critical=critical)
+        return Update(brief, before, delta_engine.snapshot(pane_id), critical=critical)
+    return None
+
+
+def watch_prime(pane_id: str):
+    after = delta_engine.snapshot(pane_id)
+    if not after.plain:
+        return None
+    brief = {
+        "ts": datetime.now(timezone.utc).isoformat(),
+        "pane": pane_id,
+        "delta": diff_snapshots(EMPTY, after),
+        "confidence": delta_engine.last_confidence(pane_id),
+    }
+    return Update(brief, EMPTY, after)
+
+
+_scheduler = cfg.parserd.get("scheduler", {})
+scheduler = CaptureScheduler(
+    max_in_flight=int(cfg.visiond.get("stream", {}).get("max_frames_in_flight", 3)),
+    idle_ticks=int(_scheduler.get("idle_ticks", 10)),
+    backoff=float(_scheduler.get("backoff", 2.0)),
+    max_interval_s=float(_scheduler.get("max_interval_s", 5.0)),
+)
+hub = CaptureHub(
+    watch_tick,
+    prime=watch_prime,
+    conflate_threshold=int(cfg.parserd.get("watch_defaults", {}).get("conflate_threshold", 8)),
+    metrics=metrics,
+    scheduler=scheduler,
+    critical=critical_fields,
+)
+
+
+def watch_specs(data: dict, default_fps: float):
+    """Normalize ``/watch`` ``panes``: a list of ids or ``{"pane_id", "fps", "paths"}`` objects,
+    or an object keyed by pane id. A request without ``panes`` names one pane with top-level
+    ``pane_id`` and ``paths``. Returns ``(specs, error)``."""
+    if "panes" in data:
+        panes = data["panes"]
+    else:
+        panes = [{"pane_id": data.get("pane_id"), "paths": data.get("paths")}]
+    if isinstance(panes, dict):
+        items = [dict(spec or {}, pane_id=pane) for pane, spec in panes.items()]
+    elif isinstance(panes, list):
+        items = [{"pane_id": spec} if isinstance(spec, str) else spec for spec in panes]
     else:
-        resp = await stream_sse(request, q)
-    task.cancel()
-    request.app["tasks"].discard(task)
+        return None, "panes must be a list or an object"
+    specs = {}
+    for item in items:
+        if not isinstance(item, dict) or not isinstance(item.get("pane_id"), str):
+            return None, "each pane needs a pane_id"
+        paths = item.get("paths")
+        if paths is not None and (not isinstance(paths, list) or not all(isinstance(p, str) for p in paths)):
+            return None, f"{item['pane_id']}: paths must be a list of JSON pointers"
+        try:
+            fps = float(item.get("fps", default_fps))
+        except (TypeError, ValueError):
+            return None, f"{item['pane_id']}: fps must be a number"
+        specs[item["pane_id"]] = {"fps": fps, "paths": paths or None}
+    if not specs:
+        return None, "panes is empty"
+    return specs, None
+
+
+async def watch(request: web.Request):
+    data = await request.json()
+    watch_defaults = cfg.parserd.get("watch_defaults", {})
+    try:
+        fps = float(data.get("fps", watch_defaults.get("fps", 2)))
+    except (TypeError, ValueError):
+        return web.json_response({"error": "fps must be a number"}, status=400)
+    specs, error = watch_specs(data, fps)
+    if error:
+        return web.json_response({"error": error}, status=400)
+    unknown = [pane for pane in specs if pane not in cfg.targets]
+    if unknown:
+        return web.json_response({"error": "unknown pane_id", "panes": unknown}, status=404)
+    # emit.mode may be "webhook"; streams pick their framing separately.
+    mode = data.get("mode") or watch_defaults.get("mode") or cfg.parserd.get("emit", {}).get("mode", "sse")
+    # One queue for every pane of the request, so their briefs interleave on this connection;
+    # the conflation threshold scales with the pane count to stay per-pane.
+    threshold = int(watch_defaults.get("conflate_threshold", 8)) * len(specs)
+    queue = ConflatingQueue(threshold)
+    subs = []
+    try:
+        for pane_id, spec in specs.items():
+            # Clients that kept their state across a reconnect skip the full snapshot.
+            subs.append(hub.subscribe(pane_id, spec["fps"], prime=not data.get("resume", False),
+                                      paths=spec["paths"], queue=queue))
+        if mode == "jsonseq":
+            resp = await stream_jsonseq(request, queue)
+        else:
+            resp = await stream_sse(request, queue)
+    finally:
+        for sub in subs:
+            await hub.unsubscribe(sub)
     return resp
 
 
-def make_brief(pane: str, facts: dict, confidence: float) -> dict:
-    patch = delta_engine.patch(pane, facts)
+def make_brief(pane: str, facts: dict, confidence: float, commit: bool = True) -> dict:
+    t0 = time.perf_counter()
+    patch = delta_engine.patch(pane, facts, commit=commit)
+    t1 = time.perf_counter()
+    metrics.observe(pane, "diff", t1 - t0)
     brief = {
         "ts": datetime.now(timezone.utc).isoformat(),
         "pane": pane,
         "delta": patch,
         "confidence": float(confidence),
     }
-    try:
-        validator.validate_brief(brief)
-    except Exception:
-        pass
+    if patch:
+        validator.check_facts(facts, patch)
+        validator.check_brief(brief)
+        metrics.observe(pane, "validate", time.perf_counter() - t1)
     return brief
 
 
 async def healthz(_: web.Request):
-    return web.json_response({"status": "ok"})
+    return web.json_response({"status": "ok", **metrics.snapshot()})
+
+
+async def prometheus_metrics(_: web.Request):
+    return web.Response(body=metrics.prometheus().encode("utf-8"), headers={
+        "Content-Type": "text/plain; version=0.0.4; charset=utf-8",
+    })
+
+
+def make_webhook_sink(emit: dict):
+    if emit.get("mode") != "webhook" or not emit.get("webhook_url"):
+        return None
+    conf = emit.get("webhook", {})
+    return WebhookSink(
+        emit["webhook_url"],
+        min_interval_s=float(emit.get("min_interval_ms", 3000)) / 1000.0,
+        max_batch=int(conf.get("max_batch", 32)),
+        queue_size=int(conf.get("queue_size", 256)),
+        retries=int(conf.get("retries", 5)),
+        backoff_s=float(conf.get("backoff_ms", 250)) / 1000.0,
+        backoff_max_s=float(conf.get("backoff_max_ms", 10000)) / 1000.0,
+        timeout_s=float(conf.get("timeout_s", 10)),
+    )
+
+
+webhook_sink = make_webhook_sink(cfg.parserd.get("emit", {}))
+
+
+async def pump_webhook(sub):
+    # The hub subscription absorbs backpressure; offer() itself never waits.
+    while True:
+        webhook_sink.offer(await sub.queue.get())
+
+
+metrics.add_source("process", process_stats)
+metrics.add_source("transport", vision_client.stats)
+metrics.add_source("watch", hub.stats)
+metrics.add_source("scheduler", scheduler.stats)
+if ingest is not None:
+    metrics.add_source("ingest", ingest.stats)
+metrics.add_source("parse_cache", parse_cache.stats)
+metrics.add_source("parse_executor", parse_executor.stats)
+metrics.add_source("state", delta_engine.store.stats)
+metrics.add_source("validation", validator.stats)
+if webhook_sink is not None:
+    metrics.add_source("webhook", webhook_sink.stats)
+if recorder is not None:
+    metrics.add_source("recorder", recorder.stats)
+
+
+def warm_up():
+    """Compile the schemas and import the configured panes' parsers.
+
+    Runs on a worker thread once the server is up, so none of it delays
+    binding the port. A request that needs either first just does the work
+    itself, or waits on the import lock.
+    """
+    validator.compile()
+    for pane_id in cfg.targets:
+        PARSERS.get(pane_id)
+        TAIL_PARSERS.get(pane_id)
+
+
+async def on_startup(app: web.Application):
+    app["warm_up"] = asyncio.get_running_loop().run_in_executor(None, warm_up)
+    await vision_client.start()
+    await validator.start()
+    if ingest is not None:
+        await ingest.start()
+    if webhook_sink is not None:
+        await webhook_sink.start()
+        fps = float(cfg.parserd.get("watch_defaults", {}).get("fps", 2))
+        for pane_id in cfg.targets:
+            # No priming snapshot: the orchestrator already holds the persisted facts, so a
+            # warm restart posts nothing until a fact actually changes.
+            sub = hub.subscribe(pane_id, fps, prime=False)
+            app["tasks"].add(asyncio.create_task(pump_webhook(sub)))
+
+
+async def on_cleanup(app: web.Application):
+    await hub.close()
+    await validator.close()
+    for task in list(app["tasks"]):
+        task.cancel()
+    if webhook_sink is not None:
+        await webhook_sink.close()
+    if ingest is not None:
+        await ingest.close()
+    await vision_client.close()
+    if recorder is not None:
+        recorder.close()
+    parse_executor.close()
+    delta_engine.store.close()
 
 
 def build_app() -> web.Application:
     app = web.Application()
     app.add_routes([
         web.get("/healthz", healthz),
+        web.get("/metrics", prometheus_metrics),
         web.post("/analyze_once", analyze_once),
+        web.post("/analyze_batch", analyze_batch),
         web.post("/watch", watch),
     ])
     app["tasks"] = set()
+    app.on_startup.append(on_startup)
+    app.on_cleanup.append(on_cleanup)
     return app
 
 
@@ -1,31 +1,104 @@
-from .ci_summary import parse as parse_ci_summary
-from .ci_logs_detail import parse as parse_ci_logs_detail
-from .checks_list import parse as parse_checks_list
-from .pr_banner import parse as parse_pr_banner
-from .pr_diff_summary import parse as parse_pr_diff_summary
-from .pr_thread_summary import parse as parse_pr_thread_summary
-from .ide_problems import parse as parse_ide_problems
-from .ide_terminal import parse as parse_ide_terminal
-from .build_artifacts_console import parse as parse_build_artifacts_console
-from .hil_chart import parse as parse_hil_chart
-from .hil_logs import parse as parse_hil_logs
-from .serial_monitor import parse as parse_serial_monitor
-from .logic_analyzer import parse as parse_logic_analyzer
-from .led_camera_monitor import parse as parse_led_camera_monitor
-
-PARSERS = {
-    "CI_SUMMARY": parse_ci_summary,
-    "CI_LOGS_DETAIL": parse_ci_logs_detail,
-    "CHECKS_LIST": parse_checks_list,
-    "PR_BANNER": parse_pr_banner,
-    "PR_DIFF_SUMMARY": parse_pr_diff_summary,
-    "PR_THREAD_SUMMARY": parse_pr_thread_summary,
-    "IDE_PROBLEMS": parse_ide_problems,
-    "IDE_TERMINAL": parse_ide_terminal,
-    "BUILD_ARTIFACTS_CONSOLE": parse_build_artifacts_console,
-    "HIL_CHART": parse_hil_chart,
-    "HIL_LOGS": parse_hil_logs,
-    "SERIAL_MONITOR": parse_serial_monitor,
-    "LOGIC_ANALYZER": parse_logic_analyzer,
-    "LED_CAMERA_MONITOR": parse_led_camera_monitor,
-}
+"""Pane parser registry.
+
+``PARSERS[pane]`` is ``parse(observation, limits) -> (facts, confidence)``.
+``TAIL_PARSERS[pane]`` is the incremental ``parse_incremental(observation,
+limits, state)`` of log-style panes, which scans only the appended lines.
+
+Parser modules are imported on first lookup, so a deployment pays only for
+the panes it watches. Pane ``CI_SUMMARY`` is the module
+``parserd.parsers.ci_summary``: adding a built-in pane means adding its
+module, and helper modules in this package start with an underscore.
+Other installed packages can add panes through the ``parserd.parsers`` entry
+point group (name = pane id, value = ``module:parse``) and tail parsers
+through ``parserd.tail_parsers``. A built-in module wins over an entry point
+with the same name.
+"""
+import importlib
+from collections.abc import Mapping
+from typing import Callable, Dict, Iterator, Optional, Set
+
+ENTRY_POINT_GROUP = "parserd.parsers"
+TAIL_ENTRY_POINT_GROUP = "parserd.tail_parsers"
+
+_builtin: Optional[Set[str]] = None
+
+
+def builtin_panes() -> Set[str]:
+    """Pane ids with a module in this package; lists modules without importing them."""
+    global _builtin
+    if _builtin is None:
+        import pkgutil
+
+        _builtin = {m.name.upper() for m in pkgutil.iter_modules(__path__) if not m.name.startswith("_")}
+    return _builtin
+
+
+class ParserRegistry(Mapping):
+    """Read-only mapping of pane id to parser function, resolved lazily.
+
+    A lookup imports the pane's module (or loads its entry point) once and
+    memoizes the result, misses included. When every built-in module must
+    define ``attr`` (``parse``), the keys come from module names and entry
+    point metadata alone. For optional attributes (``parse_incremental``),
+    iterating imports the built-in modules to find out which define it.
+    """
+
+    def __init__(self, attr: str, group: str, required: bool = True):
+        self._attr = attr
+        self._group = group
+        self._required = required
+        self._loaded: Dict[str, Callable] = {}
+        self._missing: Set[str] = set()
+        self._entry_points: Optional[dict] = None
+
+    def _plugins(self) -> dict:
+        if self._entry_points is None:
+            from importlib.metadata import entry_points
+
+            self._entry_points = {ep.name: ep for ep in entry_points(group=self._group)}
+        return self._entry_points
+
+    def _resolve(self, pane: str) -> Optional[Callable]:
+        if pane in builtin_panes():
+            return getattr(importlib.import_module(f"{__name__}.{pane.lower()}"), self._attr, None)
+        entry_point = self._plugins().get(pane)
+        return entry_point.load() if entry_point is not None else None
+
+    def register(self, pane: str, parse: Callable):
+        """Add or replace a parser in-process, e.g. from an embedding application."""
+        self._loaded[pane] = parse
+        self._missing.discard(pane)
+
+    def __getitem__(self, pane: str) -> Callable:
+        parse = self._loaded.get(pane)
+        if parse is not None:
+            return parse
+        if not isinstance(pane, str) or pane in self._missing:
+            raise KeyError(pane)
+        parse = self._resolve(pane)
+        if parse is None:
+            self._missing.add(pane)
+            raise KeyError(pane)
+        self._loaded[pane] = parse
+        return parse
+
+    def __contains__(self, pane) -> bool:
+        try:
+            self[pane]
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[str]:
+        builtin = builtin_panes() if self._required else {pane for pane in builtin_panes() if pane in self}
+        return iter(sorted(builtin | set(self._plugins()) | set(self._loaded)))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def loaded(self) -> Set[str]:
+        return set(self._loaded)
+
+
+PARSERS = ParserRegistry("parse", ENTRY_POINT_GROUP)
+TAIL_PARSERS = ParserRegistry("parse_incremental", TAIL_ENTRY_POINT_GROUP, required=False)
@@ -1,27 +1,26 @@
 from typing import Tuple, Dict, Any
 
 from ..core.models import PaneObservation
+from ..core.tail import TailState
 
 
 def parse(observation: PaneObservation, limits: Dict[str, Any]) -> Tuple[Dict[str, Any], float]:
-    lines = observation.merged_lines()
-    job = None
-    step = None
-    last_error_signature = None
-    duration_s = None
-    retry_count = None
+    return parse_incremental(observation, limits, TailState())
 
-    # Simple heuristics
-    for ln in lines[-10:]:
+
+def parse_incremental(observation: PaneObservation, limits: Dict[str, Any],
+                      state: TailState) -> Tuple[Dict[str, Any], float]:
+    values = state.values
+    # Only lines appended since the last frame are scanned; errors that have
+    # scrolled out of view stay in the rolling state.
+    for ln in state.advance(observation.merged_lines()):
         if "error" in ln.lower():
-            last_error_signature = ln.strip()[:160]
-            break
+            values["last_error_signature"] = ln.strip()[:160]
+            values["error_count"] = values.get("error_count", 0) + 1
 
     facts = {"ci_logs": {}}
-    if job: facts["ci_logs"]["job"] = job
-    if step: facts["ci_logs"]["step"] = step
-    if last_error_signature: facts["ci_logs"]["last_error_signature"] = last_error_signature
-    if duration_s is not None: facts["ci_logs"]["duration_s"] = duration_s
-    if retry_count is not None: facts["ci_logs"]["retry_count"] = retry_count
-    conf = 0.95 if last_error_signature else 0.0
+    for key in ("job", "step", "last_error_signature", "duration_s", "retry_count", "error_count"):
+        if values.get(key) is not None:
+            facts["ci_logs"][key] = values[key]
+    conf = 0.95 if values.get("last_error_signature") else 0.0
     return facts, conf
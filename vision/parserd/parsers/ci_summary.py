@@ -4,7 +4,7 @@ from ..core.models import PaneObservation
 
 
 def parse(observation: PaneObservation, limits: Dict[str, Any]) -> Tuple[Dict[str, Any], float]:
-    text = " ".join(observation.merged_lines()).lower()
+    text = observation.lower_text
     status = None
     if any(s in text.lower() for s in ["all checks have passed", "checks passed", "success"]):
         status = "passing"
@@ -5,11 +5,21 @@ from ..core.models import PaneObservation
 
 
 def parse(observation: PaneObservation, limits: Dict[str, Any]) -> Tuple[Dict[str, Any], float]:
-    text = " ".join(observation.merged_lines())
-    fps_avg = _find_float(text, r"fps\s*avg\s*:?\s*(\d+(?:\.\d+)?)")
-    fps_p95 = _find_float(text, r"p95\s*:?\s*(\d+(?:\.\d+)?)")
-    drops_pct = _find_float(text, r"drops?\s*:?\s*(\d+(?:\.\d+)?)%")
-    sync_offset_ms = _find_float(text, r"sync\s*offset\s*:?\s*(\-?\d+(?:\.\d+)?)\s*ms")
+    text = observation.text
+    # Pixel-mode charts: read the value boxed next to each label before regexing the whole pane.
+    index = observation.token_index if observation.engine == "ocr" else None
+    fps_avg = _label_float(index, "fps avg")
+    if fps_avg is None:
+        fps_avg = _find_float(text, r"fps\s*avg\s*:?\s*(\d+(?:\.\d+)?)")
+    fps_p95 = _label_float(index, "p95")
+    if fps_p95 is None:
+        fps_p95 = _find_float(text, r"p95\s*:?\s*(\d+(?:\.\d+)?)")
+    drops_pct = _label_float(index, "drops")
+    if drops_pct is None:
+        drops_pct = _find_float(text, r"drops?\s*:?\s*(\d+(?:\.\d+)?)%")
+    sync_offset_ms = _label_float(index, "sync offset")
+    if sync_offset_ms is None:
+        sync_offset_ms = _find_float(text, r"sync\s*offset\s*:?\s*(\-?\d+(?:\.\d+)?)\s*ms")
     facts = {"hil": {}}
     if fps_avg is not None: facts["hil"]["fps_avg"] = fps_avg
     if fps_p95 is not None: facts["hil"]["fps_p95"] = fps_p95
@@ -20,6 +30,11 @@ def parse(observation: PaneObservation, limits: Dict[str, Any]) -> Tuple[Dict[st
     return facts, conf
 
 
+def _label_float(index, label: str):
+    value = index.right_of(label) if index is not None else None
+    return _find_float(value, r"^(\-?\d+(?:\.\d+)?)") if value else None
+
+
 def _find_float(text: str, pattern: str):
     m = re.search(pattern, text, flags=re.I)
     if not m:
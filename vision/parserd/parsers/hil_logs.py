@@ -1,20 +1,31 @@
 from typing import Tuple, Dict, Any
+import re
 
 from ..core.models import PaneObservation
+from ..core.tail import TailState
+
+UPTIME_RE = re.compile(r"\buptime\b\D{0,3}(\d+(?:\.\d+)?)\s*(ms|s|sec|seconds)?\b", re.I)
 
 
 def parse(observation: PaneObservation, limits: Dict[str, Any]) -> Tuple[Dict[str, Any], float]:
-    lines = observation.merged_lines()
-    last_event = lines[-1].strip()[:120] if lines else None
-    last_error_signature = None
-    for ln in reversed(lines):
+    return parse_incremental(observation, limits, TailState())
+
+
+def parse_incremental(observation: PaneObservation, limits: Dict[str, Any],
+                      state: TailState) -> Tuple[Dict[str, Any], float]:
+    values = state.values
+    for ln in state.advance(observation.merged_lines()):
+        values["last_event"] = ln.strip()[:120]
         if "error" in ln.lower():
-            last_error_signature = ln.strip()[:160]
-            break
-    uptime_s = None
+            values["last_error_signature"] = ln.strip()[:160]
+            values["error_count"] = values.get("error_count", 0) + 1
+        m = UPTIME_RE.search(ln)
+        if m:
+            uptime = float(m.group(1))
+            values["uptime_s"] = uptime / 1000.0 if (m.group(2) or "").lower() == "ms" else uptime
     facts = {"hil_logs": {}}
-    if last_event: facts["hil_logs"]["last_event"] = last_event
-    if last_error_signature: facts["hil_logs"]["last_error_signature"] = last_error_signature
-    if uptime_s is not None: facts["hil_logs"]["uptime_s"] = uptime_s
-    conf = 0.8 if last_event else 0.0
+    for key in ("last_event", "last_error_signature", "uptime_s", "error_count"):
+        if values.get(key) is not None:
+            facts["hil_logs"][key] = values[key]
+    conf = 0.8 if values.get("last_event") else 0.0
     return facts, conf
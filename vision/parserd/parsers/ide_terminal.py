@@ -2,17 +2,36 @@ from typing import Tuple, Dict, Any
 import re
 
 from ..core.models import PaneObservation
+from ..core.tail import TailState
+
+PATTERNS = {
+    "warnings": re.compile(r"(\d+)\s+warnings?", re.I),
+    "errors": re.compile(r"(\d+)\s+errors?", re.I),
+    "build_time_s": re.compile(r"(\d+(?:\.\d+)?)\s*s(?:ec(?:onds)?)?\b", re.I),
+}
+TARGET_RE = re.compile(r"\bTarget\s+([\w.-]+)", re.I)
 
 
 def parse(observation: PaneObservation, limits: Dict[str, Any]) -> Tuple[Dict[str, Any], float]:
-    text = " ".join(observation.merged_lines())
-    warnings = _find_int(text, r"(\d+)\s+warnings?")
-    errors = _find_int(text, r"(\d+)\s+errors?")
-    last_target = None
-    m = re.search(r"\bTarget\s+([\w.-]+)", text, flags=re.I)
-    if m:
-        last_target = m.group(1)
-    build_time_s = _find_int(text, r"(\d+(?:\.\d+)?)\s*s(?:ec(?:onds)?)?\b")
+    return parse_incremental(observation, limits, TailState())
+
+
+def parse_incremental(observation: PaneObservation, limits: Dict[str, Any],
+                      state: TailState) -> Tuple[Dict[str, Any], float]:
+    values = state.values
+    # Latest summary line wins; totals persist until the build prints new ones.
+    for ln in state.advance(observation.merged_lines()):
+        for key, pattern in PATTERNS.items():
+            value = _find_int(ln, pattern)
+            if value is not None:
+                values[key] = value
+        m = TARGET_RE.search(ln)
+        if m:
+            values["last_target"] = m.group(1)
+    warnings = values.get("warnings")
+    errors = values.get("errors")
+    last_target = values.get("last_target")
+    build_time_s = values.get("build_time_s")
     facts = {"terminal": {}}
     if warnings is not None: facts["terminal"]["warnings"] = warnings
     if errors is not None: facts["terminal"]["errors"] = errors
@@ -23,8 +42,8 @@ def parse(observation: PaneObservation, limits: Dict[str, Any]) -> Tuple[Dict[st
     return facts, conf
 
 
-def _find_int(text: str, pattern: str):
-    m = re.search(pattern, text, flags=re.I)
+def _find_int(text: str, pattern: re.Pattern):
+    m = pattern.search(text)
     if not m:
         return None
     try:
@@ -5,10 +5,18 @@ from ..core.models import PaneObservation
 
 
 def parse(observation: PaneObservation, limits: Dict[str, Any]) -> Tuple[Dict[str, Any], float]:
-    text = " ".join(observation.merged_lines())
-    detected_edges = _find_int(text, r"(\d+)\s+edges?")
+    text = observation.text
+    # Pixel-mode captures: values sit in the box left of their unit label.
+    index = observation.token_index if observation.engine == "ocr" else None
+    edges = index.left_of("edges") if index is not None else None
+    detected_edges = _find_int(edges, r"^(\d+)$") if edges else None
+    if detected_edges is None:
+        detected_edges = _find_int(text, r"(\d+)\s+edges?")
     period_us = _find_float(text, r"(\d+(?:\.\d+)?)\s*us")
-    duty_pct = _find_float(text, r"(\d+(?:\.\d+)?)%\s*duty")
+    duty = index.left_of("duty") if index is not None else None
+    duty_pct = _find_float(duty, r"^(\d+(?:\.\d+)?)%$") if duty else None
+    if duty_pct is None:
+        duty_pct = _find_float(text, r"(\d+(?:\.\d+)?)%\s*duty")
     facts = {"logic": {}}
     if detected_edges is not None: facts["logic"]["detected_edges"] = detected_edges
     if period_us is not None: facts["logic"]["period_us"] = period_us
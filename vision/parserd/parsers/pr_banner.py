@@ -4,7 +4,7 @@ from ..core.models import PaneObservation
 
 
 def parse(observation: PaneObservation, limits: Dict[str, Any]) -> Tuple[Dict[str, Any], float]:
-    text = " ".join(observation.merged_lines())
+    text = observation.text
     mergeable = None
     if "blocked" in text.lower():
         mergeable = "blocked"
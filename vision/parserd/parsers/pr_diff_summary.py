@@ -5,7 +5,7 @@ from ..core.models import PaneObservation
 
 
 def parse(observation: PaneObservation, limits: Dict[str, Any]) -> Tuple[Dict[str, Any], float]:
-    text = " ".join(observation.merged_lines())
+    text = observation.text
     files_changed = _find_int(text, r"(\d+)\s+files?\s+changed")
     insertions = _find_int(text, r"(\d+)\s+insertions?")
     deletions = _find_int(text, r"(\d+)\s+deletions?")
@@ -5,7 +5,7 @@ from ..core.models import PaneObservation
 
 
 def parse(observation: PaneObservation, limits: Dict[str, Any]) -> Tuple[Dict[str, Any], float]:
-    text = " ".join(observation.merged_lines())
+    text = observation.text
     unresolved = _find_int(text, r"(\d+)\s+unresolved")
     requested_reviewers = []
     facts = {"threads": {}}
@@ -2,31 +2,36 @@ from typing import Tuple, Dict, Any
 import re
 
 from ..core.models import PaneObservation
+from ..core.tail import TailState
+
+PORT_RE = re.compile(r"(tty\.[\w-]+|cu\.[\w-]+)")
+ERRORS_RE = re.compile(r"(\d+)\s+errors?", re.I)
 
 
 def parse(observation: PaneObservation, limits: Dict[str, Any]) -> Tuple[Dict[str, Any], float]:
-    lines = observation.merged_lines()
-    text = " ".join(lines)
-    port = None
-    connected = None
-    last_line = None
-    error_count = None
-    m = re.search(r"(tty\.[\w-]+|cu\.[\w-]+)", text)
-    if m:
-        port = m.group(1)
-    if "connected" in text.lower():
-        connected = True
-    if "disconnected" in text.lower():
-        connected = False
-    if lines:
-        last_line = lines[-1][:160]
-    m = re.search(r"(\d+)\s+errors?", text, flags=re.I)
-    if m:
-        error_count = int(m.group(1))
+    return parse_incremental(observation, limits, TailState())
+
+
+def parse_incremental(observation: PaneObservation, limits: Dict[str, Any],
+                      state: TailState) -> Tuple[Dict[str, Any], float]:
+    values = state.values
+    for ln in state.advance(observation.merged_lines()):
+        m = PORT_RE.search(ln)
+        if m:
+            values["port"] = m.group(1)
+        lower = ln.lower()
+        # The most recent (dis)connect message wins.
+        if "disconnected" in lower:
+            values["connected"] = False
+        elif "connected" in lower:
+            values["connected"] = True
+        values["last_line"] = ln[:160]
+        m = ERRORS_RE.search(ln)
+        if m:
+            values["error_count"] = int(m.group(1))
     facts = {"serial": {}}
-    if port: facts["serial"]["port"] = port
-    if connected is not None: facts["serial"]["connected"] = connected
-    if last_line: facts["serial"]["last_line"] = last_line
-    if error_count is not None: facts["serial"]["error_count"] = error_count
-    conf = 0.85 if port or last_line else 0.0
+    for key in ("port", "connected", "last_line", "error_count"):
+        if values.get(key) is not None:
+            facts["serial"][key] = values[key]
+    conf = 0.85 if values.get("port") or values.get("last_line") else 0.0
     return facts, conf
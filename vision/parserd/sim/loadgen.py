@@ -0,0 +1,383 @@
+"""End-to-end load generator: synthetic visiond frames in, parserd briefs out.
+
+Serves a visiond stand-in whose ``P`` panes change at ``--change-hz``
+(``sim.synthetic``: payload size, OCR token count and capture latency are
+configurable). It then opens ``M`` parserd ``/watch`` streams spread
+round-robin over those panes and measures, over ``--duration`` seconds after
+a warmup:
+
+* brief latency: from the moment a frame changed in the stand-in to the
+  moment a brief for it arrived on a stream. A brief is attributed to the
+  newest frame the stand-in had handed to parserd for that pane when it
+  arrived;
+* dropped frames: changes a stream never saw a brief for because a newer
+  frame superseded them first (capture slower than the change rate, or
+  conflation in the watch hub);
+* missing frames: changes with no brief ``--late-ms`` after they happened
+  by the end of the run (a stalled stream, or facts below
+  ``emit.min_confidence``);
+* late briefs: latency above ``--late-ms``;
+* CPU per brief: parserd's process CPU (from ``/healthz``) divided by the
+  briefs it emitted and by the briefs delivered to streams.
+
+Only frames that parse to different facts than the pane's previous frame
+count as changes. The rest (``unchanged``) give parserd nothing to emit, so
+a brief served after one is attributed to the last real change.
+
+With ``--spawn`` parserd is started as a child process pointed at the
+stand-in, with ``emit.min_confidence`` overridden by ``--min-confidence``
+(default 0, so every pane's changes are emitted). Its pane state goes to a
+temporary directory removed afterwards, and the capture recorder is off. Otherwise start parserd
+yourself with ``VISIOND_PORT`` set to ``--port`` and pass ``--parserd``.
+
+    cd vision && python -m parserd.sim.loadgen --spawn --panes 8 --streams 32 --change-hz 2 --fps 4 \\
+        [--duration 30] [--payload-kib 64] [--tokens 500] [--latency lognormal:15:0.5] [--json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import aiohttp
+from aiohttp import web
+
+from ..core.config import Config
+from ..core.models import PaneObservation
+from ..parsers import PARSERS
+from .synthetic import LatencyModel, SyntheticSource, load_templates
+from .visiond import FrameStore, build_app
+
+VISION = Path(__file__).resolve().parents[2]
+FIXTURES = VISION / "tests" / "fixtures"
+LIMITS = Config(VISION.parent).parserd.get("limits", {})
+HISTORY = 256  # change records kept per pane for attributing briefs
+
+
+class ServedFrames(FrameStore):
+    """``FrameStore`` that remembers the last frame handed out per pane."""
+
+    def __init__(self):
+        super().__init__()
+        self.served: Dict[str, str] = {}
+
+    def get(self, pane_id: str) -> Tuple[bytes, str]:
+        frame = super().get(pane_id)
+        self.served[pane_id] = frame[1]
+        return frame
+
+
+def parse_frame(pane: str, body: bytes) -> Dict[str, Any]:
+    """Facts the pane's full parser reads from an encoded frame."""
+    return PARSERS[pane](PaneObservation.from_payload(json.loads(body)), LIMITS)[0]
+
+
+class LoadTracker:
+    """Matches briefs on each stream to the frame changes behind them.
+
+    With ``facts`` (``(pane, frame body) -> facts``), a frame whose facts equal
+    the previous frame's is not a change.
+    """
+
+    def __init__(self, frames: ServedFrames, late_s: float,
+                 facts: Optional[Callable[[str, bytes], Dict[str, Any]]] = None):
+        self.frames = frames
+        self.late_s = late_s
+        self.facts = facts
+        self._facts: Dict[str, Dict[str, Any]] = {}
+        self._latest: Dict[str, Tuple[int, float]] = {}
+        self._changes: Dict[str, Dict[str, Tuple[int, float]]] = {}
+        self._seq: Dict[str, int] = {}
+        self._last: Dict[int, Optional[int]] = {}  # stream -> change seq of its last brief
+        self.reset()
+
+    def reset(self):
+        self._start = dict(self._seq)
+        self.latencies: List[float] = []
+        self.panes: Dict[str, Dict[str, Any]] = {}
+        self.counters = {"changes": 0, "unchanged": 0, "briefs": 0, "primes": 0, "repeats": 0, "dropped": 0,
+                         "late": 0, "missing": 0, "reconnects": 0}
+
+    def _pane(self, pane: str) -> Dict[str, Any]:
+        out = self.panes.get(pane)
+        if out is None:
+            out = self.panes[pane] = {"changes": 0, "briefs": 0, "dropped": 0, "late": 0, "missing": 0,
+                                      "latencies": []}
+        return out
+
+    def on_change(self, pane: str, t: float):
+        body, frame = self.frames.peek(pane)
+        history = self._changes.setdefault(pane, {})
+        facts = self.facts(pane, body) if self.facts is not None else None
+        if facts is not None and pane in self._latest and facts == self._facts.get(pane):
+            history[frame] = self._latest[pane]
+            self.counters["unchanged"] += 1
+        else:
+            self._facts[pane] = facts
+            seq = self._seq[pane] = self._seq.get(pane, 0) + 1
+            history[frame] = self._latest[pane] = (seq, t)
+            self.counters["changes"] += 1
+            self._pane(pane)["changes"] += 1
+        if len(history) > HISTORY:
+            del history[next(iter(history))]
+
+    def connected(self, stream: int):
+        self._last[stream] = None  # the next brief is the subscribe-time snapshot
+
+    def on_brief(self, stream: int, pane: str, t: float):
+        self.counters["briefs"] += 1
+        stats = self._pane(pane)
+        stats["briefs"] += 1
+        change = self._changes.get(pane, {}).get(self.frames.served.get(pane, ""))
+        last = self._last.get(stream)
+        if change is None:
+            self.counters["repeats"] += 1
+            return
+        seq, changed = change
+        self._last[stream] = seq
+        if last is None:
+            self.counters["primes"] += 1
+            return
+        if seq <= last:
+            # Nothing newer was handed out since this stream's previous brief.
+            self.counters["repeats"] += 1
+            return
+        latency = t - changed
+        self.latencies.append(latency)
+        stats["latencies"].append(latency)
+        dropped = seq - last - 1
+        self.counters["dropped"] += dropped
+        stats["dropped"] += dropped
+        if latency > self.late_s:
+            self.counters["late"] += 1
+            stats["late"] += 1
+
+
+    def finish(self, streams: Dict[int, str], now: float):
+        """Count changes still without a brief ``late_s`` after they happened as ``missing``."""
+        for stream, pane in streams.items():
+            last = max(self._last.get(stream) or 0, self._start.get(pane, 0))
+            overdue = {seq for seq, t in self._changes.get(pane, {}).values() if seq > last and t < now - self.late_s}
+            missing = len(overdue)
+            self.counters["missing"] += missing
+            self._pane(pane)["missing"] += missing
+
+
+def _quantiles_ms(samples: List[float]) -> Dict[str, float]:
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+
+    def q(p: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * p))] * 1000.0, 2)
+
+    return {"count": len(ordered), "mean": round(sum(ordered) / len(ordered) * 1000.0, 2),
+            "p50": q(0.5), "p95": q(0.95), "p99": q(0.99), "max": round(ordered[-1] * 1000.0, 2)}
+
+
+async def run_stream(session: aiohttp.ClientSession, base: str, stream: int, pane: str, fps: float,
+                     tracker: LoadTracker):
+    """One ``/watch`` stream, reconnecting until cancelled."""
+    while True:
+        try:
+            async with session.post(f"{base}/watch", json={"pane_id": pane, "fps": fps, "mode": "jsonseq"}) as resp:
+                resp.raise_for_status()
+                tracker.connected(stream)
+                async for line in resp.content:
+                    if line.strip(b"\x1e \r\n"):
+                        tracker.on_brief(stream, pane, time.monotonic())
+        except (aiohttp.ClientError, ConnectionError):
+            tracker.counters["reconnects"] += 1
+        await asyncio.sleep(0.5)
+
+
+async def sample_parserd(session: aiohttp.ClientSession, base: str) -> Dict[str, Any]:
+    async with session.get(f"{base}/healthz") as resp:
+        health = await resp.json()
+    process = health.get("process", {})
+    return {
+        "cpu_s": process.get("cpu_s", 0.0),
+        "max_rss_kib": process.get("max_rss_kib"),
+        "emits": sum(p.get("emits", 0) for p in health.get("panes", {}).values()),
+        "conflated": sum(sub.get("conflated", 0) for loop in health.get("watch", {}).values()
+                         for sub in loop.get("subscribers", [])),
+    }
+
+
+async def wait_healthy(session: aiohttp.ClientSession, base: str, timeout_s: float):
+    deadline = time.monotonic() + timeout_s
+    while True:
+        try:
+            async with session.get(f"{base}/healthz") as resp:
+                if resp.status == 200:
+                    return
+        except (aiohttp.ClientError, ConnectionError):
+            pass
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"parserd at {base} not healthy after {timeout_s:.0f} s")
+        await asyncio.sleep(0.25)
+
+
+async def spawn_parserd(port: int, visiond_port: int, min_confidence: float,
+                        state_dir: Path) -> asyncio.subprocess.Process:
+    # Keep the run's pane state in state_dir and leave the recorder off, so a load test never touches the
+    # state a real parserd resumes from or fills the recordings directory with synthetic frames.
+    env = dict(os.environ, PARSERD_PORT=str(port), VISIOND_PORT=str(visiond_port),
+               PARSERD_MIN_CONFIDENCE=str(min_confidence),
+               PARSERD_STATE_PATH=str(state_dir / "parserd-state.sqlite"), PARSERD_RECORDER="off")
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (str(VISION), env.get("PYTHONPATH")) if p)
+    # parserd logs every stage to stdout; at load that is noise, and writing it costs parserd CPU.
+    return await asyncio.create_subprocess_exec(sys.executable, "-m", "parserd.main", cwd=VISION, env=env,
+                                                stdout=asyncio.subprocess.DEVNULL)
+
+
+async def stop_parserd(proc: asyncio.subprocess.Process, timeout_s: float = 10.0):
+    # Await rather than block: parserd's shutdown may still be talking to the stand-in on this loop.
+    proc.terminate()
+    try:
+        await asyncio.wait_for(proc.wait(), timeout_s)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+
+
+async def run(args) -> Dict[str, Any]:
+    rng = random.Random(args.seed)
+    templates = load_templates(FIXTURES, args.pane)
+    panes = sorted(templates)[: args.panes] if args.panes else sorted(templates)
+    frames = ServedFrames()
+    tracker = LoadTracker(frames, args.late_ms / 1000.0, facts=parse_frame)
+    source = SyntheticSource(frames, {pane: templates[pane] for pane in panes}, change_hz=args.change_hz,
+                             poisson=args.poisson, payload_kib=args.payload_kib, tokens=args.tokens,
+                             on_change=tracker.on_change, rng=rng)
+    source.prime()
+    latency = LatencyModel.parse(args.latency, rng)
+    app = build_app(frames, latency=latency)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, args.host, args.port).start()
+    base = args.parserd or f"http://127.0.0.1:{args.parserd_port}"
+    state_dir = tempfile.TemporaryDirectory(prefix="parserd-loadgen-") if args.spawn else None
+    proc = None
+    tasks: List[asyncio.Task] = []
+    try:
+        if state_dir is not None:
+            proc = await spawn_parserd(args.parserd_port, args.port, args.min_confidence, Path(state_dir.name))
+        connector = aiohttp.TCPConnector(limit=0)
+        async with aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=None)) as session:
+            await wait_healthy(session, base, args.startup_s)
+            tasks.append(asyncio.create_task(source.run()))
+            streams = {i: panes[i % len(panes)] for i in range(args.streams)}
+            tasks.extend(asyncio.create_task(run_stream(session, base, i, pane, args.fps, tracker))
+                         for i, pane in streams.items())
+            await asyncio.sleep(args.warmup)
+            tracker.reset()
+            captures = dict(app["stats"])
+            before = await sample_parserd(session, base)
+            cpu0, t0 = time.process_time(), time.monotonic()
+            await asyncio.sleep(args.duration)
+            after = await sample_parserd(session, base)
+            elapsed = time.monotonic() - t0
+            cpu = time.process_time() - cpu0
+            tracker.finish(streams, time.monotonic())
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    finally:
+        if proc is not None:
+            await stop_parserd(proc)
+        if state_dir is not None:
+            state_dir.cleanup()
+        await runner.cleanup()
+    parserd_cpu = after["cpu_s"] - before["cpu_s"]
+    emits = after["emits"] - before["emits"]
+    delivered = tracker.counters["briefs"]
+    return {
+        "config": {"panes": len(panes), "streams": args.streams, "fps": args.fps, "change_hz": args.change_hz,
+                   "poisson": args.poisson, "payload_kib": args.payload_kib, "tokens": args.tokens,
+                   "latency": str(latency), "duration_s": round(elapsed, 2),
+                   "frame_bytes": source.stats["frame_bytes"]},
+        **tracker.counters,
+        "briefs_s": round(delivered / elapsed, 2),
+        "latency_ms": _quantiles_ms(tracker.latencies),
+        "captures": {key: app["stats"][key] - captures.get(key, 0) for key in ("full", "not_modified", "bytes_sent")},
+        "parserd": {
+            "cpu_s": round(parserd_cpu, 3),
+            "cpu_pct": round(parserd_cpu / elapsed * 100.0, 1),
+            "emits": emits,
+            "cpu_ms_per_emit": round(parserd_cpu / emits * 1000.0, 3) if emits else None,
+            "cpu_ms_per_brief": round(parserd_cpu / delivered * 1000.0, 3) if delivered else None,
+            "conflated": after["conflated"] - before["conflated"],
+            "max_rss_kib": after["max_rss_kib"],
+        },
+        "loadgen_cpu_pct": round(cpu / elapsed * 100.0, 1),
+        "per_pane": {pane: {**{k: v for k, v in stats.items() if k != "latencies"},
+                            "p95_ms": _quantiles_ms(stats["latencies"]).get("p95")}
+                     for pane, stats in sorted(tracker.panes.items())},
+    }
+
+
+def print_report(report: Dict[str, Any]):
+    conf = report["config"]
+    lat = report["latency_ms"]
+    pd = report["parserd"]
+    print(f"{conf['panes']} panes x {conf['streams']} streams, {conf['fps']:g} fps, changes {conf['change_hz']:g} Hz"
+          f"{' (poisson)' if conf['poisson'] else ''}, frames {conf['frame_bytes'] / 1024:.1f} KiB,"
+          f" latency {conf['latency']}, {conf['duration_s']:g} s")
+    print(f"briefs {report['briefs']} ({report['briefs_s']:g}/s), changes {report['changes']}"
+          f" (+{report['unchanged']} unchanged),"
+          f" dropped {report['dropped']}, missing {report['missing']}, late {report['late']},"
+          f" reconnects {report['reconnects']}")
+    if lat["count"]:
+        print(f"latency ms  p50 {lat['p50']}  p95 {lat['p95']}  p99 {lat['p99']}  max {lat['max']}")
+    print(f"parserd cpu {pd['cpu_pct']}% ({pd['cpu_ms_per_emit']} ms/emit, {pd['cpu_ms_per_brief']} ms/brief),"
+          f" conflated {pd['conflated']}, max rss {pd['max_rss_kib']} KiB; loadgen cpu {report['loadgen_cpu_pct']}%")
+    print(f"{'pane':<26}{'changes':>9}{'briefs':>8}{'dropped':>9}{'missing':>9}{'late':>6}{'p95 ms':>9}")
+    for pane, stats in report["per_pane"].items():
+        p95 = stats["p95_ms"] if stats["p95_ms"] is not None else "-"
+        print(f"{pane:<26}{stats['changes']:>9}{stats['briefs']:>8}{stats['dropped']:>9}{stats['missing']:>9}"
+              f"{stats['late']:>6}{p95:>9}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="end-to-end parserd load generator")
+    ap.add_argument("--panes", type=int, default=0, help="watch the first P fixture panes (0 = all)")
+    ap.add_argument("--pane", action="append", help="restrict to this pane (repeatable)")
+    ap.add_argument("--streams", type=int, default=None, help="/watch streams, round-robin over panes (default P)")
+    ap.add_argument("--fps", type=float, default=2.0, help="fps requested by each stream")
+    ap.add_argument("--change-hz", type=float, default=1.0, help="frame changes per second per pane")
+    ap.add_argument("--poisson", action="store_true", help="Poisson-spaced changes instead of a fixed period")
+    ap.add_argument("--payload-kib", type=float, default=0.0, help="pad frames to at least this size")
+    ap.add_argument("--tokens", type=int, default=0, help="fill frames up to this many OCR tokens")
+    ap.add_argument("--latency", default=None, help="capture reply delay, e.g. fixed:5, exp:10, lognormal:15:0.5")
+    ap.add_argument("--duration", type=float, default=20.0, help="measured seconds")
+    ap.add_argument("--warmup", type=float, default=3.0, help="seconds before measuring")
+    ap.add_argument("--late-ms", type=float, default=None, help="brief latency counted late (default 2 frame periods)")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765, help="stand-in visiond port")
+    ap.add_argument("--parserd", default=None, help="parserd base URL (default the --parserd-port on localhost)")
+    ap.add_argument("--parserd-port", type=int, default=8876)
+    ap.add_argument("--spawn", action="store_true", help="start parserd as a child process")
+    ap.add_argument("--min-confidence", type=float, default=0.0, help="emit.min_confidence for --spawn")
+    ap.add_argument("--startup-s", type=float, default=30.0, help="wait this long for parserd /healthz")
+    ap.add_argument("--seed", type=int, default=None)
+    ap.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = ap.parse_args()
+    if args.streams is None:
+        args.streams = args.panes or len(load_templates(FIXTURES, args.pane))
+    if args.late_ms is None:
+        args.late_ms = 2000.0 / args.fps
+    report = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
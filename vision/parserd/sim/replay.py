@@ -0,0 +1,127 @@
+"""Replay a capture recording through the visiond stand-in.
+
+Frames from a ``core.recorder`` recording are pushed into the stand-in's
+``FrameStore`` on the recorded schedule (or ``--speed`` times faster, or as
+fast as possible with ``--speed 0``). parserd, pointed at this port, then
+runs its real capture → parse → delta → emit path against them. Its
+``/capture_once`` polling and ``/stream`` ingest both see the frames exactly
+as the live visiond served them.
+
+With ``--parserd`` the driver also opens one ``/watch`` stream per replayed
+pane, so the pipeline runs without any other client, and it counts the
+briefs that come back.
+
+    cd vision && python -m parserd.sim.replay .state/recordings/capture-<ts>.jsonseq.gz \\
+        [--speed 4] [--port 8765] [--pane CI_SUMMARY] [--loop] [--parserd http://127.0.0.1:8876]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+from aiohttp import web
+
+from ..core.recorder import CaptureLog
+from .visiond import FrameStore, build_app
+
+
+async def replay(log: CaptureLog, frames: FrameStore, speed: float = 1.0, panes: Optional[List[str]] = None,
+                 max_gap_s: float = 5.0, stats: Optional[Dict[str, Any]] = None, loop: bool = False):
+    """Push ``log`` into ``frames`` on its recorded schedule, scaled by ``speed``.
+
+    Deadlines are absolute from the start of each pass, so a slow ``set``
+    does not push back everything after it. Recorded idle gaps are capped
+    at ``max_gap_s``, for example across a laptop sleep. ``late`` counts
+    frames pushed more than 10 ms behind schedule.
+    """
+    stats = stats if stats is not None else {}
+    stats.update({"replayed": 0, "late": 0, "max_lag_ms": 0.0, "passes": 0, "done": False})
+    while True:
+        start = time.monotonic()
+        virtual = 0.0
+        previous = None
+        for t, pane, payload in log.records(panes):
+            if previous is not None:
+                virtual += min(max(t - previous, 0.0), max_gap_s)
+            previous = t
+            if speed > 0:
+                lag = time.monotonic() - (start + virtual / speed)
+                if lag < 0:
+                    await asyncio.sleep(-lag)
+                    lag = time.monotonic() - (start + virtual / speed)
+                if lag > 0.01:
+                    stats["late"] += 1
+                stats["max_lag_ms"] = max(stats["max_lag_ms"], round(lag * 1000.0, 3))
+            else:
+                await asyncio.sleep(0)
+            frames.set(pane, payload)
+            stats["replayed"] += 1
+        stats["passes"] += 1
+        if not loop:
+            break
+    stats["done"] = True
+    return stats
+
+
+async def watch(base: str, pane: str, fps: float, counts: Dict[str, int]):
+    """Hold a parserd ``/watch`` stream open for ``pane``, counting briefs."""
+    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=None)) as session:
+        while True:
+            try:
+                async with session.post(f"{base}/watch", json={"pane_id": pane, "fps": fps, "mode": "jsonseq"}) as resp:
+                    async for line in resp.content:
+                        if line.strip(b"\x1e \r\n"):
+                            counts[pane] = counts.get(pane, 0) + 1
+            except (aiohttp.ClientError, ConnectionError) as exc:
+                logging.warning("watch %s: %s", pane, exc)
+            await asyncio.sleep(1.0)  # parserd not up yet, or restarted
+
+
+def main():
+    ap = argparse.ArgumentParser(description="replay a capture recording through the visiond stand-in")
+    ap.add_argument("recording", type=Path, help="capture-*.jsonseq.gz written by parserd's recorder")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--speed", type=float, default=1.0, help="N x recorded speed; 0 = as fast as possible")
+    ap.add_argument("--pane", action="append", help="replay only this pane (repeatable)")
+    ap.add_argument("--max-gap-s", type=float, default=5.0, help="cap recorded idle gaps")
+    ap.add_argument("--loop", action="store_true", help="start over when the recording ends")
+    ap.add_argument("--parserd", default=None, help="parserd base URL; opens a /watch stream per pane")
+    ap.add_argument("--fps", type=float, default=2.0, help="fps requested by --parserd watch streams")
+    args = ap.parse_args()
+
+    log = CaptureLog(args.recording)
+    panes = args.pane or sorted(log.panes())
+    frames = FrameStore()
+    app = build_app(frames)
+    app["stats"]["replay"] = replay_stats = {}
+    briefs: Dict[str, int] = {}
+
+    async def on_startup(app: web.Application):
+        t0 = time.monotonic()
+        app["replay"] = asyncio.create_task(replay(
+            log, frames, speed=args.speed, panes=panes, max_gap_s=args.max_gap_s, stats=replay_stats, loop=args.loop,
+        ))
+        app["replay"].add_done_callback(lambda _: print(json.dumps({
+            "replay": replay_stats, "wall_s": round(time.monotonic() - t0, 3), "briefs": briefs,
+        }), flush=True))
+        app["watchers"] = [asyncio.create_task(watch(args.parserd, pane, args.fps, briefs))
+                           for pane in panes] if args.parserd else []
+
+    async def on_cleanup(app: web.Application):
+        for task in [app["replay"], *app["watchers"]]:
+            task.cancel()
+        await asyncio.gather(app["replay"], *app["watchers"], return_exceptions=True)
+
+    app.on_startup.append(on_startup)
+    app.on_cleanup.append(on_cleanup)
+    logging.info("replaying %d records for %d panes", sum(log.panes().values()), len(panes))
+    web.run_app(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
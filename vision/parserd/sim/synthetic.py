@@ -0,0 +1,195 @@
+"""Synthetic frame source for the visiond stand-in.
+
+``SyntheticSource`` takes one template payload per pane (usually the
+``tests/fixtures`` captures) and keeps pushing changed variants of it into a
+``FrameStore``. Four knobs are independent:
+
+* change rate: ``change_hz`` per pane, on a fixed period or Poisson-spaced;
+* payload size: filler lines are prepended to the first text sensor until the
+  encoded frame reaches ``payload_kib`` (a ``metadata.padding`` string on
+  panes with no text sensor);
+* OCR token count: filler tokens are laid out below the real ones until the
+  frame carries ``tokens`` tokens;
+* capture latency: ``LatencyModel`` delays each ``/capture_once`` reply.
+
+Every variant shifts the integers in the template's text by its sequence
+number, so consecutive frames usually parse to different facts. Not always:
+a pane whose facts hold none of those numbers (``BUILD_ARTIFACTS_CONSOLE``)
+parses the same every time. Each variant also gets a fresh perceptual hash,
+which keeps parserd's parse cache from short-circuiting a change.
+"""
+import asyncio
+import copy
+import itertools
+import json
+import math
+import random
+import re
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from .visiond import FrameStore
+
+_NUMBER = re.compile(r"\d+")
+FILLER_LINE = "-- idle --"
+
+
+class LatencyModel:
+    """Per-request capture delay, parsed from a spec such as ``lognormal:20:0.5``.
+
+    ``fixed:MS``, ``uniform:LO:HI``, ``exp:MEAN`` (exponential),
+    ``lognormal:MEDIAN:SIGMA``. ``none`` (or an empty spec) adds no delay.
+    """
+
+    KINDS = ("none", "fixed", "uniform", "exp", "lognormal")
+
+    def __init__(self, kind: str = "none", a: float = 0.0, b: float = 0.0, rng: Optional[random.Random] = None):
+        if kind not in self.KINDS:
+            raise ValueError(f"unknown latency kind {kind!r}; expected one of {', '.join(self.KINDS)}")
+        self.kind = kind
+        self.a = float(a)
+        self.b = float(b)
+        self.rng = rng or random.Random()
+
+    @classmethod
+    def parse(cls, spec: Optional[str], rng: Optional[random.Random] = None) -> "LatencyModel":
+        if not spec:
+            return cls(rng=rng)
+        kind, *args = spec.split(":")
+        values = [float(v) for v in args] + [0.0, 0.0]
+        if kind == "uniform" and len(args) < 2:
+            raise ValueError("uniform latency needs LO:HI")
+        return cls(kind, values[0], values[1], rng=rng)
+
+    def sample(self) -> float:
+        """Seconds to delay one reply."""
+        if self.kind == "fixed":
+            ms = self.a
+        elif self.kind == "uniform":
+            ms = self.rng.uniform(self.a, self.b)
+        elif self.kind == "exp":
+            ms = self.rng.expovariate(1.0 / self.a) if self.a > 0 else 0.0
+        elif self.kind == "lognormal":
+            ms = self.rng.lognormvariate(math.log(self.a), self.b) if self.a > 0 else 0.0
+        else:
+            ms = 0.0
+        return max(ms, 0.0) / 1000.0
+
+    def __str__(self) -> str:
+        return {"none": "none", "fixed": f"fixed:{self.a:g}", "exp": f"exp:{self.a:g}"}.get(
+            self.kind, f"{self.kind}:{self.a:g}:{self.b:g}")
+
+
+def _bump(text: str, k: int) -> str:
+    return _NUMBER.sub(lambda m: str(int(m.group()) + k), text) if k else text
+
+
+def _filler_tokens(tokens: List[Dict[str, Any]], n: int, y_up: bool) -> List[Dict[str, Any]]:
+    if y_up:
+        # Normalized boxes with a bottom-left origin: rows go below zero.
+        return [{"text": ".", "bbox": [(i % 20) * 0.05, -0.02 * (i // 20 + 1), 0.04, 0.015], "confidence": 0.5}
+                for i in range(n)]
+    bottom = max((t["bbox"][1] + t["bbox"][3] for t in tokens if t.get("bbox")), default=0.0) + 40.0
+    return [{"text": ".", "bbox": [(i % 20) * 40.0, bottom + 16.0 * (i // 20), 36.0, 12.0], "confidence": 0.5}
+            for i in range(n)]
+
+
+def make_variant(template: Dict[str, Any], n: int, payload_kib: float = 0.0, tokens: int = 0,
+                 frame_id: Optional[str] = None) -> Dict[str, Any]:
+    """Variant ``n`` of ``template``: integers shifted by ``n``, padded and filled as asked."""
+    payload = copy.deepcopy(template)
+    sensors = payload.get("sensors") or []
+    for sensor in sensors:
+        if sensor.get("text"):
+            sensor["text"] = _bump(sensor["text"], n)
+    ocr = payload.get("ocr") or {}
+    real = ocr.get("tokens") or []
+    for token in real:
+        token["text"] = _bump(str(token.get("text", "")), n)
+    if tokens > len(real):
+        ocr["tokens"] = real + _filler_tokens(real, tokens - len(real), ocr.get("engine") == "vision")
+        payload["ocr"] = ocr
+    metadata = dict(payload.get("metadata") or {})
+    metadata["perceptualHash"] = frame_id or f"syn-{n}"
+    payload["metadata"] = metadata
+    if payload_kib > 0:
+        short = int(payload_kib * 1024) - len(json.dumps(payload, separators=(",", ":")))
+        if short > 0:
+            target = next((s for s in sensors if s.get("text")), None)
+            if target is not None:
+                lines = short // (len(FILLER_LINE) + 2) + 1  # "\n" is two bytes once JSON-escaped
+                target["text"] = "\n".join([FILLER_LINE] * lines) + "\n" + target["text"]
+            else:
+                metadata["padding"] = "." * short
+    return payload
+
+
+def load_templates(root: Path, panes: Optional[List[str]] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """Fixture payloads per pane: ``root/<PANE>/*.json``."""
+    out: Dict[str, List[Dict[str, Any]]] = {}
+    for pane_dir in sorted(p for p in root.iterdir() if p.is_dir()):
+        if panes and pane_dir.name not in panes:
+            continue
+        payloads = [json.loads(p.read_text(encoding="utf-8")) for p in sorted(pane_dir.glob("*.json"))]
+        if payloads:
+            out[pane_dir.name] = payloads
+    return out
+
+
+class SyntheticSource:
+    """Pushes changed variants of each pane's templates into ``frames``.
+
+    Panes with several templates (e.g. passing and failing CI) cycle through
+    them; the integer shift grows once per full cycle. ``on_change`` is
+    called with ``(pane, monotonic_t)`` right after each new frame is set.
+    """
+
+    def __init__(self, frames: FrameStore, templates: Dict[str, List[Dict[str, Any]]], change_hz: float = 1.0,
+                 poisson: bool = False, payload_kib: float = 0.0, tokens: int = 0,
+                 on_change: Optional[Callable[[str, float], None]] = None, rng: Optional[random.Random] = None):
+        self.frames = frames
+        self.templates = templates
+        self.change_hz = float(change_hz)
+        self.poisson = poisson
+        self.payload_kib = float(payload_kib)
+        self.tokens = int(tokens)
+        self.on_change = on_change
+        self.rng = rng or random.Random()
+        self._seq: Dict[str, itertools.count] = {pane: itertools.count() for pane in templates}
+        self.stats: Dict[str, Any] = {"changes": 0, "late": 0, "frame_bytes": 0}
+
+    def step(self, pane: str):
+        n = next(self._seq[pane])
+        variants = self.templates[pane]
+        payload = make_variant(variants[n % len(variants)], n // len(variants), self.payload_kib, self.tokens,
+                               frame_id=f"syn-{pane}-{n}")
+        self.frames.set(pane, payload)
+        self.stats["changes"] += 1
+        self.stats["frame_bytes"] = max(self.stats["frame_bytes"], len(self.frames.peek(pane)[0]))
+        if self.on_change is not None:
+            self.on_change(pane, time.monotonic())
+
+    def prime(self):
+        for pane in self.templates:
+            self.step(pane)
+
+    async def run_pane(self, pane: str):
+        if self.change_hz <= 0:
+            return
+        period = 1.0 / self.change_hz
+        # Spread the panes' phases so their changes do not all land on one tick.
+        deadline = time.monotonic() + self.rng.uniform(0.0, period)
+        while True:
+            delay = deadline - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            elif delay < -period:
+                # Fell more than a period behind: resync instead of bursting to catch up.
+                self.stats["late"] += 1
+                deadline = time.monotonic()
+            self.step(pane)
+            deadline += self.rng.expovariate(self.change_hz) if self.poisson else period
+
+    async def run(self):
+        await asyncio.gather(*(self.run_pane(pane) for pane in self.templates))
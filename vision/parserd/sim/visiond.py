@@ -0,0 +1,241 @@
+"""Pure-Python stand-in for visiond, for developing parserd off macOS.
+
+Serves ``POST /capture_once`` from frames loaded out of fixture payloads or
+pushed through ``POST /_frame``, and implements the conditional-capture
+protocol: a request whose ``If-None-Match`` matches the frame's perceptual
+hash gets ``304 Not Modified`` with no body.
+
+``POST /stream`` is the push protocol: ``{"panes": [...], "mode":
+"jsonseq"|"sse"}`` opens one long-lived response carrying the current frame
+of every requested pane, then each new frame as it changes, as records
+``{"seq": n, "frame": {...}}``. ``seq`` is the pane's frame version, so it
+carries across connections: frames a reader never got, dropped from a slow
+reader's queue or changed while it was disconnected, show up as a gap.
+Idle connections get ``{"heartbeat": true}`` records.
+
+With ``--change-hz`` the fixtures become templates for ``sim.synthetic``,
+which keeps changing every pane at that rate. Its size, token and latency
+knobs shape the frames and replies; ``sim.loadgen`` drives the same source.
+
+    python -m parserd.sim.visiond --port 8765 --fixtures vision/tests/fixtures \\
+        [--change-hz 2 --payload-kib 64 --tokens 500 --latency lognormal:15:0.5]
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from aiohttp import web
+
+
+def frame_hash(payload: Dict[str, Any]) -> str:
+    content = json.dumps([payload.get("sensors", []), payload.get("ocr", {})], sort_keys=True)
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def parse_if_none_match(value: Optional[str]) -> set:
+    if not value:
+        return set()
+    tags = set()
+    for tag in value.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        tags.add(tag.strip('"'))
+    return tags
+
+
+class FrameStore:
+    """Latest payload per pane, pre-encoded once per change."""
+
+    def __init__(self):
+        self._frames: Dict[str, Tuple[bytes, str]] = {}
+        self._versions: Dict[str, int] = {}
+        self._listeners: Set[Callable[[str], None]] = set()
+
+    def set(self, pane_id: str, payload: Dict[str, Any]):
+        payload = dict(payload)
+        payload["pane"] = pane_id
+        metadata = dict(payload.get("metadata") or {})
+        metadata.setdefault("perceptualHash", frame_hash(payload))
+        payload["metadata"] = metadata
+        body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        previous = self._frames.get(pane_id)
+        self._frames[pane_id] = (body, str(metadata["perceptualHash"]))
+        if previous is None or previous[1] != self._frames[pane_id][1]:
+            self._versions[pane_id] = self._versions.get(pane_id, 0) + 1
+            for listener in list(self._listeners):
+                listener(pane_id)
+
+    def version(self, pane_id: str) -> int:
+        """How many distinct frames ``pane_id`` has had; the stream's ``seq``."""
+        return self._versions.get(pane_id, 0)
+
+    def panes(self) -> List[str]:
+        return list(self._frames)
+
+    def listen(self, listener: Callable[[str], None]):
+        self._listeners.add(listener)
+
+    def unlisten(self, listener: Callable[[str], None]):
+        self._listeners.discard(listener)
+
+    def peek(self, pane_id: str) -> Optional[Tuple[bytes, str]]:
+        """The current frame without marking it served or creating an empty one."""
+        return self._frames.get(pane_id)
+
+    def get(self, pane_id: str) -> Tuple[bytes, str]:
+        frame = self._frames.get(pane_id)
+        if frame is None:
+            self.set(pane_id, {"sensors": [], "ocr": {"tokens": []}})
+            frame = self._frames[pane_id]
+        return frame
+
+    def load_fixtures(self, root: Path):
+        for pane_dir in sorted(p for p in root.iterdir() if p.is_dir()):
+            payloads = sorted(pane_dir.glob("*.json"))
+            if payloads:
+                self.set(pane_dir.name, json.loads(payloads[0].read_text(encoding="utf-8")))
+
+
+async def capture_once(request: web.Request):
+    data = await request.json()
+    pane_id = data.get("pane_id", "")
+    stats = request.app["stats"]
+    latency = request.app["latency"]
+    if latency is not None:
+        stats["in_flight"] += 1
+        stats["peak_in_flight"] = max(stats["peak_in_flight"], stats["in_flight"])
+        try:
+            await asyncio.sleep(latency.sample())
+        finally:
+            stats["in_flight"] -= 1
+    body, etag = request.app["frames"].get(pane_id)
+    headers = {"ETag": f'"{etag}"'}
+    if etag in parse_if_none_match(request.headers.get("If-None-Match")):
+        stats["not_modified"] += 1
+        return web.Response(status=304, headers=headers)
+    stats["full"] += 1
+    stats["bytes_sent"] += len(body)
+    return web.Response(body=body, content_type="application/json", headers=headers)
+
+
+def _stream_frame(mode: str, event_id: Optional[bytes], record: bytes) -> bytes:
+    if mode == "sse":
+        return (b"id: " + event_id + b"\n" if event_id is not None else b"") + b"data: " + record + b"\n\n"
+    return b"\x1e" + record + b"\n"
+
+
+async def stream(request: web.Request):
+    data = await request.json() if request.can_read_body else {}
+    frames: FrameStore = request.app["frames"]
+    stats = request.app["stats"]
+    panes = set(data.get("panes") or frames.panes())
+    mode = "sse" if data.get("mode") == "sse" else "jsonseq"
+    heartbeat_s = float(request.app["heartbeat_s"])
+    queue: asyncio.Queue = asyncio.Queue(maxsize=int(request.app["stream_queue"]))
+
+    def push(pane_id: str):
+        if pane_id not in panes:
+            return
+        body, _ = frames.get(pane_id)
+        n = frames.version(pane_id)
+        if queue.full():
+            queue.get_nowait()
+            stats["stream_dropped"] += 1
+        queue.put_nowait((b"%s:%d" % (pane_id.encode("utf-8"), n), b'{"seq":%d,"frame":' % n + body + b"}"))
+
+    response = web.StreamResponse(status=200, headers={
+        "Content-Type": "text/event-stream" if mode == "sse" else "application/json-seq",
+        "Cache-Control": "no-cache",
+    })
+    await response.prepare(request)
+    stats["streams"] += 1
+    for pane_id in sorted(panes.intersection(frames.panes())):
+        push(pane_id)
+    frames.listen(push)
+    try:
+        while True:
+            try:
+                event_id, record = await asyncio.wait_for(queue.get(), heartbeat_s)
+            except asyncio.TimeoutError:
+                await response.write(_stream_frame(mode, None, b'{"heartbeat":true}'))
+                continue
+            await response.write(_stream_frame(mode, event_id, record))
+            stats["stream_records"] += 1
+    except (asyncio.CancelledError, ConnectionResetError):
+        pass
+    finally:
+        frames.unlisten(push)
+        stats["streams"] -= 1
+    return response
+
+
+async def set_frame(request: web.Request):
+    data = await request.json()
+    request.app["frames"].set(data["pane_id"], data.get("payload", {}))
+    return web.json_response({"ok": True})
+
+
+async def healthz(request: web.Request):
+    return web.json_response({"status": "ok", "standin": True, **request.app["stats"]})
+
+
+def build_app(frames: Optional[FrameStore] = None, heartbeat_s: float = 5.0,
+              stream_queue: int = 256, latency=None) -> web.Application:
+    """``latency`` is a ``sim.synthetic.LatencyModel`` delaying ``/capture_once`` replies;
+    ``peak_in_flight`` in the stats counts how many of those delays overlapped."""
+    app = web.Application()
+    app["frames"] = frames or FrameStore()
+    app["latency"] = latency
+    app["heartbeat_s"] = heartbeat_s
+    app["stream_queue"] = stream_queue
+    app["stats"] = {"full": 0, "not_modified": 0, "bytes_sent": 0, "streams": 0, "stream_records": 0,
+                    "stream_dropped": 0, "in_flight": 0, "peak_in_flight": 0}
+    app.add_routes([
+        web.get("/healthz", healthz),
+        web.post("/capture_once", capture_once),
+        web.post("/stream", stream),
+        web.post("/_frame", set_frame),
+    ])
+    return app
+
+
+def main():
+    ap = argparse.ArgumentParser(description="visiond stand-in")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--fixtures", type=Path, default=None, help="directory of <PANE_ID>/*.json payloads")
+    ap.add_argument("--change-hz", type=float, default=0.0, help="change every fixture pane at this rate")
+    ap.add_argument("--poisson", action="store_true", help="Poisson-spaced changes instead of a fixed period")
+    ap.add_argument("--payload-kib", type=float, default=0.0, help="pad changing frames to at least this size")
+    ap.add_argument("--tokens", type=int, default=0, help="fill changing frames up to this many OCR tokens")
+    ap.add_argument("--latency", default=None, help="capture reply delay, e.g. fixed:5 or lognormal:15:0.5")
+    args = ap.parse_args()
+    from .synthetic import LatencyModel, SyntheticSource, load_templates
+
+    frames = FrameStore()
+    app = build_app(frames, latency=LatencyModel.parse(args.latency) if args.latency else None)
+    if args.fixtures and args.change_hz > 0:
+        source = SyntheticSource(frames, load_templates(args.fixtures), change_hz=args.change_hz,
+                                 poisson=args.poisson, payload_kib=args.payload_kib, tokens=args.tokens)
+        source.prime()
+        app["stats"]["synthetic"] = source.stats
+
+        async def on_startup(app: web.Application):
+            app["synthetic"] = asyncio.create_task(source.run())
+
+        async def on_cleanup(app: web.Application):
+            app["synthetic"].cancel()
+
+        app.on_startup.append(on_startup)
+        app.on_cleanup.append(on_cleanup)
+    elif args.fixtures:
+        frames.load_fixtures(args.fixtures)
+    web.run_app(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
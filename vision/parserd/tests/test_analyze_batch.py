@@ -0,0 +1,86 @@
+import asyncio
+import json
+import time
+from pathlib import Path
+
+import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+import parserd.main as main
+from parserd.core.cache import ParseCache
+from parserd.core.executor import TIMED_OUT, ParseExecutor
+from parserd.core.vision_client import VisionClient
+from parserd.sim.synthetic import LatencyModel
+from parserd.sim.visiond import FrameStore, build_app
+
+FIXTURES = Path(__file__).resolve().parents[2] / "tests" / "fixtures"
+PANES = ["CI_SUMMARY", "PR_BANNER", "CHECKS_LIST", "PR_DIFF_SUMMARY", "IDE_PROBLEMS", "PR_THREAD_SUMMARY"]
+
+
+async def _batch(monkeypatch, body):
+    frames = FrameStore()
+    frames.load_fixtures(FIXTURES)
+    visiond = TestServer(build_app(frames, latency=LatencyModel("fixed", 40)), host="127.0.0.1")
+    await visiond.start_server()
+    client = VisionClient(port=visiond.port)
+    await client.start()
+    monkeypatch.setattr(main, "vision_client", client)
+    app = web.Application()
+    app.add_routes([web.post("/analyze_batch", main.analyze_batch)])
+    parserd = TestServer(app, host="127.0.0.1")
+    await parserd.start_server()
+    try:
+        async with aiohttp.ClientSession() as session:
+            async with session.post(parserd.make_url("/analyze_batch"), json=body) as resp:
+                status, content_type, raw = resp.status, resp.content_type, await resp.read()
+    finally:
+        await parserd.close()
+        await client.close()
+        await visiond.close()
+    return status, content_type, raw, visiond.app["stats"]
+
+
+def _records(raw):
+    assert raw.startswith(b"\x1e")
+    return [json.loads(chunk) for chunk in raw.split(b"\x1e")[1:]]
+
+
+def test_batch_streams_one_jsonseq_record_per_pane(monkeypatch):
+    status, content_type, raw, _ = asyncio.run(_batch(monkeypatch, {"pane_ids": PANES + ["NOPE"]}))
+    assert status == 200 and content_type == "application/json-seq"
+    records = {record["pane"]: record for record in _records(raw)}
+    assert sorted(records) == sorted(PANES + ["NOPE"])
+    assert records["NOPE"] == {"pane": "NOPE", "error": "unknown pane_id"}
+    for pane in PANES:
+        assert "facts" in records[pane] and "confidence" in records[pane]
+
+
+def test_batch_honors_the_concurrency_cap(monkeypatch):
+    _, _, raw, stats = asyncio.run(_batch(monkeypatch, {"pane_ids": PANES, "concurrency": 2}))
+    assert len(_records(raw)) == len(PANES)
+    assert stats["full"] == len(PANES) and stats["peak_in_flight"] == 2
+
+
+def test_batch_rejects_a_non_numeric_concurrency(monkeypatch):
+    status, _, raw, stats = asyncio.run(_batch(monkeypatch, {"pane_ids": PANES, "concurrency": "lots"}))
+    assert status == 400 and json.loads(raw) == {"error": "concurrency must be an integer"}
+    assert stats["full"] == 0
+
+
+def _stuck(observation, limits):
+    time.sleep(0.2)
+    return {"ci": {"status": "passing"}}, 0.99
+
+
+def test_timed_out_parse_is_reported_as_an_error(monkeypatch):
+    executor = ParseExecutor("thread", workers=1, timeout_s=0.05)
+    monkeypatch.setattr(main, "parse_executor", executor)
+    monkeypatch.setattr(main, "PARSERS", {"CI_SUMMARY": _stuck})
+    monkeypatch.setattr(main, "parse_cache", ParseCache())
+    try:
+        _, _, raw, _ = asyncio.run(_batch(monkeypatch, {"pane_ids": ["CI_SUMMARY"]}))
+    finally:
+        executor.close()
+    assert _records(raw) == [{"pane": "CI_SUMMARY", "error": "parse timed out", "timed_out": True}]
+    assert TIMED_OUT == ({}, 0.0)
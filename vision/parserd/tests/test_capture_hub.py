@@ -0,0 +1,45 @@
+import asyncio
+
+from parserd.core.hub import CaptureHub
+
+
+async def _run_two_subscribers():
+    calls = []
+
+    async def tick(pane):
+        calls.append(pane)
+        return f"{pane}:{len(calls)}"
+
+    hub = CaptureHub(tick)
+    a = hub.subscribe("CI_SUMMARY", fps=50)
+    b = hub.subscribe("CI_SUMMARY", fps=10)
+    first_a = await asyncio.wait_for(a.queue.get(), 1)
+    first_b = await asyncio.wait_for(b.queue.get(), 1)
+    await hub.unsubscribe(a)
+    running = bool(hub.stats())
+    await hub.unsubscribe(b)
+    ticks_after_close = len(calls)
+    await asyncio.sleep(0.05)
+    return calls, first_a, first_b, running, hub.stats(), ticks_after_close
+
+
+def test_subscribers_share_one_pane_loop():
+    calls, first_a, first_b, running, stats, ticks_after_close = asyncio.run(_run_two_subscribers())
+    assert first_a == first_b == "CI_SUMMARY:1"
+    assert running
+    assert stats == {}
+    assert len(calls) == ticks_after_close
+
+
+def test_prime_brings_late_subscriber_up_to_date():
+    async def tick(pane):
+        await asyncio.sleep(1)
+
+    async def run():
+        hub = CaptureHub(tick, prime=lambda pane: f"snapshot:{pane}")
+        sub = hub.subscribe("PR_BANNER", fps=1)
+        item = sub.queue.get_nowait()
+        await hub.close()
+        return item
+
+    assert asyncio.run(run()) == "snapshot:PR_BANNER"
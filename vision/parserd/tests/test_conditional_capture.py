@@ -0,0 +1,37 @@
+import asyncio
+
+from aiohttp.test_utils import TestServer
+
+from parserd.core.vision_client import VisionClient
+from parserd.sim.visiond import FrameStore, build_app
+
+
+def _payload(text):
+    return {"sensors": [{"source": "dom", "text": text}]}
+
+
+async def _exercise():
+    frames = FrameStore()
+    frames.set("CI_SUMMARY", _payload("All checks have passed"))
+    server = TestServer(build_app(frames), host="127.0.0.1")
+    await server.start_server()
+    client = VisionClient(port=server.port)
+    try:
+        first = await client.capture_once("CI_SUMMARY")
+        same = await client.capture_once("CI_SUMMARY", if_none_match=first.perceptual_hash)
+        frames.set("CI_SUMMARY", _payload("2 failing checks"))
+        changed = await client.capture_once("CI_SUMMARY", if_none_match=first.perceptual_hash)
+    finally:
+        await client.close()
+        await server.close()
+    return client.stats()["panes"]["CI_SUMMARY"], first, same, changed
+
+
+def test_unchanged_frame_returns_not_modified():
+    counters, first, same, changed = asyncio.run(_exercise())
+    assert first.structured_text == ["All checks have passed"] and first.perceptual_hash
+    assert same.not_modified and not same.sensors
+    assert changed.structured_text == ["2 failing checks"]
+    assert changed.perceptual_hash != first.perceptual_hash
+    assert counters["full"] == 2 and counters["not_modified"] == 1
+    assert counters["bytes_saved"] > 0
@@ -0,0 +1,70 @@
+import asyncio
+
+import jsonpatch
+
+from parserd.core.conflate import ConflatingQueue, Update
+from parserd.core.delta import DeltaEngine
+
+
+def _updates(pane, states):
+    engine = DeltaEngine()
+    out = []
+    for facts in states:
+        before = engine.snapshot(pane)
+        delta = engine.patch(pane, facts)
+        out.append(Update({"ts": "t", "pane": pane, "delta": delta, "confidence": 1.0}, before, engine.snapshot(pane)))
+    return out
+
+
+def test_backlog_conflates_to_one_patch_per_pane():
+    queue = ConflatingQueue(threshold=4)
+    statuses = ["failing", "running", "passing"]
+    ci = _updates("CI_SUMMARY", [{"ci": {"status": s, "n": i}} for i, s in enumerate(statuses)])
+    pr = _updates("PR_BANNER", [{"pr": {"mergeable": "clean"}}, {"pr": {"mergeable": "blocked"}}])
+    for update in (ci[0], pr[0], ci[1], pr[1], ci[2]):
+        queue.put_nowait(update)
+
+    assert queue.qsize() == 2
+    assert queue.stats()["conflated"] == 3
+    received = [queue.get_nowait(), queue.get_nowait()]
+    assert [u.pane for u in received] == ["PR_BANNER", "CI_SUMMARY"]
+    assert jsonpatch.apply_patch({}, received[0].brief["delta"]) == {"pr": {"mergeable": "blocked"}}
+    assert jsonpatch.apply_patch({}, received[1].brief["delta"]) == {"ci": {"status": "passing", "n": 2}}
+
+
+def test_changes_that_cancel_out_are_dropped():
+    queue = ConflatingQueue(threshold=1)
+    updates = _updates("HIL_LOGS", [{"hil": {"fps_avg": 60}}, {"hil": {"fps_avg": 30}}, {"hil": {"fps_avg": 60}}])
+    for update in updates[1:]:
+        queue.put_nowait(update)
+    assert queue.qsize() == 0
+    assert queue.stats()["conflated"] == 2
+
+
+def test_get_waits_for_put_and_records_lag():
+    async def run():
+        queue = ConflatingQueue()
+        waiter = asyncio.create_task(queue.get())
+        await asyncio.sleep(0.01)
+        queue.put_nowait("raw")
+        return await asyncio.wait_for(waiter, 1), queue.stats()
+
+    item, stats = asyncio.run(run())
+    assert item == "raw"
+    assert stats["delivered"] == 1 and stats["queued"] == 0 and stats["lag_s"] == 0.0
+
+
+def test_critical_update_jumps_ahead_but_keeps_pane_order():
+    queue = ConflatingQueue(threshold=8)
+    ci = _updates("CI_SUMMARY", [{"ci": {"status": "running", "n": 1}}, {"ci": {"status": "passing", "n": 1}}])
+    pr = _updates("PR_BANNER", [{"pr": {"mergeable": "clean"}}])
+    queue.put_nowait(ci[0])
+    queue.put_nowait(pr[0])
+    ci[1].critical = True
+    queue.put_nowait(ci[1])
+
+    first = queue.get_nowait()
+    assert first.pane == "CI_SUMMARY" and first.critical
+    assert jsonpatch.apply_patch({}, first.brief["delta"]) == {"ci": {"status": "passing", "n": 1}}
+    assert queue.get_nowait().pane == "PR_BANNER"
+    assert queue.qsize() == 0
@@ -0,0 +1,17 @@
+from parserd.core.critical import CriticalFields
+
+CRITICAL = CriticalFields(["ci/status", "pr/mergeable"])
+
+
+def test_ops_on_field_descendants_and_ancestors():
+    assert CRITICAL.touches([{"op": "replace", "path": "/ci/status", "value": "passing"}])
+    assert CRITICAL.touches([{"op": "remove", "path": "/pr"}])
+    assert CRITICAL.touches([{"op": "add", "path": "/ci", "value": {"status": "failing"}}])
+    assert not CRITICAL.touches([{"op": "add", "path": "/ci", "value": {"checks_total": 3}}])
+    assert not CRITICAL.touches([{"op": "replace", "path": "/ci/checks_failed", "value": 1}])
+
+
+def test_presence_in_facts():
+    assert CRITICAL.present({"pr": {"mergeable": "clean"}})
+    assert not CRITICAL.present({"terminal": {"errors": 0}})
+    assert not CriticalFields([]).touches([{"op": "remove", "path": ""}])
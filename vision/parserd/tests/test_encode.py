@@ -0,0 +1,56 @@
+import asyncio
+import json
+
+import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from parserd.core import encode
+from parserd.core.conflate import ConflatingQueue
+from parserd.core.emit import stream_jsonseq
+
+BRIEF = {"ts": "t", "pane": "CI_SUMMARY", "delta": [{"op": "add", "path": "/ci", "value": {"status": "ø"}}],
+         "confidence": 0.99}
+
+
+def test_frames_share_one_body():
+    encoded = encode.EncodedBrief(BRIEF)
+    assert json.loads(encoded.body) == BRIEF
+    assert encoded.jsonseq == b"\x1e" + encoded.body + b"\n"
+    assert encoded.sse == b"data: " + encoded.body + b"\n\n"
+    assert encoded.jsonseq is encoded.jsonseq
+    assert json.loads(encode._json_dumps(BRIEF)) == json.loads(encoded.body)
+
+
+def test_pre_serialized_text_is_not_encoded_again():
+    text = json.dumps(BRIEF)
+    assert encode.as_encoded(text).body == text.encode("utf-8")
+
+
+async def _stream_two_records():
+    queue = ConflatingQueue()
+
+    async def handler(request):
+        return await stream_jsonseq(request, queue)
+
+    app = web.Application()
+    app.router.add_get("/watch", handler)
+    server = TestServer(app, host="127.0.0.1")
+    await server.start_server()
+    try:
+        async with aiohttp.ClientSession() as session:
+            async with session.get(f"http://127.0.0.1:{server.port}/watch") as resp:
+                queue.put_nowait(encode.EncodedBrief(BRIEF))
+                queue.put_nowait(json.dumps(BRIEF))
+                raw = b""
+                while raw.count(b"\n") < 2:
+                    raw += await asyncio.wait_for(resp.content.readany(), 1)
+    finally:
+        await server.close()
+    return raw
+
+
+def test_jsonseq_stream_sends_objects_not_strings():
+    raw = asyncio.run(_stream_two_records())
+    records = [json.loads(r) for r in raw.split(b"\x1e") if r]
+    assert records == [BRIEF, BRIEF]
@@ -0,0 +1,49 @@
+import asyncio
+import json
+
+from parserd.core.metrics import Histogram, MetricsRegistry, process_stats
+
+
+def test_histogram_quantiles_stay_within_bucket_bounds():
+    hist = Histogram()
+    for ms in range(1, 101):
+        hist.observe(ms / 1000.0)
+    summary = hist.summary()
+    assert summary["count"] == 100
+    assert 50.0 <= summary["mean_ms"] <= 51.0
+    assert 50.0 < summary["p95_ms"] <= 100.0
+
+
+def test_prometheus_exposition_groups_samples():
+    registry = MetricsRegistry()
+    registry.observe("CI_SUMMARY", "parse", 0.002)
+    registry.count("CI_SUMMARY", "emits")
+    registry.add_source("transport", lambda: {
+        "requests": 3,
+        "panes": {"CI_SUMMARY": {"full": 1}, "HIL_LOGS": {"full": 2}},
+    })
+    text = registry.prometheus()
+    assert 'parserd_stage_seconds_bucket{pane="CI_SUMMARY",stage="parse",le="0.0025"} 1' in text
+    assert 'parserd_emits_total{pane="CI_SUMMARY"} 1' in text
+    full = [line for line in text.splitlines() if line.startswith("parserd_transport_panes_full")]
+    assert full == [
+        'parserd_transport_panes_full{pane="CI_SUMMARY"} 1',
+        'parserd_transport_panes_full{pane="HIL_LOGS"} 2',
+    ]
+    assert registry.snapshot()["panes"]["CI_SUMMARY"]["emits"] == 1
+
+
+def test_process_stats_report_cpu_and_peak_rss():
+    stats = process_stats()
+    assert stats["cpu_s"] > 0 and stats["max_rss_kib"] > 0
+    assert stats["user_s"] + stats["system_s"] > 0
+    registry = MetricsRegistry()
+    registry.add_source("process", process_stats)
+    assert "parserd_process_max_rss_kib " in registry.prometheus()
+
+
+def test_healthz_reports_the_process_source():
+    import parserd.main as main
+
+    response = asyncio.run(main.healthz(None))
+    assert {"cpu_s", "max_rss_kib"} <= set(json.loads(response.text)["process"])
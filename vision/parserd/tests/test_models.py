@@ -0,0 +1,35 @@
+import base64
+
+from parserd.core.models import PaneObservation, Sensor, Token, Tokens
+
+
+def _payload():
+    return {
+        "pane": "CI_SUMMARY",
+        "ocr": {"tokens": [
+            {"text": "All checks", "bbox": [0, 0, 40, 10], "confidence": 0.9},
+            {"text": "Have Passed", "bbox": [0, 12], "confidence": 0.8},
+        ]},
+        "png": base64.b64encode(b"\x89PNG fake").decode("ascii"),
+    }
+
+
+def test_tokens_are_column_backed_views():
+    obs = PaneObservation.from_payload(_payload())
+    assert len(obs.tokens) == 2 and obs.engine == "ocr"
+    assert obs.tokens.texts == ["All checks", "Have Passed"]
+    assert list(obs.tokens.bboxes[4:]) == [0.0, 12.0, 0.0, 0.0]
+    assert obs.tokens[-1] == Token("Have Passed", [0.0, 12.0, 0.0, 0.0], 0.8)
+    assert sum(obs.tokens.confidences) == sum(t.confidence for t in obs.tokens)
+    assert len(Tokens([Token("x", [1, 2, 3, 4], 0.5)])) == 1
+
+
+def test_line_views_are_cached_and_png_is_lazy():
+    obs = PaneObservation.from_payload(_payload())
+    assert obs._png_bytes is None
+    assert obs.merged_lines() is obs.merged_lines()
+    assert obs.text == "All checks Have Passed" and obs.lower_text == "all checks have passed"
+    assert obs.text is obs.text
+    assert obs.png_bytes == b"\x89PNG fake"
+    structured = PaneObservation("PR_BANNER", sensors=[Sensor("dom", None, "Ready\n to merge", 1.0)])
+    assert structured.merged_lines() == ["Ready", "to merge"] and structured.png_bytes is None
@@ -0,0 +1,40 @@
+import asyncio
+import time
+
+from parserd.core.models import PaneObservation, Sensor
+from parserd.core.multiread import multi_read
+
+
+def _fetcher(delays, structured):
+    started = []
+
+    async def fetch(i):
+        started.append(i)
+        await asyncio.sleep(delays[i])
+        sensors = [Sensor("ax", None, f"read {i}", None)] if structured[i] else []
+        return PaneObservation(pane_id="IDE_TERMINAL", sensors=sensors)
+
+    return fetch, started
+
+
+def test_hedged_read_returns_first_structured_result():
+    fetch, started = _fetcher([1.0, 0.01, 1.0], [True, True, True])
+    t0 = time.perf_counter()
+    observations = asyncio.run(multi_read(fetch, 3, mode="hedged", hedge_delay_s=0.02))
+    assert time.perf_counter() - t0 < 0.5
+    assert started == [0, 1]
+    assert [o.structured_text for o in observations] == [["read 1"]]
+
+
+def test_concurrent_read_collects_all_unstructured_results():
+    fetch, started = _fetcher([0.01, 0.02, 0.03], [False, False, False])
+    observations = asyncio.run(multi_read(fetch, 3, mode="concurrent", max_concurrent=2))
+    assert sorted(started) == [0, 1, 2]
+    assert len(observations) == 3
+
+
+def test_sequential_stops_at_structured():
+    fetch, started = _fetcher([0, 0, 0], [False, True, True])
+    observations = asyncio.run(multi_read(fetch, 3))
+    assert started == [0, 1]
+    assert len(observations) == 2
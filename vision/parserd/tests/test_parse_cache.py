@@ -0,0 +1,29 @@
+from parserd.core.cache import ParseCache
+from parserd.core.models import Metadata, PaneObservation, Sensor
+
+
+def _obs(text, phash=None):
+    metadata = Metadata(raw={"perceptualHash": phash} if phash else {})
+    return PaneObservation(pane_id="CI_SUMMARY", sensors=[Sensor("dom", None, text, None)], metadata=metadata)
+
+
+def test_key_normalizes_whitespace_and_prefers_perceptual_hash():
+    cache = ParseCache()
+    assert cache.key_for(_obs("All  checks\npassed ")) == cache.key_for(_obs("All checks passed"))
+    assert cache.key_for(_obs("All checks passed")) != cache.key_for(_obs("2 failing"))
+    assert cache.key_for(_obs("a", phash="abc")) == cache.key_for(_obs("b", phash="abc"))
+
+
+def test_lru_eviction_and_ttl():
+    cache = ParseCache(max_entries=2)
+    cache.put("a", {"ci": {}}, 0.1)
+    cache.put("b", {}, 0.2)
+    assert cache.get("a") == ({"ci": {}}, 0.1)
+    cache.put("c", {}, 0.3)
+    assert cache.get("b") is None
+    assert cache.stats()["evictions"] == 1
+
+    expired = ParseCache(ttl_s=-1)
+    expired.put("a", {}, 1.0)
+    assert expired.get("a") is None
+    assert expired.stats()["expirations"] == 1
@@ -0,0 +1,63 @@
+import asyncio
+import time
+
+import pytest
+
+from parserd.core.executor import TIMED_OUT, ParseExecutor
+from parserd.core.metrics import MetricsRegistry
+
+
+def _parse(text):
+    return {"text": text}, 0.99
+
+
+def _stuck(seconds):
+    time.sleep(seconds)
+    return {"late": True}, 0.99
+
+
+async def _isolation(mode):
+    metrics = MetricsRegistry()
+    executor = ParseExecutor(mode, workers=1, timeout_s=0.2, metrics=metrics)
+    try:
+        t0 = time.perf_counter()
+        # A killed process takes its sleep with it; a thread has to run out.
+        stuck, seconds = (_stuck, 0.6) if mode == "thread" else (time.sleep, 5)
+        slow = await executor.run("HIL_LOGS", stuck, seconds)
+        ok = await executor.run("PR_BANNER", _parse, "Ready to merge")
+        elapsed = time.perf_counter() - t0
+        after = await executor.run("HIL_LOGS", _parse, "fine now")
+        return slow, ok, after, elapsed, executor.stats(), metrics.snapshot()["panes"]
+    finally:
+        executor.close()
+
+
+@pytest.mark.parametrize("mode", ["thread", "process"])
+def test_stuck_pane_times_out_without_blocking_its_lane(mode):
+    slow, ok, after, elapsed, stats, panes = asyncio.run(_isolation(mode))
+    assert slow is TIMED_OUT and ok == ({"text": "Ready to merge"}, 0.99)
+    assert elapsed < 0.55  # the banner parse did not wait for the stuck one
+    assert stats["timeouts"] == 1 and stats["lanes_replaced"] == 1
+    if mode == "thread":
+        # The abandoned thread is still sleeping: the pane is skipped, not queued.
+        assert after is TIMED_OUT and stats["skipped"] == 1
+    else:
+        # The stuck worker process was terminated, so the pane parses again at once.
+        assert after == ({"text": "fine now"}, 0.99)
+    assert panes["PR_BANNER"]["stages"]["parse_exec"]["count"] == 1
+    assert panes["PR_BANNER"]["stages"]["parse_queue"]["count"] == 1
+
+
+def test_panes_pin_to_lanes_and_inline_counts_overruns():
+    async def go():
+        executor = ParseExecutor("thread", workers=2)
+        for pane in ("A", "B", "C", "A"):
+            await executor.run(pane, _parse, pane)
+        inline = ParseExecutor("inline", timeout_s=0.01)
+        result = await inline.run("A", _stuck, 0.02)
+        executor.close()
+        return executor._pins, executor.stats(), result, inline.stats()
+
+    pins, stats, result, inline = asyncio.run(go())
+    assert pins == {"A": 0, "B": 1, "C": 0} and stats["completed"] == 4
+    assert result == ({"late": True}, 0.99) and inline["overruns"] == 1
@@ -0,0 +1,18 @@
+import pytest
+
+from parserd.bench.bench_parsers import check_golden, load_cases
+from parserd.parsers import PARSERS
+
+CASES = load_cases()
+
+
+def test_every_parser_has_a_recorded_fixture():
+    assert {case.pane for case in CASES if case.expected is not None} >= set(PARSERS)
+
+
+@pytest.mark.parametrize("case", [
+    pytest.param(case, marks=pytest.mark.xfail(reason=case.xfail, strict=True)) if case.xfail else case
+    for case in CASES
+], ids=[case.id for case in CASES])
+def test_parser_output_matches_golden(case):
+    assert check_golden(case) is None
@@ -0,0 +1,81 @@
+import asyncio
+
+import jsonpatch
+
+from parserd.core.conflate import ConflatingQueue, Update
+from parserd.core.critical import CriticalFields
+from parserd.core.delta import EMPTY, Snapshot, diff_snapshots
+from parserd.core.hub import CaptureHub
+from parserd.core.pathfilter import PathFilter
+
+
+def _update(pane, before, after):
+    before, after = Snapshot.freeze(before), Snapshot.freeze(after)
+    return Update({"pane": pane, "delta": diff_snapshots(before, after), "confidence": 1.0}, before, after)
+
+
+def test_filter_drops_unselected_ops_and_trims_ancestors():
+    path_filter = PathFilter(["/ci/status", "pr"])
+    first = path_filter.apply(_update("CI_SUMMARY", {}, {"ci": {"status": "passing", "url": "u1"}, "x": 1}))
+    assert first.brief["delta"] == [{"op": "add", "path": "/ci", "value": {"status": "passing"}}]
+    assert path_filter.apply(_update("CI_SUMMARY", {"ci": {"status": "passing", "url": "u1"}},
+                                     {"ci": {"status": "passing", "url": "u2"}})) is None
+    later = path_filter.apply(_update("CI_SUMMARY", {"ci": {"status": "passing"}},
+                                      {"ci": {"status": "failing"}, "pr": {"mergeable": "clean"}}))
+    doc = jsonpatch.apply_patch(jsonpatch.apply_patch({}, first.brief["delta"]), later.brief["delta"])
+    assert doc == {"ci": {"status": "failing"}, "pr": {"mergeable": "clean"}}
+
+
+def test_pointer_through_an_array_selects_the_array():
+    path_filter = PathFilter(["/checks/0/status"])
+    before = {"checks": [{"name": n, "status": "ok"} for n in "abc"]}
+    after = {"checks": [{"name": n, "status": "fail" if n == "b" else "ok"} for n in "abc"], "other": 2}
+    narrowed = path_filter.apply(_update("CHECKS_LIST", before, after))
+    assert narrowed.brief["delta"] == [{"op": "replace", "path": "/checks/1/status", "value": "fail"}]
+    assert PathFilter([""]).project(Snapshot.freeze(after)).plain == after
+
+
+def test_multi_pane_subscriptions_interleave_on_one_queue():
+    states = {"CI_SUMMARY": iter([{"ci": {"status": "passing", "run": 1}}, {"ci": {"status": "passing", "run": 2}}]),
+              "PR_BANNER": iter([{"pr": {"mergeable": "clean"}}])}
+    last = {}
+
+    async def tick(pane):
+        await asyncio.sleep(0.001)
+        facts = next(states[pane], None)
+        if facts is None:
+            await asyncio.sleep(1)
+            return None
+        before = last.get(pane, EMPTY)
+        last[pane] = after = Snapshot.freeze(facts)
+        return Update({"pane": pane, "delta": diff_snapshots(before, after), "confidence": 1.0}, before, after)
+
+    async def run():
+        hub = CaptureHub(tick)
+        queue = ConflatingQueue(16)
+        subs = [hub.subscribe("CI_SUMMARY", fps=50, paths=["/ci/status"], queue=queue),
+                hub.subscribe("PR_BANNER", fps=5, queue=queue)]
+        items = [await asyncio.wait_for(queue.get(), 1) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        stats = hub.stats()
+        await hub.close()
+        return items, queue.qsize(), stats, subs
+
+    items, pending, stats, subs = asyncio.run(run())
+    assert sorted((item.pane, str(item.brief["delta"])) for item in items) == [
+        ("CI_SUMMARY", str([{"op": "add", "path": "/ci", "value": {"status": "passing"}}])),
+        ("PR_BANNER", str([{"op": "add", "path": "/pr", "value": {"mergeable": "clean"}}])),
+    ]
+    assert pending == 0  # the run counter change never reaches the filtered subscriber
+    assert subs[0].filtered == 1
+    assert stats["CI_SUMMARY"]["subscribers"][0]["paths"] == ["/ci/status"]
+
+
+def test_narrowed_brief_is_critical_only_if_it_still_touches_a_critical_field():
+    critical = CriticalFields(["ci/status"])
+    update = _update("CI_SUMMARY", {"ci": {"status": "passing"}, "pr": {"mergeable": "clean"}},
+                     {"ci": {"status": "failing"}, "pr": {"mergeable": "dirty"}})
+    update.critical = critical.touches(update.brief["delta"])
+    assert update.critical
+    assert not PathFilter(["/pr"], critical).apply(update).critical
+    assert PathFilter(["/ci"], critical).apply(update).critical
@@ -0,0 +1,65 @@
+import asyncio
+import gzip
+import json
+import time
+
+from parserd.core.recorder import CaptureLog, CaptureRecorder
+from parserd.sim.replay import replay
+from parserd.sim.visiond import FrameStore
+
+
+def _body(pane, i):
+    return json.dumps({"pane": pane, "sensors": [{"source": "dom", "text": f"{pane} {i} " + "x" * 200}],
+                       "metadata": {"perceptualHash": f"{pane}-{i}"}}).encode("utf-8")
+
+
+def _record(path, n=60):
+    recorder = CaptureRecorder(path, block_bytes=2048)
+    for i in range(n):
+        pane = "CI_LOGS_DETAIL" if i < n // 2 else ("PR_BANNER" if i % 2 else "CI_SUMMARY")
+        recorder.record(pane, _body(pane, i), t=1_000.0 + i * 0.1)
+    recorder.close()
+    return recorder
+
+
+def test_blocks_are_indexed_per_pane_and_form_one_gzip_stream(tmp_path):
+    path = tmp_path / "capture-test.jsonseq.gz"
+    recorder = _record(path)
+    stats = recorder.stats()
+    assert stats["records"] == 60 and stats["blocks"] > 3 and stats["ratio"] > 1
+    assert gzip.decompress(path.read_bytes()).count(b"\x1e") == 60
+
+    log = CaptureLog(path)
+    assert log.panes() == {"CI_LOGS_DETAIL": 30, "PR_BANNER": 15, "CI_SUMMARY": 15}
+    records = list(log.records())
+    assert [t for t, _, _ in records] == sorted(t for t, _, _ in records)
+    assert records[0][2]["sensors"][0]["text"].startswith("CI_LOGS_DETAIL 0")
+    banner = list(log.records(["PR_BANNER"]))
+    assert len(banner) == 15 and {pane for _, pane, _ in banner} == {"PR_BANNER"}
+
+
+def test_unindexed_tail_is_recovered_and_torn_block_ignored(tmp_path):
+    path = tmp_path / "capture-test.jsonseq.gz"
+    _record(path)
+    index = tmp_path / "capture-test.idx"
+    lines = index.read_bytes().split(b"\x1e")
+    index.write_bytes(b"\x1e".join(lines[:3]))  # crash before the last index writes
+    with open(path, "ab") as f:
+        f.write(gzip.compress(b"\x1e{\"t\":1")[:-6])  # torn final block
+    assert sum(CaptureLog(path).panes().values()) == 60
+
+
+def test_replay_follows_recorded_timing_scaled(tmp_path):
+    path = tmp_path / "capture-test.jsonseq.gz"
+    _record(path, n=20)  # 1.9 s of recorded time
+    frames = FrameStore()
+    seen = []
+    frames.listen(lambda pane: seen.append((time.monotonic(), pane)))
+
+    t0 = time.monotonic()
+    stats = asyncio.run(replay(CaptureLog(path), frames, speed=10.0))
+    elapsed = time.monotonic() - t0
+    assert stats["replayed"] == 20 and stats["done"]
+    assert 0.18 <= elapsed < 0.6
+    assert json.loads(frames.get("PR_BANNER")[0])["metadata"]["perceptualHash"] == "PR_BANNER-19"
+    assert len(seen) == 20
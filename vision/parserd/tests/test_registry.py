@@ -0,0 +1,49 @@
+import subprocess
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import parserd.parsers as registry_module
+from parserd.core.validate import Validator
+from parserd.parsers import PARSERS, TAIL_PARSERS, ParserRegistry
+
+VISION = Path(__file__).resolve().parents[2]
+
+
+def test_lookup_imports_only_that_pane():
+    code = (
+        "import sys; from parserd.parsers import PARSERS; "
+        "assert len(PARSERS) == 14 and 'CI_SUMMARY' in PARSERS; "
+        "print(sorted(m for m in sys.modules if m.startswith('parserd.parsers.')))"
+    )
+    out = subprocess.run([sys.executable, "-c", code], cwd=VISION, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "['parserd.parsers.ci_summary']"
+
+
+def test_tail_registry_lists_only_incremental_parsers():
+    assert list(TAIL_PARSERS) == ["CI_LOGS_DETAIL", "HIL_LOGS", "IDE_TERMINAL", "SERIAL_MONITOR"]
+    assert "CI_SUMMARY" in PARSERS and "CI_SUMMARY" not in TAIL_PARSERS
+    assert "NOT_A_PANE" not in PARSERS and None not in PARSERS
+
+
+def test_entry_points_register_third_party_panes(monkeypatch):
+    def parse(observation, limits):
+        return {"custom": {"ok": True}}, 1.0
+
+    plugin = SimpleNamespace(name="CUSTOM_PANE", load=lambda: parse)
+    shadowed = SimpleNamespace(name="CI_SUMMARY", load=lambda: parse)
+    monkeypatch.setattr("importlib.metadata.entry_points",
+                        lambda group: [plugin, shadowed] if group == registry_module.ENTRY_POINT_GROUP else [])
+    registry = ParserRegistry("parse", registry_module.ENTRY_POINT_GROUP)
+    assert registry.loaded() == set()
+    assert registry["CUSTOM_PANE"] is parse
+    assert registry["CI_SUMMARY"] is PARSERS["CI_SUMMARY"]  # built-in module wins
+    assert "CUSTOM_PANE" in set(registry) and len(registry) == 15
+
+
+def test_validator_compiles_schemas_on_first_check():
+    schemas = VISION / "schemas"
+    validator = Validator(schemas / "facts.schema.json", schemas / "brief.schema.json")
+    assert validator.stats()["compiled"] is False
+    assert not validator.check_facts({"ci": {"status": "nope"}})
+    assert validator.stats()["compiled"] is True
@@ -0,0 +1,89 @@
+import asyncio
+import time
+
+from parserd.core.scheduler import CaptureScheduler
+
+
+async def _run_pane(scheduler, pane, ticks, work_s=0.0, changed=True):
+    stamps = []
+    for _ in range(ticks):
+        await scheduler.acquire(pane)
+        stamps.append(time.monotonic())
+        try:
+            await asyncio.sleep(work_s)
+        finally:
+            scheduler.release(pane, changed=changed)
+    return stamps
+
+
+def test_deadlines_are_absolute_so_work_does_not_stretch_the_period():
+    async def run():
+        scheduler = CaptureScheduler()
+        scheduler.register("CI_SUMMARY", fps=20)
+        return await _run_pane(scheduler, "CI_SUMMARY", 11, work_s=0.02), scheduler.stats()
+
+    stamps, stats = asyncio.run(run())
+    # sleep-after-work would take ~0.7s for 10 periods; deadlines keep it near 0.5s.
+    assert stamps[-1] - stamps[0] < 0.62
+    assert stats["panes"]["CI_SUMMARY"]["missed_deadlines"] == 0
+
+
+def test_idle_panes_back_off_and_changes_snap_back():
+    async def run():
+        scheduler = CaptureScheduler(idle_ticks=2, backoff=2.0, max_interval_s=0.1)
+        scheduler.register("PR_BANNER", fps=100)
+        await _run_pane(scheduler, "PR_BANNER", 5, changed=False)
+        idle = scheduler.stats()["panes"]["PR_BANNER"]["scheduled_fps"]
+        await _run_pane(scheduler, "PR_BANNER", 1, changed=True)
+        return idle, scheduler.stats()["panes"]["PR_BANNER"]["scheduled_fps"]
+
+    idle, active = asyncio.run(run())
+    assert idle == 10.0
+    assert active == 100.0
+
+
+def test_global_cap_and_missed_deadlines():
+    async def run():
+        scheduler = CaptureScheduler(max_in_flight=1)
+        peak = 0
+
+        async def pane(name):
+            nonlocal peak
+            scheduler.register(name, fps=100)
+            for _ in range(3):
+                await scheduler.acquire(name)
+                peak = max(peak, scheduler.stats()["in_flight"])
+                await asyncio.sleep(0.03)
+                scheduler.release(name, changed=True)
+
+        await asyncio.gather(pane("HIL_LOGS"), pane("SERIAL_MONITOR"))
+        return peak, scheduler.stats()
+
+    peak, stats = asyncio.run(run())
+    assert peak == 1
+    assert all(p["missed_deadlines"] > 0 for p in stats["panes"].values())
+
+
+def test_critical_panes_get_slots_first_when_saturated():
+    async def run():
+        scheduler = CaptureScheduler(max_in_flight=1)
+        for pane in ("HIL_LOGS", "SERIAL_MONITOR", "CI_SUMMARY"):
+            scheduler.register(pane, fps=1)
+        scheduler.set_priority("CI_SUMMARY", 1)
+        await scheduler.acquire("HIL_LOGS")
+        order = []
+
+        async def wait(pane):
+            await scheduler.acquire(pane)
+            order.append(pane)
+            scheduler.release(pane, changed=True)
+
+        tasks = [asyncio.create_task(wait(p)) for p in ("SERIAL_MONITOR", "CI_SUMMARY")]
+        await asyncio.sleep(0.01)
+        scheduler.release("HIL_LOGS", changed=True)
+        await asyncio.gather(*tasks)
+        return order, scheduler.stats()
+
+    order, stats = asyncio.run(run())
+    assert order == ["CI_SUMMARY", "SERIAL_MONITOR"]
+    assert stats["in_flight"] == 0 and stats["waiting"] == 0
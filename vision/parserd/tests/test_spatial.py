@@ -0,0 +1,51 @@
+import random
+
+from parserd.core.models import PaneObservation
+from parserd.parsers import PARSERS
+
+
+def _tok(text, x, y, w=40, h=12):
+    return {"text": text, "bbox": [x, y, w, h], "confidence": 0.9}
+
+
+# Tesseract-style word boxes (pixels, top-left origin) for a HIL chart legend.
+CHART = [
+    _tok("FPS", 10, 10), _tok("avg:", 55, 11), _tok("59.8", 100, 10),
+    _tok("p95:", 160, 12), _tok("61.2", 205, 10),
+    _tok("drops", 10, 40), _tok("0.4%", 60, 41, h=11),
+    _tok("sync", 10, 70), _tok("offset", 55, 70), _tok("-3", 110, 71), _tok("ms", 140, 70),
+]
+
+
+def _obs(tokens, engine="tesseract"):
+    scrambled = list(tokens)
+    random.Random(7).shuffle(scrambled)
+    return PaneObservation.from_payload(
+        {"pane": "HIL_CHART", "ocr": {"engine": engine, "tokens": scrambled}}
+    )
+
+
+def test_tokens_rebuild_reading_order_lines():
+    obs = _obs(CHART)
+    assert obs.ocr_text == ["FPS avg: 59.8 p95: 61.2", "drops 0.4%", "sync offset -3 ms"]
+    # Apple Vision: normalized boxes, bottom-left origin, usually one box per line.
+    vision = _obs([_tok("second line", 0.1, 0.4, 0.5, 0.05), _tok("first line", 0.1, 0.8, 0.5, 0.05)], "vision")
+    assert vision.ocr_text == ["first line", "second line"]
+
+
+def test_region_and_label_queries():
+    index = _obs(CHART).token_index
+    assert index.text_within(0, 30, 135, 80) == "drops 0.4% sync offset -3"
+    assert index.within(500, 0, 600, 100) == []
+    assert index.right_of("fps avg") == "59.8" and index.right_of("P95") == "61.2"
+    assert index.right_of("sync offset") == "-3" and index.left_of("ms") == "-3"
+    assert index.right_of("missing") is None and index.right_of("ms") is None
+
+
+def test_pixel_mode_parsers_read_labeled_values():
+    facts, conf = PARSERS["HIL_CHART"](_obs(CHART), {})
+    assert facts == {"hil": {"fps_avg": 59.8, "fps_p95": 61.2, "drops_pct": 0.4, "sync_offset_ms": -3.0}}
+    assert conf == 0.9
+    logic = _obs([_tok("128", 10, 10), _tok("edges", 60, 10), _tok("50%", 130, 10), _tok("duty", 180, 10)])
+    facts, _ = PARSERS["LOGIC_ANALYZER"](logic, {})
+    assert facts["logic"] == {"detected_edges": 128, "duty_pct": 50.0}
@@ -0,0 +1,51 @@
+import time
+
+from parserd.core.delta import DeltaEngine
+from parserd.core.state import MemoryStateStore, SqliteStateStore
+
+
+def test_restart_resumes_from_last_emitted_facts(tmp_path):
+    path = tmp_path / "state.sqlite"
+    engine = DeltaEngine(SqliteStateStore(path))
+    assert engine.patch("CI_SUMMARY", {"ci": {"status": "running"}}, commit=False)
+    engine.commit("CI_SUMMARY", 0.99)
+    # Not committed (e.g. below min_confidence): must not become the diff base.
+    engine.patch("CI_SUMMARY", {"ci": {"status": "queued"}}, commit=False)
+    engine.store.close()
+
+    restarted = DeltaEngine(SqliteStateStore(path))
+    assert restarted.patch("CI_SUMMARY", {"ci": {"status": "running"}}) == []
+    assert restarted.patch("CI_SUMMARY", {"ci": {"status": "passing"}}) == [
+        {"op": "replace", "path": "/ci/status", "value": "passing"}
+    ]
+    assert restarted.last_confidence("PR_BANNER") == 0.0
+    assert restarted.store.stats()["loads"] == 1
+
+
+def test_memory_store_bounds_and_expires():
+    store = MemoryStateStore(max_panes=1)
+    engine = DeltaEngine(store)
+    engine.patch("A", {"x": 1})
+    engine.patch("B", {"x": 1})
+    assert store.stats()["evicted"] == 1 and engine.last("A") == {}
+
+    expiring = DeltaEngine(MemoryStateStore(ttl_s=1e-9))
+    expiring.patch("A", {"x": 1})
+    assert expiring.last("A") == {}
+
+
+def test_stable_but_active_pane_does_not_expire(tmp_path):
+    path = tmp_path / "state.sqlite"
+    engine = DeltaEngine(SqliteStateStore(path, ttl_s=0.2))
+    engine.patch("CI_SUMMARY", {"ci": {"status": "passing"}})
+    for _ in range(8):  # 0.4 s of ticks with unchanged facts: twice the TTL
+        time.sleep(0.05)
+        assert engine.patch("CI_SUMMARY", {"ci": {"status": "passing"}}) == []
+    engine.store.close()
+
+    # The refreshed access time was persisted, so a restart does not expire the pane either.
+    restarted = DeltaEngine(SqliteStateStore(path, ttl_s=0.2))
+    assert restarted.patch("CI_SUMMARY", {"ci": {"status": "passing"}}) == []
+    assert restarted.store.stats()["expired"] == 0
+    time.sleep(0.25)
+    assert restarted.last("CI_SUMMARY") == {}
@@ -0,0 +1,118 @@
+import asyncio
+import json
+import socket
+
+from aiohttp.test_utils import TestServer
+
+from parserd.core.ingest import StreamIngest
+from parserd.core.models import PaneObservation
+from parserd.core.vision_client import VisionClient
+from parserd.sim.visiond import FrameStore, build_app
+
+
+def _payload(text):
+    return {"sensors": [{"source": "dom", "text": text}]}
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _exercise():
+    port = _free_port()
+    frames = FrameStore()
+    frames.set("CI_SUMMARY", _payload("queued"))
+    frames.set("PR_BANNER", _payload("Ready to merge"))
+    client = VisionClient(port=port)
+    received = []
+    server = None
+
+    async def consume():
+        async for seq, observation in client.stream(["CI_SUMMARY", "PR_BANNER"], reconnect_s=0.05):
+            received.append((seq, observation.pane_id, observation.structured_text))
+
+    task = asyncio.create_task(consume())
+    try:
+        await asyncio.sleep(0.1)  # nothing listening yet: the client keeps retrying
+        server = TestServer(build_app(frames, heartbeat_s=0.05, stream_queue=2), host="127.0.0.1", port=port)
+        await server.start_server()
+        while len(received) < 2:
+            await asyncio.sleep(0.01)
+        for i in range(5):  # faster than the connection drains: the producer drops the oldest
+            frames.set("CI_SUMMARY", _payload(f"running {i}"))
+        frames.set("CI_SUMMARY", _payload("running 4"))  # unchanged frame: not pushed
+        while not received or received[-1][2] != ["running 4"]:
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.12)
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        await client.close()
+        if server is not None:
+            await server.close()
+    return received, client.stats()["stream"]
+
+
+def test_stream_delivers_changes_and_counts_gaps():
+    received, stream = asyncio.run(_exercise())
+    assert [pane for _, pane, _ in received[:2]] == ["CI_SUMMARY", "PR_BANNER"]
+    assert received[-1][1:] == ("CI_SUMMARY", ["running 4"])
+    assert stream["reconnects"] >= 1 and stream["connects"] == 1
+    assert stream["gaps"] == 1 and stream["missed"] == 3
+    assert stream["heartbeats"] >= 1
+
+
+def test_ingest_serves_latest_frame_and_not_modified():
+    class Client:
+        stream_connected = True
+
+    ingest = StreamIngest(Client(), ["CI_SUMMARY"])
+    assert ingest.capture("CI_SUMMARY") is None
+    frames = FrameStore()
+    frames.set("CI_SUMMARY", _payload("queued"))
+    observation = PaneObservation.from_payload(json.loads(frames.get("CI_SUMMARY")[0]))
+    ingest._latest["CI_SUMMARY"] = observation
+    assert ingest.capture("CI_SUMMARY") is observation
+    assert ingest.capture("CI_SUMMARY", if_none_match=observation.perceptual_hash).not_modified
+    assert ingest.stats()["fallbacks"] == 1 and ingest.stats()["served"] == 2
+
+
+async def _reconnect():
+    port = _free_port()
+    frames = FrameStore()
+    frames.set("CI_SUMMARY", _payload("queued"))
+    client = VisionClient(port=port)
+    received = []
+
+    async def consume():
+        async for seq, observation in client.stream(["CI_SUMMARY"], reconnect_s=0.05):
+            received.append((seq, observation.structured_text))
+
+    # A short shutdown timeout drops the open stream instead of waiting for it to finish.
+    server = TestServer(build_app(frames, heartbeat_s=0.05), host="127.0.0.1", port=port)
+    await server.start_server(shutdown_timeout=0.1)
+    task = asyncio.create_task(consume())
+    try:
+        while not received:
+            await asyncio.sleep(0.01)
+        await server.close()
+        for i in range(3):  # changes nobody is connected to see
+            frames.set("CI_SUMMARY", _payload(f"running {i}"))
+        server = TestServer(build_app(frames, heartbeat_s=0.05), host="127.0.0.1", port=port)
+        await server.start_server()
+        while received[-1][1] != ["running 2"]:
+            await asyncio.sleep(0.01)
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        await client.close()
+        await server.close()
+    return received, client.stats()["stream"]
+
+
+def test_frames_missed_while_disconnected_count_as_a_gap():
+    received, stream = asyncio.run(_reconnect())
+    assert received == [(1, ["queued"]), (4, ["running 2"])]
+    assert stream["connects"] == 2 and stream["gaps"] == 1 and stream["missed"] == 2
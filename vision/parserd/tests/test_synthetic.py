@@ -0,0 +1,81 @@
+import json
+import random
+import time
+from pathlib import Path
+
+import pytest
+
+from parserd.core.models import PaneObservation
+from parserd.parsers import PARSERS
+from parserd.sim.loadgen import LoadTracker, ServedFrames, parse_frame
+from parserd.sim.synthetic import LatencyModel, SyntheticSource, load_templates, make_variant
+
+FIXTURES = Path(__file__).resolve().parents[2] / "tests" / "fixtures"
+LIMITS = {"max_failed_names": 8, "max_labels": 16, "max_items_per_list": 12}
+
+
+def _facts(payload):
+    return PARSERS[payload["pane"]](PaneObservation.from_payload(payload), LIMITS)[0]
+
+
+@pytest.mark.parametrize("pane", ["IDE_TERMINAL", "HIL_CHART", "SERIAL_MONITOR"])
+def test_consecutive_variants_parse_to_different_facts(pane):
+    template = load_templates(FIXTURES, [pane])[pane][0]
+    first, second = make_variant(template, 1), make_variant(template, 2)
+    assert first["metadata"]["perceptualHash"] != second["metadata"]["perceptualHash"]
+    assert _facts(first) != _facts(second)
+
+
+def test_padding_and_filler_tokens_leave_facts_alone():
+    templates = load_templates(FIXTURES, ["IDE_TERMINAL", "HIL_CHART", "LED_CAMERA_MONITOR"])
+    for pane, (template,) in templates.items():
+        big = make_variant(template, 3, payload_kib=48, tokens=400)
+        assert len(json.dumps(big, separators=(",", ":"))) >= 48 * 1024
+        assert len(big["ocr"]["tokens"]) == 400
+        assert _facts(big) == _facts(make_variant(template, 3))
+
+
+def test_latency_specs():
+    rng = random.Random(7)
+    assert LatencyModel.parse("fixed:12").sample() == pytest.approx(0.012)
+    assert all(0.005 <= LatencyModel.parse("uniform:5:9", rng).sample() <= 0.009 for _ in range(100))
+    samples = sorted(LatencyModel.parse("lognormal:20:0.5", rng).sample() for _ in range(2001))
+    assert samples[1000] == pytest.approx(0.020, rel=0.15)
+    assert LatencyModel.parse(None).sample() == 0.0
+    with pytest.raises(ValueError):
+        LatencyModel.parse("gamma:3")
+
+
+def test_tracker_attributes_briefs_to_served_frames():
+    frames = ServedFrames()
+    tracker = LoadTracker(frames, late_s=0.5)
+    source = SyntheticSource(frames, load_templates(FIXTURES, ["CI_SUMMARY"]), on_change=tracker.on_change)
+    source.prime()
+    tracker.connected(0)
+    frames.get("CI_SUMMARY")
+    tracker.on_brief(0, "CI_SUMMARY", t=0.0)  # subscribe-time snapshot
+    for _ in range(3):  # two frames are superseded before parserd fetches one
+        source.step("CI_SUMMARY")
+    changed = tracker._changes["CI_SUMMARY"][frames.peek("CI_SUMMARY")[1]][1]
+    frames.get("CI_SUMMARY")
+    tracker.on_brief(0, "CI_SUMMARY", t=changed + 0.8)
+    tracker.on_brief(0, "CI_SUMMARY", t=changed + 0.9)  # nothing new was served
+    assert tracker.counters == {"changes": 4, "unchanged": 0, "briefs": 3, "primes": 1, "repeats": 1, "dropped": 2,
+                                "late": 1, "missing": 0, "reconnects": 0}
+    assert tracker.latencies == [pytest.approx(0.8)]
+
+
+def test_frames_with_unchanged_facts_are_not_counted_as_changes():
+    frames = ServedFrames()
+    tracker = LoadTracker(frames, late_s=0.5, facts=parse_frame)
+    source = SyntheticSource(frames, load_templates(FIXTURES, ["BUILD_ARTIFACTS_CONSOLE"]), on_change=tracker.on_change)
+    source.prime()
+    tracker.connected(0)
+    frames.get("BUILD_ARTIFACTS_CONSOLE")
+    tracker.on_brief(0, "BUILD_ARTIFACTS_CONSOLE", t=0.0)
+    for _ in range(3):  # no numbers in its facts, so parserd has nothing new to emit
+        source.step("BUILD_ARTIFACTS_CONSOLE")
+    frames.get("BUILD_ARTIFACTS_CONSOLE")
+    tracker.finish({0: "BUILD_ARTIFACTS_CONSOLE"}, now=time.monotonic() + 10.0)
+    assert tracker.counters["changes"] == 1 and tracker.counters["unchanged"] == 3
+    assert tracker.counters["missing"] == 0
@@ -0,0 +1,50 @@
+from parserd.core.models import PaneObservation, Sensor
+from parserd.core.tail import TailState, overlap
+from parserd.parsers import PARSERS, TAIL_PARSERS
+
+
+def _obs(lines):
+    return PaneObservation("CI_LOGS_DETAIL", sensors=[Sensor("dom", None, "\n".join(lines), 1.0)])
+
+
+def test_overlap_handles_scroll_append_and_reset():
+    log = [f"line {i}" for i in range(100)]
+    assert overlap(log[0:40], log[5:45]) == 35
+    assert overlap(log[0:10], log[0:12]) == 10
+    assert overlap(log[0:40], log[0:40]) == 40
+    assert overlap(log[0:40], log[60:100]) == 0
+    repeated = ["."] * 30
+    assert overlap(repeated + ["a"], repeated + ["a", "b"]) == 31
+
+
+def test_ci_logs_keeps_errors_that_scrolled_past():
+    log = [f"step {i} ok" for i in range(60)]
+    log[12] = "error: linker failed for fw.elf"
+    state = TailState()
+    parse = TAIL_PARSERS["CI_LOGS_DETAIL"]
+    parse(_obs(log[0:20]), {}, state)
+    facts, conf = parse(_obs(log[30:50]), {}, state)  # gap: full re-scan of the window
+    facts, conf = parse(_obs(log[35:55]), {}, state)
+    assert state.new_lines == 5 and state.resets == 1
+    assert facts["ci_logs"] == {"last_error_signature": "error: linker failed for fw.elf", "error_count": 1}
+    assert conf == 0.95
+
+
+def test_bottom_line_rewritten_in_place_is_not_a_reset():
+    assert overlap(["a", "b", "c", "50%"], ["a", "b", "c", "60%"]) == 3
+    assert overlap(["a", "b", "c", "50%"], ["b", "c", "d", "60%"]) == 2
+    for pane in ("CI_LOGS_DETAIL", "HIL_LOGS"):
+        state = TailState()
+        for pct in range(0, 50, 10):
+            lines = ["step 1", "Error: foo failed", "step 2", f"progress {pct}%"]
+            facts, _ = TAIL_PARSERS[pane](_obs(lines), {}, state)
+        assert next(iter(facts.values()))["error_count"] == 1
+        assert state.resets == 0 and state.new_lines == 1
+
+
+def test_full_parse_matches_first_incremental_frame():
+    lines = ["Target firmware", "Compiling main.c", "3 warnings, 0 errors", "Built in 41.5 s"]
+    for pane in TAIL_PARSERS:
+        assert PARSERS[pane](_obs(lines), {}) == TAIL_PARSERS[pane](_obs(lines), {}, TailState())
+    facts, conf = PARSERS["IDE_TERMINAL"](_obs(lines), {})
+    assert facts["terminal"] == {"warnings": 3, "errors": 0, "last_target": "firmware", "build_time_s": 41.5}
@@ -0,0 +1,38 @@
+import asyncio
+import json
+from pathlib import Path
+
+from parserd.core.validate import Validator, touched_keys
+
+SCHEMAS = Path(__file__).resolve().parents[2] / "schemas"
+FACTS = json.loads((SCHEMAS / "facts.schema.json").read_text())
+BRIEF = json.loads((SCHEMAS / "brief.schema.json").read_text())
+
+
+def test_only_touched_keys_are_validated():
+    validator = Validator(FACTS, BRIEF)
+    facts = {"ci": {"status": "passing"}, "pr": {"mergeable": "maybe"}}
+    assert validator.check_facts(facts, [{"op": "replace", "path": "/ci/status", "value": "passing"}])
+    assert not validator.check_facts(facts, [{"op": "add", "path": "/pr", "value": {"mergeable": "maybe"}}])
+    assert not validator.check_facts({"bogus": {}})
+    stats = validator.stats()
+    assert stats["checked"] == 3 and stats["failed"] == 2
+    assert stats["failures_by_key"] == {"pr": 1, "bogus": 1}
+    assert touched_keys([{"op": "replace", "path": "", "value": {}}]) is None
+
+
+def test_sampled_and_async_modes_count_instead_of_raising():
+    sampled = Validator(FACTS, BRIEF, mode="sampled", sample_pct=0)
+    assert sampled.check_facts({"ci": {"status": "nope"}})
+    assert sampled.stats()["skipped"] == 1
+
+    async def run_async():
+        validator = Validator(FACTS, BRIEF, mode="async")
+        await validator.start()
+        validator.check_brief({"ts": "now", "pane": "NOT_A_PANE", "delta": [], "confidence": 1})
+        await asyncio.sleep(0.01)
+        await validator.close()
+        return validator.stats()
+
+    stats = asyncio.run(run_async())
+    assert stats["checked"] == 1 and stats["failures_by_key"] == {"brief": 1}
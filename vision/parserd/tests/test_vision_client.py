@@ -0,0 +1,34 @@
+import asyncio
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from parserd.core.vision_client import VisionClient
+
+
+async def _capture_n(n):
+    async def capture_once(request):
+        data = await request.json()
+        return web.json_response({"pane": data["pane_id"], "sensors": [{"source": "ax", "text": "ok"}]})
+
+    app = web.Application()
+    app.router.add_post("/capture_once", capture_once)
+    server = TestServer(app, host="127.0.0.1")
+    await server.start_server()
+    client = VisionClient(port=server.port, max_in_flight=2)
+    await client.start()
+    try:
+        observations = [await client.capture_once("CI_SUMMARY") for _ in range(n)]
+    finally:
+        await client.close()
+        await server.close()
+    return client, observations
+
+
+def test_capture_reuses_pooled_connection():
+    client, observations = asyncio.run(_capture_n(3))
+    assert all(obs.structured_text == ["ok"] for obs in observations)
+    stats = client.stats()
+    assert stats["requests"] == 3
+    assert stats["connections_created"] == 1
+    assert stats["connections_reused"] == 2
@@ -0,0 +1,41 @@
+import asyncio
+
+import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+import parserd.main as main
+
+
+def test_single_and_multi_pane_forms_normalize_alike():
+    single, error = main.watch_specs({"pane_id": "CI_SUMMARY", "paths": ["/ci/status"]}, 2.0)
+    assert error is None and single == {"CI_SUMMARY": {"fps": 2.0, "paths": ["/ci/status"]}}
+    multi, error = main.watch_specs({"panes": {"CI_SUMMARY": {"paths": ["/ci/status"]}}}, 2.0)
+    assert error is None and multi == single
+
+
+def test_invalid_paths_and_fps_are_rejected_in_every_form():
+    assert main.watch_specs({"pane_id": "CI_SUMMARY", "paths": "/ci/status"}, 2.0)[1] == (
+        "CI_SUMMARY: paths must be a list of JSON pointers")
+    assert main.watch_specs({"panes": [{"pane_id": "CI_SUMMARY", "fps": "fast"}]}, 2.0)[1] == (
+        "CI_SUMMARY: fps must be a number")
+    assert main.watch_specs({"paths": ["/ci"]}, 2.0)[1] == "each pane needs a pane_id"
+
+
+async def _post(body):
+    app = web.Application()
+    app.add_routes([web.post("/watch", main.watch)])
+    server = TestServer(app, host="127.0.0.1")
+    await server.start_server()
+    try:
+        async with aiohttp.ClientSession() as session:
+            async with session.post(server.make_url("/watch"), json=body) as resp:
+                return resp.status, await resp.json()
+    finally:
+        await server.close()
+
+
+def test_watch_answers_bad_single_pane_requests_with_400():
+    assert asyncio.run(_post({"pane_id": "CI_SUMMARY", "paths": "/ci/status"})) == (
+        400, {"error": "CI_SUMMARY: paths must be a list of JSON pointers"})
+    assert asyncio.run(_post({"pane_id": "CI_SUMMARY", "fps": "fast"})) == (400, {"error": "fps must be a number"})
@@ -0,0 +1,54 @@
+import asyncio
+import time
+
+from aiohttp.test_utils import TestServer
+
+import parserd.main as main
+from parserd.core.cache import ParseCache
+from parserd.core.delta import DeltaEngine
+from parserd.core.executor import ParseExecutor
+from parserd.core.vision_client import VisionClient
+from parserd.sim.visiond import FrameStore, build_app
+
+calls = []
+
+
+def _slow_once(observation, limits):
+    calls.append(observation.structured_text)
+    if len(calls) == 1:
+        time.sleep(0.15)
+    return {"ci": {"status": "failing"}}, 0.99
+
+
+async def _ticks(monkeypatch):
+    frames = FrameStore()
+    frames.set("CI_SUMMARY", {"sensors": [{"source": "dom", "text": "2 failing checks"}]})
+    visiond = TestServer(build_app(frames), host="127.0.0.1")
+    await visiond.start_server()
+    client = VisionClient(port=visiond.port)
+    executor = ParseExecutor("thread", workers=1, timeout_s=0.05)
+    patched = {
+        "vision_client": client, "parse_executor": executor, "PARSERS": {"CI_SUMMARY": _slow_once},
+        "delta_engine": DeltaEngine(), "parse_cache": ParseCache(), "last_frame_hash": {}, "last_parse_key": {},
+    }
+    for name, value in patched.items():
+        monkeypatch.setattr(main, name, value)
+    try:
+        timed_out = await main.watch_tick("CI_SUMMARY")
+        await asyncio.sleep(0.2)  # let the abandoned parse return so the pane is not skipped
+        retried = await main.watch_tick("CI_SUMMARY")
+        unchanged = await main.watch_tick("CI_SUMMARY")
+    finally:
+        executor.close()
+        await client.close()
+        await visiond.close()
+    return timed_out, retried, unchanged, visiond.app["stats"]
+
+
+def test_timed_out_frame_is_parsed_again_on_the_next_tick(monkeypatch):
+    timed_out, retried, unchanged, stats = asyncio.run(_ticks(monkeypatch))
+    assert timed_out is None and len(calls) == 2
+    assert retried.brief["delta"] == [{"op": "add", "path": "/ci", "value": {"status": "failing"}}]
+    # Once a parse succeeded, the same frame is skipped with a conditional capture again.
+    assert unchanged is None
+    assert stats["full"] == 2 and stats["not_modified"] == 1
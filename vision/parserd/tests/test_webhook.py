@@ -0,0 +1,57 @@
+import asyncio
+import json
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from parserd.core.conflate import Update
+from parserd.core.delta import DeltaEngine
+from parserd.core.webhook import WebhookSink
+
+
+def _update(engine, pane, facts):
+    before = engine.snapshot(pane)
+    delta = engine.patch(pane, facts)
+    return Update({"ts": "t", "pane": pane, "delta": delta, "confidence": 1.0}, before, engine.snapshot(pane))
+
+
+async def _deliver(statuses):
+    received = []
+
+    async def hook(request):
+        received.append(json.loads(await request.read()))
+        return web.Response(status=statuses.pop(0) if statuses else 200)
+
+    app = web.Application()
+    app.router.add_post("/hook", hook)
+    server = TestServer(app, host="127.0.0.1")
+    await server.start_server()
+    engine = DeltaEngine()
+    sink = WebhookSink(f"http://127.0.0.1:{server.port}/hook", min_interval_s=0.05, retries=2, backoff_s=0.01)
+    await sink.start()
+    try:
+        for status in ("failing", "running", "passing"):
+            sink.offer(_update(engine, "CI_SUMMARY", {"ci": {"status": status}}))
+        sink.offer(_update(engine, "PR_BANNER", {"pr": {"mergeable": "clean"}}))
+        for _ in range(100):
+            if sink.stats()["briefs_sent"] >= 2:
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        await sink.close()
+        await server.close()
+    return received, sink.stats()
+
+
+def test_briefs_for_a_pane_are_merged_into_one_batch():
+    received, stats = asyncio.run(_deliver([]))
+    assert len(received) == 1
+    assert [brief["pane"] for brief in received[0]] == ["CI_SUMMARY", "PR_BANNER"]
+    assert received[0][0]["delta"] == [{"op": "add", "path": "/ci", "value": {"status": "passing"}}]
+    assert stats["conflated"] == 2 and stats["batches"] == 1 and stats["pending"] == 0
+
+
+def test_transient_errors_are_retried():
+    received, stats = asyncio.run(_deliver([503, 429]))
+    assert len(received) == 3 and received[0] == received[2]
+    assert stats["retries"] == 2 and stats["batches"] == 1 and stats["last_status"] == 200
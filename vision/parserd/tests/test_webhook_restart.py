@@ -0,0 +1,75 @@
+import asyncio
+import json
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+import parserd.main as main
+from parserd.core.cache import ParseCache
+from parserd.core.delta import DeltaEngine
+from parserd.core.executor import ParseExecutor
+from parserd.core.hub import CaptureHub
+from parserd.core.scheduler import CaptureScheduler
+from parserd.core.state import SqliteStateStore
+from parserd.core.vision_client import VisionClient
+from parserd.core.webhook import WebhookSink
+from parserd.sim.visiond import FrameStore, build_app
+
+
+def _payload(text):
+    return {"sensors": [{"source": "dom", "text": text}]}
+
+
+async def _restart(monkeypatch, path):
+    received = []
+
+    async def hook(request):
+        received.extend(json.loads(await request.read()))
+        return web.Response(status=200)
+
+    hook_app = web.Application()
+    hook_app.router.add_post("/hook", hook)
+    orchestrator = TestServer(hook_app, host="127.0.0.1")
+    await orchestrator.start_server()
+    frames = FrameStore()
+    frames.set("CI_SUMMARY", _payload("2 failing checks"))
+    visiond = TestServer(build_app(frames), host="127.0.0.1")
+    await visiond.start_server()
+    scheduler = CaptureScheduler()
+    patched = {
+        "vision_client": VisionClient(port=visiond.port), "parse_executor": ParseExecutor(),
+        "delta_engine": DeltaEngine(SqliteStateStore(path)), "parse_cache": ParseCache(),
+        "last_frame_hash": {}, "last_parse_key": {}, "scheduler": scheduler,
+        "hub": CaptureHub(main.watch_tick, prime=main.watch_prime, scheduler=scheduler),
+        "webhook_sink": WebhookSink(f"http://127.0.0.1:{orchestrator.port}/hook", min_interval_s=0.05),
+    }
+    for name, value in patched.items():
+        monkeypatch.setattr(main, name, value)
+    monkeypatch.setattr(main.cfg, "targets", {"CI_SUMMARY": {}})
+    app = {"tasks": set()}
+    await main.on_startup(app)
+    try:
+        await app["warm_up"]
+        await asyncio.sleep(0.6)  # a few ticks over the unchanged, already-emitted frame
+        after_restart = list(received)
+        frames.set("CI_SUMMARY", _payload("All checks have passed"))
+        for _ in range(200):
+            if received:
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        await main.on_cleanup(app)
+        await visiond.close()
+        await orchestrator.close()
+    return after_restart, received
+
+
+def test_warm_restart_posts_nothing_until_a_fact_changes(tmp_path, monkeypatch):
+    path = tmp_path / "state.sqlite"
+    previous = DeltaEngine(SqliteStateStore(path))
+    previous.patch("CI_SUMMARY", {"ci": {"status": "failing"}})
+    previous.store.close()
+
+    after_restart, received = asyncio.run(_restart(monkeypatch, path))
+    assert after_restart == []
+    assert [brief["delta"] for brief in received] == [[{"op": "replace", "path": "/ci/status", "value": "passing"}]]
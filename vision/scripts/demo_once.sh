@@ -10,8 +10,8 @@ PANES=(
   LOGIC_ANALYZER LED_CAMERA_MONITOR
 )
 
-for p in "${PANES[@]}"; do
-  echo "[demo] analyze_once $p"
-  curl -s -X POST "http://127.0.0.1:${PORT}/analyze_once" -H 'Content-Type: application/json' -d "{\"pane_id\":\"$p\"}" | jq .
-done
-
+PANE_JSON=$(printf '"%s",' "${PANES[@]}")
+echo "[demo] analyze_batch ${#PANES[@]} panes"
+# Results stream back as RFC-7464 records in completion order; strip RS for jq.
+curl -sN -X POST "http://127.0.0.1:${PORT}/analyze_batch" -H 'Content-Type: application/json' \
+  -d "{\"pane_ids\":[${PANE_JSON%,}]}" | tr -d '\036' | jq .
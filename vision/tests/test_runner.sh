@@ -23,6 +23,10 @@ Draft202012Validator(schema).validate(data)
 print('[tests] targets.json ✅')
 PY
 
+# Parser goldens plus latency against the stored baseline (parserd/bench/parsers_baseline.json).
+# The multi-millisecond synthetic cases are too noisy on shared machines to gate on.
+(cd "$ROOT_DIR" && python3 -m parserd.bench.bench_parsers --n 100 --check --no-synthetic)
+
 curl -fsS "http://127.0.0.1:${VISIOND_PORT}/healthz" || echo "visiond not running; start with scripts/run_all.sh"
 curl -fsS "http://127.0.0.1:${PARSERD_PORT}/healthz" || echo "parserd not running; start with scripts/run_all.sh"
 